@@ -1,23 +1,70 @@
-from .elevenlabs_sfx import generate_sfx_audio_elevenlabs
-from .elevenlabs_tts import generate_tts_audio_elevenlabs
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+from .ahap_instrumentation import AhapInstrumentation, ConsoleProgress, StageTimings
+from .audio_cache import AudioCache, AudioCacheStats, DiskAudioCache, RedisAudioCache
+from .clients import ElevenLabsClient, IEmbraceClient, RetryPolicy
+from .elevenlabs_sfx import generate_sfx_audio_elevenlabs, stream_sfx_audio_elevenlabs
+from .elevenlabs_tts import generate_tts_audio_elevenlabs, stream_tts_audio_elevenlabs
 from .iembrace import generate_personalized_meditation, generate_tts_audio_iembrace
+from .transcode import write_wav_stream
 from .types import SFXRequest, SFXResult, TTSRequest, TTSResult
 
-_ahap_import_error: Exception | None = None
-try:
-    from .ahap import convert_wav_to_ahap, generate_ahap, generate_ahap_from_file
-except ModuleNotFoundError as exc:
-    _ahap_import_error = exc
+# AHAP helpers pull in librosa, which takes seconds to import, and the async API needs httpx,
+# so both are resolved on first use.
+_LAZY_EXPORTS = {
+    "AhapCache": ".ahap_cache",
+    "AsyncElevenLabsClient": ".async_providers",
+    "AsyncIEmbraceClient": ".async_providers",
+    "IncrementalAhapGenerator": ".ahap_realtime",
+    "aclose_default_clients": ".async_providers",
+    "agenerate_personalized_meditation": ".async_providers",
+    "agenerate_sfx_audio_elevenlabs": ".async_providers",
+    "agenerate_tts_audio_elevenlabs": ".async_providers",
+    "agenerate_tts_audio_iembrace": ".async_providers",
+    "compact_ahap_file": ".ahap",
+    "convert_batch_to_ahap": ".ahap_batch",
+    "convert_wav_to_ahap": ".ahap",
+    "convert_wav_to_ahap_streaming": ".ahap_stream",
+    "generate_ahap": ".ahap",
+    "generate_ahap_from_file": ".ahap",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+
+    try:
+        module = importlib.import_module(module_name, __name__)
+    except ModuleNotFoundError as exc:
+        # Nothing is cached, so the import is retried once the dependency is installed.
+        msg = f"{__name__}.{name} requires the optional dependency {exc.name!r}; install it to use {name}."
+        raise ImportError(msg, name=exc.name) from exc
 
-    def _raise_missing_ahap_dependency(*args, **kwargs):  # type: ignore[no-untyped-def]
-        msg = "AHAP generation requires optional dependency 'librosa'."
-        raise RuntimeError(msg) from _ahap_import_error
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
 
-    convert_wav_to_ahap = _raise_missing_ahap_dependency
-    generate_ahap = _raise_missing_ahap_dependency
-    generate_ahap_from_file = _raise_missing_ahap_dependency
 
 __all__ = [
+    "AhapCache",
+    "AhapInstrumentation",
+    "AsyncElevenLabsClient",
+    "AsyncIEmbraceClient",
+    "AudioCache",
+    "AudioCacheStats",
+    "DiskAudioCache",
+    "ConsoleProgress",
+    "ElevenLabsClient",
+    "IEmbraceClient",
+    "RedisAudioCache",
+    "RetryPolicy",
+    "StageTimings",
     "SFXRequest",
     "SFXResult",
     "TTSRequest",
@@ -26,7 +73,19 @@ __all__ = [
     "generate_tts_audio_iembrace",
     "generate_tts_audio_elevenlabs",
     "generate_sfx_audio_elevenlabs",
+    "stream_tts_audio_elevenlabs",
+    "stream_sfx_audio_elevenlabs",
+    "write_wav_stream",
     "generate_ahap",
     "convert_wav_to_ahap",
     "generate_ahap_from_file",
+    "convert_batch_to_ahap",
+    "convert_wav_to_ahap_streaming",
+    "compact_ahap_file",
+    "IncrementalAhapGenerator",
+    "agenerate_personalized_meditation",
+    "agenerate_tts_audio_iembrace",
+    "agenerate_tts_audio_elevenlabs",
+    "agenerate_sfx_audio_elevenlabs",
+    "aclose_default_clients",
 ]
@@ -1,12 +1,106 @@
 from __future__ import annotations
 
+import bisect
 import json
+import math
 import os
+import struct
+import textwrap
+from collections.abc import Sequence
 from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
 
 import librosa
 import numpy as np
-from tqdm import tqdm
+import numpy.typing as npt
+from scipy.ndimage import median_filter
+
+from .ahap_instrumentation import AhapInstrumentation, instrumented_stage
+
+if TYPE_CHECKING:
+    from .ahap_cache import AhapCache
+
+
+_STFT_N_FFT = 2048
+_STFT_HOP_LENGTH = 512
+_FEATURE_BLOCK_FRAMES = 4096
+_HPSS_KERNEL_SIZE = 31
+_BASS_HPSS_MARGIN = (1.0, 20.0)
+# "reference" is the original per-event implementation, kept to validate "fast".
+AHAP_ENGINES = ("fast", "reference")
+# Events per second for each density tier written by `convert_wav_to_ahap`.
+DENSITY_TIERS = {"low": 6.0, "medium": 15.0, "high": 30.0}
+_WAVE_FORMAT_PCM = 1
+_PCM16_SCALE = 1 / 32768
+
+_SPLIT_PROFILE_MULTIPLIERS = {
+    "vocals": (1.2, 1.1),
+    "drums": (1.5, 1.3),
+    "bass": (1.4, 0.9),
+    "other": (1.3, 1.2),
+}
+
+
+class AhapOutputFormat(NamedTuple):
+    """How AHAP JSON is serialized.
+
+    `compact` minifies the JSON and sorts keys for a stable order.
+    `time_resolution` rounds times and durations to 1/N seconds, and
+    `parameter_levels` rounds parameter values to 1/N steps. `None` keeps full
+    precision.
+    """
+
+    compact: bool = False
+    time_resolution: int | None = None
+    parameter_levels: int | None = None
+
+
+PRETTY_AHAP_FORMAT = AhapOutputFormat()
+COMPACT_AHAP_FORMAT = AhapOutputFormat(compact=True, time_resolution=1000, parameter_levels=256)
+
+
+class Decomposition(NamedTuple):
+    """Harmonic, percussive and bass tracks derived from one shared spectrogram."""
+
+    harmonic: np.ndarray
+    percussive: np.ndarray
+    bass: np.ndarray
+
+
+class SignalFeatures(NamedTuple):
+    """Whole-signal features shared by every onset of one track."""
+
+    centroid: np.ndarray
+    peak: float
+    hop_length: int
+
+
+class OnsetFeatures(NamedTuple):
+    """Per-onset features gathered from `SignalFeatures` by array indexing."""
+
+    energy: np.ndarray
+    centroid_windows: np.ndarray
+
+
+class ContinuousEvents(NamedTuple):
+    """Background continuous events as parallel arrays; dicts are built on serialization."""
+
+    times: np.ndarray
+    intensity: np.ndarray
+    sharpness: np.ndarray
+    # One step length for every event, or per-event lengths once events are merged.
+    duration: float | np.ndarray
+
+
+class AhapAnalysis(NamedTuple):
+    """Split-independent analysis of one track; `build_ahap` applies a split profile to it."""
+
+    event_times: np.ndarray
+    is_transient: np.ndarray
+    is_continuous: np.ndarray
+    intensity: np.ndarray
+    sharpness: np.ndarray
+    continuous_events: ContinuousEvents
 
 
 def _canonical_split(split: str) -> str:
@@ -21,9 +115,141 @@ def _safe_peak(signal: np.ndarray) -> float:
     return peak if peak > 0 else 1.0
 
 
-def write_ahap_file(output_ahap: str, ahap_data: dict[str, object]) -> None:
-    with open(output_ahap, "w", encoding="utf-8") as f:
-        json.dump(ahap_data, f, indent=2)
+def _check_engine(engine: str, **post_processing: object) -> None:
+    if engine not in AHAP_ENGINES:
+        msg = f"Unknown AHAP engine {engine!r}; expected one of {', '.join(AHAP_ENGINES)}."
+        raise ValueError(msg)
+    enabled = [name for name, value in post_processing.items() if value]
+    if engine == "reference" and enabled:
+        msg = f"The reference engine only writes the original output; drop {', '.join(enabled)}."
+        raise ValueError(msg)
+
+
+def _decompose_audio_reference(audio_data: np.ndarray) -> Decomposition:
+    harmonic, percussive = librosa.effects.hpss(audio_data)
+    bass = librosa.effects.hpss(audio_data, margin=_BASS_HPSS_MARGIN)[0]
+    return Decomposition(harmonic=harmonic, percussive=percussive, bass=bass)
+
+
+def decompose_audio(audio_data: np.ndarray) -> Decomposition:
+    """Split audio into harmonic, percussive and bass tracks with a single STFT.
+
+    Equivalent to `librosa.effects.hpss(audio_data)` plus the harmonic output of
+    `librosa.effects.hpss(audio_data, margin=(1.0, 20.0))`, but the STFT and the
+    two median filters are computed once and both mask sets are derived from them.
+    """
+    stft = librosa.stft(audio_data)
+    magnitude, phase = librosa.magphase(stft)
+    del stft
+
+    harmonic_filtered = median_filter(magnitude, size=(1, _HPSS_KERNEL_SIZE), mode="reflect")
+    percussive_filtered = median_filter(magnitude, size=(_HPSS_KERNEL_SIZE, 1), mode="reflect")
+
+    def _inverse(mask: np.ndarray) -> np.ndarray:
+        return librosa.istft(magnitude * mask * phase, dtype=audio_data.dtype, length=len(audio_data))
+
+    harmonic = _inverse(
+        librosa.util.softmask(harmonic_filtered, percussive_filtered, power=2.0, split_zeros=True)
+    )
+    percussive = _inverse(
+        librosa.util.softmask(percussive_filtered, harmonic_filtered, power=2.0, split_zeros=True)
+    )
+
+    # Only the harmonic side of the bass pass is used, so its percussive mask is skipped.
+    bass_harm_margin, bass_perc_margin = _BASS_HPSS_MARGIN
+    bass = _inverse(
+        librosa.util.softmask(
+            harmonic_filtered,
+            percussive_filtered * bass_harm_margin,
+            power=2.0,
+            split_zeros=bass_harm_margin == 1 and bass_perc_margin == 1,
+        )
+    )
+
+    return Decomposition(harmonic=harmonic, percussive=percussive, bass=bass)
+
+
+def _quantize_ahap(value: object, output_format: AhapOutputFormat, key: str | None = None) -> object:
+    if isinstance(value, dict):
+        return {item_key: _quantize_ahap(item, output_format, item_key) for item_key, item in value.items()}
+    if isinstance(value, list):
+        return [_quantize_ahap(item, output_format) for item in value]
+    if isinstance(value, float):
+        if key in {"Time", "EventDuration"} and output_format.time_resolution:
+            return round(value * output_format.time_resolution) / output_format.time_resolution
+        if key == "ParameterValue" and output_format.parameter_levels:
+            return round(value * output_format.parameter_levels) / output_format.parameter_levels
+    return value
+
+
+def encode_ahap(ahap_data: object, output_format: AhapOutputFormat = PRETTY_AHAP_FORMAT) -> str:
+    """Serialize AHAP data (or a single event) in `output_format`."""
+    if output_format.time_resolution or output_format.parameter_levels:
+        ahap_data = _quantize_ahap(ahap_data, output_format)
+    if output_format.compact:
+        return json.dumps(ahap_data, separators=(",", ":"), sort_keys=True)
+    return json.dumps(ahap_data, indent=2)
+
+
+def write_ahap_file(
+    output_ahap: str,
+    ahap_data: dict[str, object],
+    output_format: AhapOutputFormat = PRETTY_AHAP_FORMAT,
+) -> int:
+    """Write `ahap_data` to `output_ahap` and return the number of bytes written."""
+    encoded = encode_ahap(ahap_data, output_format).encode("utf-8")
+    with open(output_ahap, "wb") as f:
+        f.write(encoded)
+    return len(encoded)
+
+
+def compact_ahap_file(
+    input_ahap: str,
+    output_ahap: str | None = None,
+    output_format: AhapOutputFormat = COMPACT_AHAP_FORMAT,
+) -> tuple[int, int]:
+    """Rewrite an existing `.ahap` file in `output_format`; return (old, new) sizes in bytes."""
+    with open(input_ahap, encoding="utf-8") as f:
+        ahap_data = json.load(f)
+    old_size = os.path.getsize(input_ahap)
+    return old_size, write_ahap_file(output_ahap or input_ahap, ahap_data, output_format)
+
+
+class AhapStreamWriter:
+    """Write AHAP events to disk as they are produced.
+
+    The file is byte-identical to `write_ahap_file` for the same pattern and
+    format, but the pattern never has to be held in memory.
+    """
+
+    def __init__(self, output_ahap: str, output_format: AhapOutputFormat = PRETTY_AHAP_FORMAT) -> None:
+        self._output_format = output_format
+        self._file = open(output_ahap, "w", encoding="utf-8")  # noqa: SIM115 - closed in `close`.
+        self._file.write('{"Pattern":[' if output_format.compact else '{\n  "Version": 1.0,\n  "Pattern": [')
+        self._event_count = 0
+
+    def write_events(self, events: list[dict[str, object]]) -> None:
+        for event in events:
+            encoded = encode_ahap(event, self._output_format)
+            if self._output_format.compact:
+                self._file.write(("," if self._event_count else "") + encoded)
+            else:
+                separator = ",\n" if self._event_count else "\n"
+                self._file.write(separator + textwrap.indent(encoded, "    "))
+            self._event_count += 1
+
+    def close(self) -> None:
+        if self._output_format.compact:
+            self._file.write('],"Version":1.0}')
+        else:
+            self._file.write("\n  ]\n}" if self._event_count else "]\n}")
+        self._file.close()
+
+    def __enter__(self) -> AhapStreamWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
 
 
 def calculate_parameters(
@@ -63,14 +289,7 @@ def calculate_parameters(
     scaled_sharpness = np.clip(sharpness / _safe_peak(spectral_centroid), 0, 1) * sharpness_factor
     scaled_sharpness = float(np.clip(scaled_sharpness, 0, 1))
 
-    profile_multiplier = {
-        "vocals": (1.2, 1.1),
-        "drums": (1.5, 1.3),
-        "bass": (1.4, 0.9),
-        "other": (1.3, 1.2),
-    }
-
-    energy_mult, sharpness_mult = profile_multiplier.get(split, (1.0, 1.0))
+    energy_mult, sharpness_mult = _SPLIT_PROFILE_MULTIPLIERS.get(split, (1.0, 1.0))
     scaled_energy = float(np.clip(scaled_energy * energy_mult, 0, 1))
     scaled_sharpness = float(np.clip(scaled_sharpness * sharpness_mult, 0, 1))
 
@@ -166,6 +385,271 @@ def determine_haptic_mode(
     return "both"
 
 
+def extract_signal_features(audio_data: np.ndarray, sample_rate: int) -> SignalFeatures:
+    """Compute the spectral centroid of every STFT frame and the signal peak in one pass.
+
+    Frames match `librosa.feature.spectral_centroid` with its default centered
+    framing. The STFT is evaluated in blocks of frames so memory stays bounded
+    on long tracks.
+    """
+    hop_length = _STFT_HOP_LENGTH
+    n_frames = 1 + len(audio_data) // hop_length
+    padded = np.pad(audio_data, _STFT_N_FFT // 2, mode="constant")
+    centroid = np.zeros(n_frames, dtype=audio_data.dtype)
+
+    for first_frame in range(0, n_frames, _FEATURE_BLOCK_FRAMES):
+        block_frames = min(_FEATURE_BLOCK_FRAMES, n_frames - first_frame)
+        start = first_frame * hop_length
+        end = start + (block_frames - 1) * hop_length + _STFT_N_FFT
+        magnitude = np.abs(
+            librosa.stft(
+                padded[start:end],
+                n_fft=_STFT_N_FFT,
+                hop_length=hop_length,
+                center=False,
+            )
+        )
+        centroid[first_frame : first_frame + block_frames] = librosa.feature.spectral_centroid(
+            S=magnitude,
+            sr=sample_rate,
+            n_fft=_STFT_N_FFT,
+            hop_length=hop_length,
+        )[0]
+
+    return SignalFeatures(centroid=centroid, peak=_safe_peak(audio_data), hop_length=hop_length)
+
+
+def _centroid_window_indices(
+    event_times: np.ndarray,
+    sample_rate: int,
+    hop_length: int,
+    n_frames: int,
+) -> np.ndarray:
+    # Centroid frames covering the 50 ms window that starts 25 ms before each event.
+    centroid_frames = 1 + int(sample_rate * 0.05) // hop_length
+    centroid_starts = np.maximum(0, ((event_times - 0.025) * sample_rate).astype(np.int64))
+    first_frames = np.rint(centroid_starts / hop_length).astype(np.int64)
+    return np.minimum(first_frames[:, None] + np.arange(centroid_frames), n_frames - 1)
+
+
+def extract_onset_features(
+    audio_data: np.ndarray,
+    sample_rate: int,
+    features: SignalFeatures,
+    event_times: np.ndarray,
+) -> OnsetFeatures:
+    """Gather the 20 ms RMS and 50 ms centroid frames around each event time."""
+    event_times = np.asarray(event_times, dtype=np.float64)
+
+    window_size = int(sample_rate * 0.02)
+    starts = np.maximum(0, ((event_times - 0.01) * sample_rate).astype(np.int64))
+    indices = starts[:, None] + np.arange(window_size)
+    valid = indices < len(audio_data)
+    samples = np.where(valid, audio_data[np.minimum(indices, max(len(audio_data) - 1, 0))], 0.0)
+    counts = np.maximum(valid.sum(axis=1), 1)
+    energy = np.sqrt(np.sum(np.square(samples), axis=1) / counts)
+
+    frame_indices = _centroid_window_indices(event_times, sample_rate, features.hop_length, len(features.centroid))
+    return OnsetFeatures(energy=energy, centroid_windows=features.centroid[frame_indices])
+
+
+def classify_haptic_modes(onsets: OnsetFeatures, mode: str) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized `determine_haptic_mode`: return (transient, continuous) masks per onset."""
+    if mode == "sfx":
+        transient_rms_threshold = 0.5
+        continuous_rms_threshold = 0.2
+        spectral_percentile = 90
+    else:
+        transient_rms_threshold = 0.2
+        continuous_rms_threshold = 0.1
+        spectral_percentile = 70
+
+    if not len(onsets.energy):
+        empty = np.zeros(0, dtype=bool)
+        return empty, empty
+
+    centroid_mean = onsets.centroid_windows.mean(axis=1)
+    spectral_threshold = np.percentile(onsets.centroid_windows, spectral_percentile, axis=1)
+
+    is_transient = (onsets.energy > transient_rms_threshold) & (centroid_mean > spectral_threshold)
+    is_continuous = ~is_transient & (onsets.energy < continuous_rms_threshold)
+    is_both = ~is_transient & ~is_continuous
+    return is_transient | is_both, is_continuous | is_both
+
+
+def scale_onset_parameters(
+    onsets: OnsetFeatures,
+    peak: float | np.ndarray,
+    sharpness_factor: float = 3.0,
+    intensity_factor: float = 2.5,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized `calculate_parameters` before the split profile: return (intensity, sharpness)."""
+    if not len(onsets.energy):
+        empty = np.zeros(0, dtype=np.float64)
+        return empty, empty
+
+    centroid_mean = onsets.centroid_windows.mean(axis=1)
+    centroid_peak = np.abs(onsets.centroid_windows).max(axis=1)
+    centroid_peak = np.where(centroid_peak > 0, centroid_peak, 1.0)
+
+    return (
+        np.clip(np.clip(onsets.energy / peak, 0, 1) * intensity_factor, 0, 1),
+        np.clip(np.clip(centroid_mean / centroid_peak, 0, 1) * sharpness_factor, 0, 1),
+    )
+
+
+def apply_split_profile(
+    intensity: np.ndarray,
+    sharpness: np.ndarray,
+    split: str,
+) -> tuple[np.ndarray, np.ndarray]:
+    energy_mult, sharpness_mult = _SPLIT_PROFILE_MULTIPLIERS.get(_canonical_split(split), (1.0, 1.0))
+    return np.clip(intensity * energy_mult, 0, 1), np.clip(sharpness * sharpness_mult, 0, 1)
+
+
+def _block_rms(track: np.ndarray, block_size: int) -> np.ndarray:
+    full_blocks = len(track) // block_size
+    blocks = track[: full_blocks * block_size].reshape(full_blocks, block_size)
+    rms = np.sqrt(np.mean(np.square(blocks), axis=1))
+    tail = track[full_blocks * block_size :]
+    if tail.size:
+        rms = np.append(rms, np.sqrt(np.mean(np.square(tail))))
+    return rms
+
+
+def compute_continuous_events(
+    sample_rate: int,
+    harmonic: np.ndarray,
+    bass: np.ndarray,
+    duration: float,
+    time_step: float,
+    intensity_factor: float = 2.5,
+    sharpness_factor: float = 3.0,
+) -> ContinuousEvents:
+    """Compute background continuous events for fixed `time_step` blocks in one NumPy pass.
+
+    Intensity follows the bass RMS and sharpness the harmonic RMS of each block,
+    both normalized by the peak of their whole track.
+    """
+    block_size = max(1, int(round(time_step * sample_rate)))
+    bass_rms = _block_rms(bass, block_size)
+    harmonic_rms = _block_rms(harmonic, block_size)
+
+    times = np.arange(0, duration, time_step) if duration > 0 else np.zeros(0)
+    count = min(len(times), len(bass_rms), len(harmonic_rms))
+
+    return _scale_continuous_rms(
+        times[:count],
+        bass_rms[:count],
+        harmonic_rms[:count],
+        _safe_peak(bass),
+        _safe_peak(harmonic),
+        time_step,
+        intensity_factor=intensity_factor,
+        sharpness_factor=sharpness_factor,
+    )
+
+
+def _scale_continuous_rms(
+    times: np.ndarray,
+    bass_rms: np.ndarray,
+    harmonic_rms: np.ndarray,
+    bass_peak: float,
+    harmonic_peak: float,
+    time_step: float,
+    intensity_factor: float,
+    sharpness_factor: float,
+) -> ContinuousEvents:
+    intensity = np.clip(np.clip(bass_rms / bass_peak, 0, 1) * intensity_factor, 0, 1)
+    sharpness = np.clip(np.clip(harmonic_rms / harmonic_peak, 0, 1) * sharpness_factor, 0, 1)
+    return ContinuousEvents(times=times, intensity=intensity, sharpness=sharpness, duration=time_step)
+
+
+def _continuous_durations(events: ContinuousEvents) -> list[float]:
+    if isinstance(events.duration, np.ndarray):
+        return events.duration.tolist()
+    return [events.duration] * len(events.times)
+
+
+def _continuous_event_dicts(events: ContinuousEvents) -> list[dict[str, object]]:
+    return [
+        {
+            "Event": {
+                "Time": time,
+                "EventType": "HapticContinuous",
+                "EventDuration": duration,
+                "EventParameters": [
+                    {"ParameterID": "HapticIntensity", "ParameterValue": intensity},
+                    {"ParameterID": "HapticSharpness", "ParameterValue": sharpness},
+                ],
+            }
+        }
+        for time, intensity, sharpness, duration in zip(
+            events.times.tolist(),
+            events.intensity.tolist(),
+            events.sharpness.tolist(),
+            _continuous_durations(events),
+        )
+    ]
+
+
+def coalesce_continuous_events(events: ContinuousEvents, tolerance: float) -> list[dict[str, object]]:
+    """Merge runs of adjacent continuous events whose parameters stay within `tolerance`.
+
+    A run grows while its intensity range and sharpness range each stay within
+    `2 * tolerance`, and the merged event takes the middle of both ranges, so
+    every event it replaces is matched to within `tolerance`. Merged events
+    keep constant parameters: dynamic parameter curves would also scale the
+    onset events playing at the same time.
+    """
+    times = events.times.tolist()
+    intensity = events.intensity.tolist()
+    sharpness = events.sharpness.tolist()
+    durations = _continuous_durations(events)
+    if not times:
+        return []
+
+    # (first, end) index ranges of the merged runs, with the value ranges of the open run.
+    runs: list[tuple[int, int]] = []
+    first = 0
+    intensity_range = [intensity[0], intensity[0]]
+    sharpness_range = [sharpness[0], sharpness[0]]
+    for index in range(1, len(times)):
+        adjacent = math.isclose(times[index], times[index - 1] + durations[index - 1], abs_tol=1e-6)
+        grown_intensity = [min(intensity_range[0], intensity[index]), max(intensity_range[1], intensity[index])]
+        grown_sharpness = [min(sharpness_range[0], sharpness[index]), max(sharpness_range[1], sharpness[index])]
+        if (
+            adjacent
+            and grown_intensity[1] - grown_intensity[0] <= 2 * tolerance
+            and grown_sharpness[1] - grown_sharpness[0] <= 2 * tolerance
+        ):
+            intensity_range, sharpness_range = grown_intensity, grown_sharpness
+            continue
+        runs.append((first, index))
+        first = index
+        intensity_range = [intensity[index], intensity[index]]
+        sharpness_range = [sharpness[index], sharpness[index]]
+    runs.append((first, len(times)))
+
+    def _midpoint(values: list[float]) -> float:
+        return (min(values) + max(values)) / 2
+
+    return _continuous_event_dicts(
+        ContinuousEvents(
+            times=np.array([times[first] for first, _ in runs], dtype=np.float64),
+            intensity=np.array([_midpoint(intensity[first:end]) for first, end in runs], dtype=np.float64),
+            sharpness=np.array([_midpoint(sharpness[first:end]) for first, end in runs], dtype=np.float64),
+            duration=np.array([times[end - 1] + durations[end - 1] - times[first] for first, end in runs]),
+        )
+    )
+
+
+def _continuous_pattern(events: ContinuousEvents, continuous_tolerance: float | None) -> list[dict[str, object]]:
+    if continuous_tolerance is None:
+        return _continuous_event_dicts(events)
+    return coalesce_continuous_events(events, continuous_tolerance)
+
+
 def add_continuous_events(
     pattern: list[dict[str, object]],
     audio_data: np.ndarray,
@@ -177,9 +661,29 @@ def add_continuous_events(
     intensity_factor: float = 2.5,
     sharpness_factor: float = 3.0,
 ) -> None:
-    num_steps = int(duration / time_step) if duration > 0 else 0
+    events = compute_continuous_events(
+        sample_rate,
+        harmonic,
+        bass,
+        duration,
+        time_step,
+        intensity_factor=intensity_factor,
+        sharpness_factor=sharpness_factor,
+    )
+    pattern.extend(_continuous_event_dicts(events))
+
 
-    for t in tqdm(np.arange(0, duration, time_step), total=num_steps, desc="Processing continuous events"):
+def _add_continuous_events_reference(
+    pattern: list[dict[str, object]],
+    sample_rate: int,
+    harmonic: np.ndarray,
+    bass: np.ndarray,
+    duration: float,
+    time_step: float,
+    intensity_factor: float,
+    sharpness_factor: float,
+) -> None:
+    for t in np.arange(0, duration, time_step):
         start = int(t * sample_rate)
         end = int((t + time_step) * sample_rate)
 
@@ -212,7 +716,7 @@ def add_continuous_events(
         )
 
 
-def generate_ahap(
+def _generate_ahap_reference(
     audio_data: np.ndarray,
     sample_rate: int,
     mode: str,
@@ -224,13 +728,12 @@ def generate_ahap(
     sharpness_factor: float,
     intensity_factor: float,
 ) -> dict[str, object]:
-    """Generate AHAP payload data from prepared audio arrays and decomposition tracks."""
     pattern: list[dict[str, object]] = []
 
     onsets = librosa.onset.onset_detect(y=audio_data, sr=sample_rate)
     event_times = librosa.frames_to_time(onsets, sr=sample_rate)
 
-    for event_time in tqdm(event_times, total=len(event_times), desc="Processing transient events"):
+    for event_time in event_times:
         haptic_mode = determine_haptic_mode(
             audio_data,
             float(event_time),
@@ -267,9 +770,8 @@ def generate_ahap(
                 )
             )
 
-    add_continuous_events(
+    _add_continuous_events_reference(
         pattern,
-        audio_data,
         sample_rate,
         harmonic,
         bass,
@@ -282,6 +784,348 @@ def generate_ahap(
     return {"Version": 1.0, "Pattern": pattern}
 
 
+def analyze_audio(
+    audio_data: np.ndarray,
+    sample_rate: int,
+    mode: str,
+    harmonic: np.ndarray,
+    bass: np.ndarray,
+    duration: float,
+    sharpness_factor: float,
+    intensity_factor: float,
+    instrumentation: AhapInstrumentation | None = None,
+) -> AhapAnalysis:
+    """Run every split-independent stage of AHAP generation once."""
+    with instrumented_stage(instrumentation, "onset") as stage:
+        onset_frames = librosa.onset.onset_detect(y=audio_data, sr=sample_rate)
+        event_times = librosa.frames_to_time(onset_frames, sr=sample_rate)
+        stage.items = len(event_times)
+
+    with instrumented_stage(instrumentation, "transient_events") as stage:
+        features = extract_signal_features(audio_data, sample_rate)
+        onsets = extract_onset_features(audio_data, sample_rate, features, event_times)
+        is_transient, is_continuous = classify_haptic_modes(onsets, mode)
+        intensity, sharpness = scale_onset_parameters(
+            onsets,
+            features.peak,
+            sharpness_factor=sharpness_factor,
+            intensity_factor=intensity_factor,
+        )
+        stage.items = int(np.count_nonzero(is_transient) + np.count_nonzero(is_continuous))
+
+    with instrumented_stage(instrumentation, "continuous_events") as stage:
+        continuous_events = compute_continuous_events(
+            sample_rate,
+            harmonic,
+            bass,
+            duration,
+            time_step=0.1,
+            intensity_factor=intensity_factor,
+            sharpness_factor=sharpness_factor,
+        )
+        stage.items = len(continuous_events.times)
+
+    return AhapAnalysis(
+        event_times=event_times,
+        is_transient=is_transient,
+        is_continuous=is_continuous,
+        intensity=intensity,
+        sharpness=sharpness,
+        continuous_events=continuous_events,
+    )
+
+
+def _onset_event_dicts(
+    event_times: np.ndarray,
+    is_transient: np.ndarray,
+    is_continuous: np.ndarray,
+    intensities: np.ndarray,
+    sharpnesses: np.ndarray,
+) -> list[dict[str, object]]:
+    pattern: list[dict[str, object]] = []
+
+    for index, event_time in enumerate(event_times.tolist()):
+        parameters = [
+            {"ParameterID": "HapticIntensity", "ParameterValue": float(intensities[index])},
+            {"ParameterID": "HapticSharpness", "ParameterValue": float(sharpnesses[index])},
+        ]
+
+        if is_transient[index]:
+            pattern.append(
+                {
+                    "Event": {
+                        "Time": event_time,
+                        "EventType": "HapticTransient",
+                        "EventParameters": parameters,
+                    }
+                }
+            )
+
+        if is_continuous[index]:
+            pattern.append(
+                {
+                    "Event": {
+                        "Time": event_time,
+                        "EventType": "HapticContinuous",
+                        "EventParameters": [dict(parameter) for parameter in parameters],
+                        "EventDuration": 0.1,
+                    }
+                }
+            )
+
+    return pattern
+
+
+def _merge_continuous_groups(events: ContinuousEvents, groups: list[np.ndarray]) -> ContinuousEvents:
+    durations = np.asarray(_continuous_durations(events), dtype=np.float64)
+    return ContinuousEvents(
+        times=np.array([events.times[group[0]] for group in groups], dtype=np.float64),
+        intensity=np.array([events.intensity[group].mean() for group in groups], dtype=np.float64),
+        sharpness=np.array([events.sharpness[group].mean() for group in groups], dtype=np.float64),
+        duration=np.array(
+            [events.times[group[-1]] + durations[group[-1]] - events.times[group[0]] for group in groups],
+            dtype=np.float64,
+        ),
+    )
+
+
+def _fits_window(kept: list[float], time: float, budget: int) -> bool:
+    """Whether an event at `time` keeps every one-second window over sorted `kept` within `budget` events."""
+    position = bisect.bisect_right(kept, time)
+
+    def _at(index: int) -> float:
+        # `kept` with `time` inserted at `position`, without copying it.
+        if index == position:
+            return time
+        return kept[index if index < position else index - 1]
+
+    # A window [t, t + 1) overflows exactly when some run of `budget + 1` events spans less than a second.
+    for first in range(max(0, position - budget), min(position, len(kept) - budget) + 1):
+        if _at(first + budget) - _at(first) < 1.0:
+            return False
+    return True
+
+
+def decimate_analysis(analysis: AhapAnalysis, events_per_second: float) -> AhapAnalysis:
+    """Thin an analysis so no one-second window, wherever it starts, holds more than `events_per_second` events.
+
+    Onset events are limited first, to the budget less a quarter reserved for
+    background events: they are kept greedily, transients ahead of onset
+    continuous events and stronger events ahead of weaker ones, whenever they
+    still fit. Background continuous events then fill the remaining room in
+    time order; one that does not fit is merged into the event before it,
+    which averages their intensity and sharpness and spans both.
+    """
+    budget = max(1, int(events_per_second))
+    background_floor = max(1, budget // 4)
+    onset_budget = budget - background_floor
+
+    is_transient = np.zeros_like(analysis.is_transient)
+    is_continuous = np.zeros_like(analysis.is_continuous)
+    kept: list[float] = []
+
+    # (is transient, intensity, onset index) for each onset event, strongest first.
+    onset_events = [(True, analysis.intensity[index], index) for index in np.flatnonzero(analysis.is_transient)]
+    onset_events += [(False, analysis.intensity[index], index) for index in np.flatnonzero(analysis.is_continuous)]
+    for transient, _, index in sorted(onset_events, reverse=True):
+        event_time = float(analysis.event_times[index])
+        if _fits_window(kept, event_time, onset_budget):
+            bisect.insort(kept, event_time)
+            (is_transient if transient else is_continuous)[index] = True
+
+    background = analysis.continuous_events
+    group_starts: list[int] = []
+    for index, event_time in enumerate(background.times.tolist()):
+        # The first background event always fits, as onsets leave room for at least one.
+        if not group_starts or _fits_window(kept, event_time, budget):
+            bisect.insort(kept, event_time)
+            group_starts.append(index)
+
+    groups = np.split(np.arange(len(background.times)), group_starts[1:]) if group_starts else []
+    return analysis._replace(
+        is_transient=is_transient,
+        is_continuous=is_continuous,
+        continuous_events=_merge_continuous_groups(background, groups),
+    )
+
+
+def build_ahap(
+    analysis: AhapAnalysis,
+    split: str,
+    continuous_tolerance: float | None = None,
+) -> dict[str, object]:
+    """Apply the split profile to a shared analysis and assemble the AHAP payload.
+
+    With `continuous_tolerance`, runs of similar background continuous events are
+    merged (see `coalesce_continuous_events`).
+    """
+    pattern: list[dict[str, object]] = []
+    intensities, sharpnesses = apply_split_profile(analysis.intensity, analysis.sharpness, split)
+
+    pattern.extend(
+        _onset_event_dicts(
+            analysis.event_times,
+            analysis.is_transient,
+            analysis.is_continuous,
+            intensities,
+            sharpnesses,
+        )
+    )
+    pattern.extend(_continuous_pattern(analysis.continuous_events, continuous_tolerance))
+
+    return {"Version": 1.0, "Pattern": pattern}
+
+
+def generate_ahap(
+    audio_data: np.ndarray,
+    sample_rate: int,
+    mode: str,
+    harmonic: np.ndarray,
+    percussive: np.ndarray,
+    bass: np.ndarray,
+    duration: float,
+    split: str,
+    sharpness_factor: float,
+    intensity_factor: float,
+    engine: str = "fast",
+    events_per_second: float | None = None,
+    instrumentation: AhapInstrumentation | None = None,
+) -> dict[str, object]:
+    """Generate AHAP payload data from prepared audio arrays and decomposition tracks.
+
+    `engine="reference"` runs the original per-event implementation.
+    `events_per_second` caps event density (see `decimate_analysis`).
+    `instrumentation` sees the same analysis stages as in `convert_wav_to_ahap`.
+    """
+    _check_engine(engine, events_per_second=events_per_second is not None)
+    if engine == "reference":
+        with instrumented_stage(instrumentation, "reference_events") as stage:
+            ahap_data = _generate_ahap_reference(
+                audio_data,
+                sample_rate,
+                mode,
+                harmonic,
+                percussive,
+                bass,
+                duration,
+                split,
+                sharpness_factor=sharpness_factor,
+                intensity_factor=intensity_factor,
+            )
+            stage.items = 1
+        return ahap_data
+
+    analysis = analyze_audio(
+        audio_data,
+        sample_rate,
+        mode,
+        harmonic,
+        bass,
+        duration,
+        sharpness_factor=sharpness_factor,
+        intensity_factor=intensity_factor,
+        instrumentation=instrumentation,
+    )
+    if events_per_second is not None:
+        with instrumented_stage(instrumentation, "decimate") as stage:
+            analysis = decimate_analysis(analysis, events_per_second)
+            stage.items = 1
+    return build_ahap(analysis, split)
+
+
+def ahap_output_paths(
+    input_wav: str,
+    output_dir: str | None,
+    split: str,
+    density_tiers: Sequence[str] | None = None,
+) -> dict[str, str]:
+    """Map each split target written by `convert_wav_to_ahap` to its output path.
+
+    With `density_tiers`, every split gets one file per tier, keyed `<split>_<tier>`.
+    """
+    split = _canonical_split(split)
+    if density_tiers:
+        unknown = [tier for tier in density_tiers if tier not in DENSITY_TIERS]
+        if unknown:
+            msg = f"Unknown density tiers {unknown}; expected some of {', '.join(DENSITY_TIERS)}."
+            raise ValueError(msg)
+        return {
+            f"{split_type}_{tier}": output_ahap.removesuffix(".ahap") + f"_{tier}.ahap"
+            for split_type, output_ahap in ahap_output_paths(input_wav, output_dir, split).items()
+            for tier in density_tiers
+        }
+
+    if not output_dir:
+        output_dir = str(Path(input_wav).resolve().parent)
+
+    input_base = Path(input_wav).name
+    suffix = Path(input_wav).suffix
+
+    if split == "none":
+        output_ahap = os.path.join(output_dir, input_base.replace(suffix, ".ahap"))
+        return {split: output_ahap.replace("_background", "")}
+
+    split_targets = ["bass", "vocals", "drums", "other"] if split == "all" else [split]
+    return {
+        split_type: os.path.join(output_dir, input_base.replace(suffix, f"_{split_type}.ahap"))
+        for split_type in split_targets
+    }
+
+
+def _pcm16_mono_data_span(input_wav: str, sample_rate: int) -> tuple[int, int] | None:
+    """Return (offset, sample count) of the data chunk if `input_wav` is 16-bit mono PCM at `sample_rate`."""
+    with open(input_wav, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:] != b"WAVE":
+            return None
+
+        matches_format = False
+        while chunk_header := f.read(8):
+            if len(chunk_header) < 8:
+                return None
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+                if len(fmt) < 16:
+                    return None
+                format_tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+                matches_format = (format_tag, channels, rate, bits) == (_WAVE_FORMAT_PCM, 1, sample_rate, 16)
+                if chunk_size % 2:
+                    f.seek(1, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if not matches_format:
+                    return None
+                offset = f.tell()
+                # Streamed writers may leave a placeholder size, so trust the file length instead.
+                available = os.path.getsize(input_wav) - offset
+                return offset, min(chunk_size, available) // 2
+            else:
+                f.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+    return None
+
+
+def load_audio(input_wav: str, sample_rate: int, dtype: npt.DTypeLike = np.float32) -> tuple[np.ndarray, int]:
+    """Load `input_wav` as mono `dtype` samples at `sample_rate`.
+
+    16-bit mono PCM WAVs already at `sample_rate` are memory-mapped and scaled
+    straight to `dtype`, giving the same samples as `librosa.load`; anything
+    else goes through `librosa.load`.
+    """
+    span = _pcm16_mono_data_span(input_wav, sample_rate)
+    if span is None:
+        return librosa.load(input_wav, sr=sample_rate, mono=True, dtype=dtype)
+
+    offset, n_samples = span
+    if not n_samples:
+        return np.zeros(0, dtype=dtype), sample_rate
+
+    pcm = np.memmap(input_wav, dtype="<i2", mode="r", offset=offset, shape=(n_samples,))
+    audio_data = pcm.astype(dtype)
+    audio_data *= audio_data.dtype.type(_PCM16_SCALE)
+    del pcm
+    return audio_data, sample_rate
+
+
 def convert_wav_to_ahap(
     input_wav: str,
     output_dir: str | None,
@@ -290,8 +1134,40 @@ def convert_wav_to_ahap(
     sample_rate: int = 44100,
     sharpness_factor: float = 3.0,
     intensity_factor: float = 2.5,
+    cache: AhapCache | None = None,
+    output_format: AhapOutputFormat = PRETTY_AHAP_FORMAT,
+    continuous_tolerance: float | None = None,
+    dtype: npt.DTypeLike = np.float32,
+    instrumentation: AhapInstrumentation | None = None,
+    engine: str = "fast",
+    events_per_second: float | None = None,
+    density_tiers: Sequence[str] | None = None,
 ) -> list[str]:
-    """Convert an input audio file into one or more `.ahap` files."""
+    """Convert an input audio file into one or more `.ahap` files.
+
+    `dtype` sets the precision of the whole analysis path. float32 needs half
+    the memory of float64 and stays within 1e-6 of it (see `ahap_parity`).
+
+    With a `cache`, audio whose decoded PCM and parameters were converted before
+    is served by copying the cached files instead of re-running the analysis.
+    `instrumentation` receives the start, end, item count and elapsed time of
+    each stage (load, cache, hpss, onset, transient_events, continuous_events,
+    write). `engine="reference"` runs the original per-event implementation
+    (reported as a single `reference_events` stage) for parity checks.
+
+    `events_per_second` caps event density (see `decimate_analysis`);
+    `density_tiers` instead writes one file per named tier in `DENSITY_TIERS`,
+    suffixed with the tier name.
+    """
+    _check_engine(
+        engine,
+        continuous_tolerance=continuous_tolerance is not None,
+        events_per_second=events_per_second is not None,
+        density_tiers=density_tiers,
+    )
+    if events_per_second is not None and density_tiers:
+        msg = "Pass either events_per_second or density_tiers, not both."
+        raise ValueError(msg)
     split = _canonical_split(split)
 
     if not output_dir:
@@ -299,60 +1175,115 @@ def convert_wav_to_ahap(
 
     os.makedirs(output_dir, exist_ok=True)
 
-    audio_data, loaded_sample_rate = librosa.load(input_wav, sr=sample_rate, mono=True)
+    with instrumented_stage(instrumentation, "load") as stage:
+        audio_data, loaded_sample_rate = load_audio(input_wav, sample_rate, dtype)
+        stage.items = len(audio_data)
     duration = len(audio_data) / loaded_sample_rate if loaded_sample_rate else 0.0
 
-    harmonic, percussive = librosa.effects.hpss(audio_data)
-    bass = librosa.effects.hpss(audio_data, margin=(1.0, 20.0))[0]
-
-    output_files: list[str] = []
-    input_base = Path(input_wav).name
-
-    if split == "none":
-        ahap_data = generate_ahap(
-            audio_data,
-            loaded_sample_rate,
-            mode,
-            harmonic,
-            percussive,
-            bass,
-            duration,
-            split,
-            sharpness_factor=sharpness_factor,
-            intensity_factor=intensity_factor,
-        )
-        output_ahap = os.path.join(output_dir, input_base.replace(Path(input_wav).suffix, ".ahap"))
-        output_ahap = output_ahap.replace("_background", "")
-        write_ahap_file(output_ahap, ahap_data)
-        output_files.append(output_ahap)
-        return output_files
-
-    split_targets = ["bass", "vocals", "drums", "other"] if split == "all" else [split]
-
-    for split_type in split_targets:
-        ahap_data = generate_ahap(
-            audio_data,
-            loaded_sample_rate,
-            mode,
-            harmonic,
-            percussive,
-            bass,
-            duration,
-            split_type,
-            sharpness_factor=sharpness_factor,
-            intensity_factor=intensity_factor,
-        )
-        output_ahap = os.path.join(
-            output_dir,
-            input_base.replace(Path(input_wav).suffix, f"_{split_type}.ahap"),
+    output_paths = ahap_output_paths(input_wav, output_dir, split, density_tiers)
+
+    cache_key = None
+    if cache is not None:
+        with instrumented_stage(instrumentation, "cache") as stage:
+            cache_key = cache.make_key(
+                audio_data,
+                mode=mode,
+                split=split,
+                sample_rate=loaded_sample_rate,
+                sharpness_factor=sharpness_factor,
+                intensity_factor=intensity_factor,
+                output_format=output_format,
+                continuous_tolerance=continuous_tolerance,
+                engine=engine,
+                events_per_second=events_per_second,
+                density_tiers=density_tiers,
+            )
+            restored = cache.restore(cache_key, output_paths)
+            stage.items = len(output_paths) if restored else 0
+        if restored:
+            return list(output_paths.values())
+
+    with instrumented_stage(instrumentation, "hpss") as stage:
+        harmonic, percussive, bass = (_decompose_audio_reference if engine == "reference" else decompose_audio)(
+            audio_data
         )
-        write_ahap_file(output_ahap, ahap_data)
-        output_files.append(output_ahap)
-
-    return output_files
+        stage.items = len(audio_data)
 
+    if engine == "reference":
+        with instrumented_stage(instrumentation, "reference_events") as stage:
+            for split_type, output_ahap in output_paths.items():
+                ahap_data = _generate_ahap_reference(
+                    audio_data,
+                    loaded_sample_rate,
+                    mode,
+                    harmonic,
+                    percussive,
+                    bass,
+                    duration,
+                    split_type,
+                    sharpness_factor=sharpness_factor,
+                    intensity_factor=intensity_factor,
+                )
+                write_ahap_file(output_ahap, ahap_data, output_format)
+            stage.items = len(output_paths)
+        if cache is not None and cache_key is not None:
+            cache.put(cache_key, output_paths)
+        return list(output_paths.values())
+
+    # Only the split profile differs between outputs, so analyze the audio once.
+    analysis = analyze_audio(
+        audio_data,
+        loaded_sample_rate,
+        mode,
+        harmonic,
+        bass,
+        duration,
+        sharpness_factor=sharpness_factor,
+        intensity_factor=intensity_factor,
+        instrumentation=instrumentation,
+    )
 
-def generate_ahap_from_file(background_file: str, output_dir: str = "ahap_outputs") -> str:
+    if events_per_second is not None:
+        with instrumented_stage(instrumentation, "decimate") as stage:
+            analysis = decimate_analysis(analysis, events_per_second)
+            stage.items = 1
+
+    tier_analyses: dict[str, AhapAnalysis] = {}
+    if density_tiers:
+        with instrumented_stage(instrumentation, "decimate") as stage:
+            tier_analyses = {tier: decimate_analysis(analysis, DENSITY_TIERS[tier]) for tier in density_tiers}
+            stage.items = len(tier_analyses)
+
+    with instrumented_stage(instrumentation, "write") as stage:
+        for target, output_ahap in output_paths.items():
+            split_type, _, tier = target.partition("_")
+            ahap_data = build_ahap(tier_analyses.get(tier, analysis), split_type, continuous_tolerance)
+            write_ahap_file(output_ahap, ahap_data, output_format)
+        stage.items = len(output_paths)
+
+    if cache is not None and cache_key is not None:
+        cache.put(cache_key, output_paths)
+
+    return list(output_paths.values())
+
+
+def generate_ahap_from_file(
+    background_file: str,
+    output_dir: str = "ahap_outputs",
+    cache: AhapCache | None = None,
+    output_format: AhapOutputFormat = PRETTY_AHAP_FORMAT,
+    continuous_tolerance: float | None = None,
+    instrumentation: AhapInstrumentation | None = None,
+) -> str:
     """Generate a single `.ahap` output file from a background audio file path."""
-    outputs = convert_wav_to_ahap(background_file, output_dir, mode="sfx", split="none")
+    outputs = convert_wav_to_ahap(
+        background_file,
+        output_dir,
+        mode="sfx",
+        split="none",
+        cache=cache,
+        output_format=output_format,
+        continuous_tolerance=continuous_tolerance,
+        instrumentation=instrumentation,
+    )
     return outputs[0]
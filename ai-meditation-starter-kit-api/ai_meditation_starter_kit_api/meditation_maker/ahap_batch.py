@@ -0,0 +1,274 @@
+"""Convert whole directories (or globs) of audio files to AHAP over a process pool.
+
+Example::
+
+    python -m ai_meditation_starter_kit_api.meditation_maker.ahap_batch audio/ --output-dir haptics/
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple
+
+from .ahap import (
+    COMPACT_AHAP_FORMAT,
+    DENSITY_TIERS,
+    PRETTY_AHAP_FORMAT,
+    AhapOutputFormat,
+    ahap_output_paths,
+    convert_wav_to_ahap,
+)
+from .ahap_cache import AhapCache
+from .ahap_instrumentation import NO_INSTRUMENTATION, AhapInstrumentation, ConsoleProgress
+
+_AUDIO_SUFFIXES = {".wav", ".mp3", ".ogg", ".flac"}
+
+
+class BatchProgress(NamedTuple):
+    """One finished file of a batch; `error` is set when its conversion failed."""
+
+    done: int
+    total: int
+    path: str
+    error: str | None = None
+
+
+class BatchResult(NamedTuple):
+    converted: list[str]
+    skipped: list[str]
+    failed: dict[str, str]
+    elapsed_seconds: float
+    audio_seconds: float
+
+    @property
+    def files_per_second(self) -> float:
+        return len(self.converted) / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def audio_seconds_per_second(self) -> float:
+        return self.audio_seconds / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def resolve_batch_inputs(sources: list[str]) -> list[str]:
+    """Expand directories and glob patterns into a sorted, de-duplicated list of audio files."""
+    inputs: set[str] = set()
+    for source in sources:
+        if os.path.isdir(source):
+            inputs.update(
+                str(path) for path in Path(source).iterdir() if path.suffix.lower() in _AUDIO_SUFFIXES
+            )
+        else:
+            inputs.update(glob.glob(source))
+    return sorted(inputs)
+
+
+def is_up_to_date(
+    input_wav: str,
+    output_dir: str | None,
+    split: str,
+    density_tiers: list[str] | None = None,
+) -> bool:
+    """Return whether every output of `input_wav` exists and is newer than the source."""
+    source_mtime = os.path.getmtime(input_wav)
+    return all(
+        os.path.exists(output_ahap) and os.path.getmtime(output_ahap) >= source_mtime
+        for output_ahap in ahap_output_paths(input_wav, output_dir, split, density_tiers).values()
+    )
+
+
+class _LoadedSamples(AhapInstrumentation):
+    """Forward stage events to `inner`, keeping the sample count of the load stage."""
+
+    def __init__(self, inner: AhapInstrumentation | None) -> None:
+        self.inner = inner or NO_INSTRUMENTATION
+        self.samples = 0
+
+    def stage_started(self, stage: str) -> None:
+        self.inner.stage_started(stage)
+
+    def stage_finished(self, stage: str, items: int, elapsed_seconds: float) -> None:
+        if stage == "load":
+            self.samples = items
+        self.inner.stage_finished(stage, items, elapsed_seconds)
+
+
+def _convert_one(
+    input_wav: str,
+    output_dir: str | None,
+    mode: str,
+    split: str,
+    sample_rate: int,
+    sharpness_factor: float,
+    intensity_factor: float,
+    cache: AhapCache | None,
+    output_format: AhapOutputFormat,
+    continuous_tolerance: float | None,
+    instrumentation: AhapInstrumentation | None,
+    events_per_second: float | None,
+    density_tiers: list[str] | None,
+) -> float:
+    # The conversion loads the audio anyway (even on a cache hit), so take its length from there.
+    loaded = _LoadedSamples(instrumentation)
+    convert_wav_to_ahap(
+        input_wav,
+        output_dir,
+        mode=mode,
+        split=split,
+        sample_rate=sample_rate,
+        sharpness_factor=sharpness_factor,
+        intensity_factor=intensity_factor,
+        cache=cache,
+        output_format=output_format,
+        continuous_tolerance=continuous_tolerance,
+        instrumentation=loaded,
+        events_per_second=events_per_second,
+        density_tiers=density_tiers,
+    )
+    return loaded.samples / sample_rate
+
+
+def convert_batch_to_ahap(
+    sources: list[str],
+    output_dir: str | None,
+    mode: str = "sfx",
+    split: str = "none",
+    *,
+    workers: int | None = None,
+    force: bool = False,
+    sample_rate: int = 44100,
+    sharpness_factor: float = 3.0,
+    intensity_factor: float = 2.5,
+    cache: AhapCache | None = None,
+    output_format: AhapOutputFormat = PRETTY_AHAP_FORMAT,
+    continuous_tolerance: float | None = None,
+    instrumentation: AhapInstrumentation | None = None,
+    events_per_second: float | None = None,
+    density_tiers: list[str] | None = None,
+    progress: Callable[[BatchProgress], None] | None = None,
+) -> BatchResult:
+    """Convert every audio file matched by `sources` to AHAP in parallel.
+
+    Files whose outputs are already newer than the source are skipped unless
+    `force` is set. A failing file is reported in `BatchResult.failed` and does
+    not stop the rest of the batch. `progress` is called in this process as each
+    file finishes. `instrumentation` is copied into each worker process, so it
+    should report outward (log, metrics) rather than collect state.
+    """
+    inputs = resolve_batch_inputs(sources)
+    pending: list[str] = []
+    skipped: list[str] = []
+    for path in inputs:
+        (pending if force or not is_up_to_date(path, output_dir, split, density_tiers) else skipped).append(path)
+
+    converted: list[str] = []
+    failed: dict[str, str] = {}
+    audio_seconds = 0.0
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                _convert_one,
+                path,
+                output_dir,
+                mode,
+                split,
+                sample_rate,
+                sharpness_factor,
+                intensity_factor,
+                cache,
+                output_format,
+                continuous_tolerance,
+                instrumentation,
+                events_per_second,
+                density_tiers,
+            ): path
+            for path in pending
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            path = futures[future]
+            error = None
+            try:
+                audio_seconds += future.result()
+            except Exception as exc:  # noqa: BLE001 - isolate per-file failures from the batch.
+                error = failed[path] = f"{type(exc).__name__}: {exc}"
+            else:
+                converted.append(path)
+            if progress is not None:
+                progress(BatchProgress(done=done, total=len(pending), path=path, error=error))
+
+    return BatchResult(
+        converted=converted,
+        skipped=skipped,
+        failed=failed,
+        elapsed_seconds=time.perf_counter() - started,
+        audio_seconds=audio_seconds,
+    )
+
+
+def _print_progress(progress: BatchProgress) -> None:
+    status = f"FAILED ({progress.error})" if progress.error else "ok"
+    print(f"[{progress.done}/{progress.total}] {Path(progress.path).name}: {status}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert audio files to AHAP haptics in parallel.")
+    parser.add_argument("sources", nargs="+", help="Audio directories, files or glob patterns.")
+    parser.add_argument("--output-dir", default=None, help="Output directory (defaults to each source's directory).")
+    parser.add_argument("--mode", default="sfx", help="Haptic mode, e.g. 'sfx' or 'music'.")
+    parser.add_argument("--split", default="none", help="Split: none, all, bass, vocals, drums or other.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (defaults to CPU count).")
+    parser.add_argument("--force", action="store_true", help="Convert even if outputs are up to date.")
+    parser.add_argument("--cache-dir", default=None, help="Reuse AHAP output for previously converted audio.")
+    parser.add_argument("--compact", action="store_true", help="Write minified, quantized AHAP.")
+    parser.add_argument(
+        "--coalesce-tolerance",
+        type=float,
+        default=None,
+        help="Merge runs of background continuous events that agree within this error (e.g. 0.02).",
+    )
+    parser.add_argument("--events-per-second", type=float, default=None, help="Cap event density per second.")
+    parser.add_argument(
+        "--density-tiers",
+        nargs="+",
+        choices=list(DENSITY_TIERS),
+        default=None,
+        help="Write one file per density tier instead of a single file.",
+    )
+    parser.add_argument("--progress", action="store_true", help="Print per-stage timings for every file.")
+    parser.add_argument("--cache-max-mb", type=int, default=512, help="Cache size cap in megabytes.")
+    args = parser.parse_args()
+
+    result = convert_batch_to_ahap(
+        args.sources,
+        args.output_dir,
+        mode=args.mode,
+        split=args.split,
+        workers=args.workers,
+        force=args.force,
+        cache=AhapCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024) if args.cache_dir else None,
+        output_format=COMPACT_AHAP_FORMAT if args.compact else PRETTY_AHAP_FORMAT,
+        continuous_tolerance=args.coalesce_tolerance,
+        instrumentation=ConsoleProgress() if args.progress else None,
+        events_per_second=args.events_per_second,
+        density_tiers=args.density_tiers,
+        progress=_print_progress,
+    )
+
+    print(
+        f"Converted {len(result.converted)}, skipped {len(result.skipped)}, failed {len(result.failed)} "
+        f"in {result.elapsed_seconds:.1f}s "
+        f"({result.files_per_second:.2f} files/s, {result.audio_seconds_per_second:.1f} audio-s/s)"
+    )
+    if result.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
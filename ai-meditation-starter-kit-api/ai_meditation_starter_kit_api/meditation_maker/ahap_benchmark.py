@@ -0,0 +1,204 @@
+"""Benchmark AHAP generation on the bundled audio and on synthetic signals.
+
+Each case runs in a fresh worker process so peak RSS is measured per case.
+Workers first convert a short off-rate clip so one-time JIT compilation and
+lazy imports (including the resampler) do not count against the first stage.
+Results are printed as a table and can be written as JSON to diff between
+versions.
+
+Example::
+
+    python -m ai_meditation_starter_kit_api.meditation_maker.ahap_benchmark --durations 10 60 --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+from .ahap import convert_wav_to_ahap
+from .ahap_instrumentation import StageTimings
+
+_SAMPLE_RATE = 44100
+_DEFAULT_AUDIO_DIR = Path(__file__).resolve().parents[3] / "audio"
+_DEFAULT_DURATIONS = [10.0, 60.0, 600.0, 3600.0]
+_SYNTHETIC_SIGNALS = ("tone", "noise_bursts", "speech")
+_SYNTHETIC_CHUNK_SECONDS = 60
+
+
+def _synthetic_chunk(
+    signal: str,
+    start: int,
+    length: int,
+    sample_rate: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    t = (start + np.arange(length)) / sample_rate
+    if signal == "tone":
+        # A drone with a slow swell and a bell-like partial every 8 s.
+        swell = 0.6 + 0.4 * np.sin(2 * np.pi * 0.05 * t)
+        bell = np.exp(-3.0 * (t % 8.0)) * np.sin(2 * np.pi * 880 * t)
+        return 0.3 * swell * np.sin(2 * np.pi * 110 * t) + 0.3 * bell
+    if signal == "noise_bursts":
+        # 150 ms noise bursts every 0.75 s over a quiet noise floor.
+        gate = (t % 0.75) < 0.15
+        return rng.normal(0.0, 0.02, length) + gate * rng.normal(0.0, 0.3, length)
+    if signal == "speech":
+        # Voiced syllables at ~4 Hz grouped into 3 s phrases with 1 s pauses.
+        syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0.0, None) ** 2
+        phrases = (t % 4.0) < 3.0
+        voice = np.sin(2 * np.pi * 140 * t) + 0.5 * np.sin(2 * np.pi * 280 * t) + 0.1 * rng.normal(0.0, 1.0, length)
+        return 0.3 * syllables * phrases * voice
+    msg = f"Unknown synthetic signal: {signal}"
+    raise ValueError(msg)
+
+
+def write_synthetic_wav(
+    output_wav: str,
+    signal: str,
+    duration: float,
+    seed: int = 0,
+    sample_rate: int = _SAMPLE_RATE,
+) -> None:
+    """Write a 16-bit mono synthetic fixture in chunks so long durations stay cheap."""
+    rng = np.random.default_rng(seed)
+    total = int(duration * sample_rate)
+    chunk = _SYNTHETIC_CHUNK_SECONDS * sample_rate
+    with sf.SoundFile(output_wav, "w", samplerate=sample_rate, channels=1, subtype="PCM_16") as f:
+        for start in range(0, total, chunk):
+            samples = _synthetic_chunk(signal, start, min(chunk, total - start), sample_rate, rng)
+            f.write(np.clip(samples, -1.0, 1.0))
+
+
+def run_case(input_wav: str, output_dir: str, mode: str, split: str) -> dict[str, Any]:
+    """Convert `input_wav` and return wall time, per-stage timings, peak RSS and event counts."""
+    timings = StageTimings()
+    started = time.perf_counter()
+    convert_wav_to_ahap(input_wav, output_dir, mode=mode, split=split, instrumentation=timings)
+    wall_seconds = time.perf_counter() - started
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "duration_seconds": timings.items["load"] / _SAMPLE_RATE,
+        "wall_seconds": wall_seconds,
+        "stages": timings.elapsed_seconds,
+        "peak_rss_mb": peak_rss / (1024 * 1024 if sys.platform == "darwin" else 1024),
+        "event_counts": {
+            "onset": timings.items["transient_events"],
+            "background_continuous": timings.items["continuous_events"],
+        },
+    }
+
+
+def _warm_up() -> None:
+    with tempfile.TemporaryDirectory(prefix="ahap-warm-up-") as work_dir:
+        fixture = os.path.join(work_dir, "warm-up.wav")
+        write_synthetic_wav(fixture, "speech", 1.0, sample_rate=_SAMPLE_RATE // 2)
+        run_case(fixture, work_dir, "sfx", "none")
+
+
+def _run_isolated(input_wav: str, output_dir: str, mode: str, split: str) -> dict[str, Any]:
+    with ProcessPoolExecutor(max_workers=1, initializer=_warm_up) as executor:
+        try:
+            return executor.submit(run_case, input_wav, output_dir, mode, split).result()
+        except BrokenProcessPool:
+            return {"error": "worker died (likely out of memory)"}
+        except Exception as exc:  # noqa: BLE001 - record the failure and keep benchmarking.
+            return {"error": f"{type(exc).__name__}: {exc}"}
+
+
+def run_benchmark(
+    audio_files: list[str],
+    durations: list[float],
+    signals: list[str],
+    mode: str = "sfx",
+    split: str = "none",
+) -> dict[str, Any]:
+    cases: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="ahap-benchmark-") as work_dir:
+        fixtures = [(Path(path).stem, "bundled", path) for path in audio_files]
+        for signal in signals:
+            for duration in durations:
+                fixture = os.path.join(work_dir, f"{signal}-{duration:g}s.wav")
+                write_synthetic_wav(fixture, signal, duration)
+                fixtures.append((Path(fixture).stem, "synthetic", fixture))
+
+        for name, source, path in fixtures:
+            result = _run_isolated(path, work_dir, mode, split)
+            cases.append({"name": name, "source": source, **result})
+            _print_case(cases[-1])
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "numpy": np.__version__,
+            "librosa": librosa.__version__,
+        },
+        "settings": {"mode": mode, "split": split, "sample_rate": _SAMPLE_RATE},
+        "cases": cases,
+    }
+
+
+def _print_case(case: dict[str, Any]) -> None:
+    if "error" in case:
+        print(f"{case['name']:<40} FAILED ({case['error']})")
+        return
+    stages = " ".join(f"{stage}={seconds:.2f}" for stage, seconds in case["stages"].items())
+    events = sum(case["event_counts"].values())
+    print(
+        f"{case['name']:<40} {case['duration_seconds']:>8.1f}s audio {case['wall_seconds']:>7.2f}s wall "
+        f"{case['peak_rss_mb']:>7.0f} MB {events:>7} events  {stages}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark AHAP generation.")
+    parser.add_argument("--audio-dir", default=str(_DEFAULT_AUDIO_DIR), help="Directory of bundled WAV fixtures.")
+    parser.add_argument("--skip-bundled", action="store_true", help="Only run synthetic fixtures.")
+    parser.add_argument(
+        "--durations",
+        type=float,
+        nargs="*",
+        default=_DEFAULT_DURATIONS,
+        help="Synthetic fixture durations in seconds.",
+    )
+    parser.add_argument(
+        "--signals",
+        nargs="*",
+        choices=_SYNTHETIC_SIGNALS,
+        default=list(_SYNTHETIC_SIGNALS),
+        help="Synthetic signal types.",
+    )
+    parser.add_argument("--mode", default="sfx", help="Haptic mode, e.g. 'sfx' or 'music'.")
+    parser.add_argument("--split", default="none", help="Split: none, all, bass, vocals, drums or other.")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this path.")
+    args = parser.parse_args()
+
+    audio_files = [] if args.skip_bundled else sorted(str(path) for path in Path(args.audio_dir).glob("*.wav"))
+    results = run_benchmark(audio_files, args.durations, args.signals, mode=args.mode, split=args.split)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .ahap import AhapOutputFormat
+
+# Bump with every change to the generated AHAP or to the meaning of a keyed parameter
+# (analysis, coalescing, decimation, serialization), so stale entries stop matching.
+_AHAP_CACHE_VERSION = 2
+_DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class AhapCache:
+    """On-disk AHAP cache keyed by decoded PCM, generation parameters and output format.
+
+    Each entry is a directory holding one `.ahap` file per split target. Entry
+    directory mtimes record last use, and the least recently used entries are
+    evicted once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], max_bytes: int = _DEFAULT_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(
+        audio_data: np.ndarray,
+        *,
+        mode: str,
+        split: str,
+        sample_rate: int,
+        sharpness_factor: float,
+        intensity_factor: float,
+        output_format: AhapOutputFormat,
+        continuous_tolerance: float | None = None,
+        engine: str = "fast",
+        events_per_second: float | None = None,
+        density_tiers: Sequence[str] | None = None,
+    ) -> str:
+        params = {
+            "version": _AHAP_CACHE_VERSION,
+            "dtype": str(audio_data.dtype),
+            "mode": mode,
+            "split": split,
+            "sample_rate": sample_rate,
+            "sharpness_factor": sharpness_factor,
+            "intensity_factor": intensity_factor,
+            "output_format": list(output_format),
+            "continuous_tolerance": continuous_tolerance,
+            "engine": engine,
+            "events_per_second": events_per_second,
+            "density_tiers": list(density_tiers or []),
+        }
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode())
+        digest.update(memoryview(np.ascontiguousarray(audio_data)).cast("B"))
+        return digest.hexdigest()
+
+    def get(self, key: str, split_targets: list[str]) -> dict[str, Path] | None:
+        """Return cached files for `split_targets`, marking the entry as recently used."""
+        entry = self.directory / key
+        cached = {split_type: entry / f"{split_type}.ahap" for split_type in split_targets}
+        if not all(path.is_file() for path in cached.values()):
+            return None
+
+        now = time.time()
+        try:
+            os.utime(entry, (now, now))
+        except FileNotFoundError:
+            # Evicted by another worker since the check above.
+            return None
+        return cached
+
+    def restore(self, key: str, output_paths: dict[str, str]) -> bool:
+        """Copy a cached entry to `output_paths`; return False on a cache miss.
+
+        An entry evicted by another worker while it is being copied also counts
+        as a miss, so the caller regenerates (and overwrites) every output.
+        """
+        cached = self.get(key, list(output_paths))
+        if cached is None:
+            return False
+
+        try:
+            for split_type, output_ahap in output_paths.items():
+                shutil.copyfile(cached[split_type], output_ahap)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def put(self, key: str, output_paths: dict[str, str]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = self.directory / key
+
+        # Build the entry in a temp dir and rename it so concurrent workers never see partial entries.
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=self.directory))
+        for split_type, output_ahap in output_paths.items():
+            shutil.copyfile(output_ahap, staging / f"{split_type}.ahap")
+
+        try:
+            os.replace(staging, entry)
+        except OSError:
+            # Another worker stored the same entry first; its content is identical.
+            shutil.rmtree(staging, ignore_errors=True)
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in `max_bytes`."""
+        if not self.directory.is_dir():
+            return
+
+        entries: list[tuple[float, int, Path]] = []
+        for entry in self.directory.iterdir():
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            try:
+                size = sum(path.stat().st_size for path in entry.iterdir())
+                entries.append((entry.stat().st_mtime, size, entry))
+            except FileNotFoundError:
+                # Removed by another worker while being measured.
+                continue
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
@@ -0,0 +1,45 @@
+"""Rewrite existing `.ahap` files in the compact format and report the size savings.
+
+Example::
+
+    python -m ai_meditation_starter_kit_api.meditation_maker.ahap_compact haptics/*.ahap
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from .ahap import AhapOutputFormat, compact_ahap_file
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Minify and quantize AHAP files in place.")
+    parser.add_argument("paths", nargs="+", help="AHAP files to rewrite.")
+    parser.add_argument("--time-resolution", type=int, default=1000, help="Time steps per second (0 keeps full precision).")
+    parser.add_argument("--parameter-levels", type=int, default=256, help="Parameter value steps (0 keeps full precision).")
+    parser.add_argument("--pretty", action="store_true", help="Write indented JSON instead of minified JSON.")
+    args = parser.parse_args()
+
+    output_format = AhapOutputFormat(
+        compact=not args.pretty,
+        time_resolution=args.time_resolution or None,
+        parameter_levels=args.parameter_levels or None,
+    )
+
+    total_old = total_new = 0
+    for path in args.paths:
+        old_size, new_size = compact_ahap_file(path, output_format=output_format)
+        total_old += old_size
+        total_new += new_size
+        print(f"{Path(path).name}: {old_size / 1024:.1f} KB -> {new_size / 1024:.1f} KB ({_saving(old_size, new_size)})")
+
+    print(f"Total: {total_old / 1024:.1f} KB -> {total_new / 1024:.1f} KB ({_saving(total_old, total_new)})")
+
+
+def _saving(old_size: int, new_size: int) -> str:
+    return f"-{(1 - new_size / old_size) * 100:.0f}%" if old_size else "n/a"
+
+
+if __name__ == "__main__":
+    main()
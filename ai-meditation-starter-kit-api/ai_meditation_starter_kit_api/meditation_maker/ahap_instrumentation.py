@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import contextlib
+import sys
+import time
+from collections.abc import Iterator
+from typing import TextIO
+
+
+class AhapInstrumentation:
+    """Receives stage events from AHAP generation.
+
+    The base class ignores everything; override `stage_started` and
+    `stage_finished` to export metrics or show progress.
+    """
+
+    def stage_started(self, stage: str) -> None:
+        pass
+
+    def stage_finished(self, stage: str, items: int, elapsed_seconds: float) -> None:
+        pass
+
+
+class StageTimings(AhapInstrumentation):
+    """Collect elapsed seconds and item counts per stage, summing repeated stages."""
+
+    def __init__(self) -> None:
+        self.elapsed_seconds: dict[str, float] = {}
+        self.items: dict[str, int] = {}
+
+    def stage_finished(self, stage: str, items: int, elapsed_seconds: float) -> None:
+        self.elapsed_seconds[stage] = self.elapsed_seconds.get(stage, 0.0) + elapsed_seconds
+        self.items[stage] = self.items.get(stage, 0) + items
+
+
+class ConsoleProgress(AhapInstrumentation):
+    """Print one line per finished stage."""
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.stream = stream
+
+    def stage_finished(self, stage: str, items: int, elapsed_seconds: float) -> None:
+        print(f"[ahap] {stage}: {items} items in {elapsed_seconds:.2f}s", file=self.stream or sys.stderr)
+
+
+NO_INSTRUMENTATION = AhapInstrumentation()
+
+
+class StageItems:
+    """Work done in an `instrumented_stage` block; set `items` to report it."""
+
+    def __init__(self) -> None:
+        self.items = 0
+
+
+@contextlib.contextmanager
+def instrumented_stage(instrumentation: AhapInstrumentation | None, stage: str) -> Iterator[StageItems]:
+    """Time a `with` block as `stage`; set `.items` on the yielded object to report work done.
+
+    A block that raises reports `stage_started` only.
+    """
+    instrumentation = instrumentation or NO_INSTRUMENTATION
+    report = StageItems()
+    instrumentation.stage_started(stage)
+    started = time.perf_counter()
+    yield report
+    instrumentation.stage_finished(stage, report.items, time.perf_counter() - started)
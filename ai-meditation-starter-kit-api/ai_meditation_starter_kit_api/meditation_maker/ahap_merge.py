@@ -0,0 +1,185 @@
+"""Merge every AHAP of a meditation timeline into a single session AHAP.
+
+Example::
+
+    python -m ai_meditation_starter_kit_api.meditation_maker.ahap_merge meditations/basic.json --add-timeline-entry
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import copy
+import json
+import os
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .ahap import PRETTY_AHAP_FORMAT, AhapOutputFormat, write_ahap_file
+
+MERGED_AHAP_KIND = "ahap-merged"
+# Neutral values for the dynamic parameters, restored when a segment with curves is cut off. Generated
+# AHAPs carry no curves, but timelines may reference hand-authored or third-party files that do.
+_NEUTRAL_CURVE_VALUES = {"HapticIntensityControl": 1.0, "HapticSharpnessControl": 0.0}
+
+
+class MergedAhap(NamedTuple):
+    output_ahap: str
+    sources: list[str]
+    events: int
+    clipped_events: int
+
+
+def _shift_and_clip(
+    pattern: list[dict[str, Any]],
+    offset: float,
+    cut: float | None,
+) -> tuple[list[dict[str, Any]], int]:
+    """Shift a segment's pattern by `offset` seconds and clip its continuous events at `cut`.
+
+    Transients are kept wherever they fall. Continuous events running past
+    `cut` are shortened to end there, and those starting at or after it are
+    dropped.
+    """
+    merged: list[dict[str, Any]] = []
+    clipped = 0
+    curve_parameters: set[str] = set()
+
+    for entry in pattern:
+        entry = copy.deepcopy(entry)
+        if "Event" in entry:
+            event = entry["Event"]
+            event["Time"] = event["Time"] + offset
+            if cut is not None and "EventDuration" in event and event["Time"] + event["EventDuration"] > cut:
+                clipped += 1
+                if event["Time"] >= cut:
+                    continue
+                event["EventDuration"] = cut - event["Time"]
+        elif "ParameterCurve" in entry:
+            curve = entry["ParameterCurve"]
+            curve["Time"] = curve["Time"] + offset
+            if cut is not None:
+                curve["ParameterCurveControlPoints"] = [
+                    point for point in curve["ParameterCurveControlPoints"] if curve["Time"] + point["Time"] < cut
+                ]
+                if not curve["ParameterCurveControlPoints"]:
+                    continue
+            curve_parameters.add(curve["ParameterID"])
+        merged.append(entry)
+
+    # Dynamic parameters persist, so undo this segment's curves before the next segment starts.
+    if cut is not None:
+        for parameter_id in sorted(curve_parameters & _NEUTRAL_CURVE_VALUES.keys()):
+            merged.append(
+                {
+                    "ParameterCurve": {
+                        "ParameterID": parameter_id,
+                        "Time": cut,
+                        "ParameterCurveControlPoints": [
+                            {"Time": 0.0, "ParameterValue": _NEUTRAL_CURVE_VALUES[parameter_id]}
+                        ],
+                    }
+                }
+            )
+
+    return merged, clipped
+
+
+def merge_meditation_ahaps(
+    meditation_json: str,
+    output_ahap: str | None = None,
+    base_dir: str | None = None,
+    add_timeline_entry: bool = False,
+    output_format: AhapOutputFormat = PRETTY_AHAP_FORMAT,
+) -> MergedAhap:
+    """Merge the `kind: "ahap"` entries of a meditation into one AHAP shifted by `atMs`.
+
+    Timeline file paths are resolved against `base_dir`, which defaults to the
+    directory above the one holding the meditation JSON. Each segment's
+    continuous events are cut where the next later segment starts (or at
+    `durationMs`), so one running into the next segment is shortened instead of
+    overlapping it; transients are never dropped.
+    With `add_timeline_entry`, the meditation gains an `ahap-merged` entry at
+    0 ms listing the files it replaces, so clients can schedule one player.
+    """
+    meditation_path = Path(meditation_json)
+    root = Path(base_dir) if base_dir else meditation_path.resolve().parent.parent
+    meditation = json.loads(meditation_path.read_text())
+
+    segments = sorted(
+        (entry for entry in meditation.get("timeline", []) if entry.get("kind") == "ahap" and entry.get("file")),
+        key=lambda entry: entry.get("atMs", 0),
+    )
+    starts = sorted({entry.get("atMs", 0) for entry in segments})
+    end_ms = meditation.get("durationMs")
+
+    pattern: list[dict[str, Any]] = []
+    clipped = 0
+    for entry in segments:
+        start_ms = entry.get("atMs", 0)
+        next_index = bisect.bisect_right(starts, start_ms)
+        cut_ms = starts[next_index] if next_index < len(starts) else end_ms
+        with open(root / entry["file"], encoding="utf-8") as f:
+            segment = json.load(f)
+        segment_pattern, segment_clipped = _shift_and_clip(
+            segment.get("Pattern", []),
+            start_ms / 1000,
+            cut_ms / 1000 if cut_ms is not None else None,
+        )
+        pattern.extend(segment_pattern)
+        clipped += segment_clipped
+
+    pattern.sort(key=lambda entry: next(iter(entry.values()))["Time"])
+
+    if output_ahap is None:
+        output_ahap = str(root / "haptics" / f"{meditation.get('id', meditation_path.stem)}-merged.ahap")
+    os.makedirs(Path(output_ahap).parent, exist_ok=True)
+    write_ahap_file(output_ahap, {"Version": 1.0, "Pattern": pattern}, output_format)
+
+    sources = [entry["file"] for entry in segments]
+    if add_timeline_entry:
+        timeline = [entry for entry in meditation.get("timeline", []) if entry.get("kind") != MERGED_AHAP_KIND]
+        merged_entry = {
+            "atMs": 0,
+            "kind": MERGED_AHAP_KIND,
+            "file": os.path.relpath(output_ahap, root),
+            "platform": "ios",
+            "replaces": sources,
+        }
+        meditation["timeline"] = [merged_entry, *timeline]
+        meditation_path.write_text(json.dumps(meditation, indent=2) + "\n")
+
+    return MergedAhap(
+        output_ahap=output_ahap,
+        sources=sources,
+        events=sum("Event" in entry for entry in pattern),
+        clipped_events=clipped,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Merge a meditation's AHAP files into one session AHAP.")
+    parser.add_argument("meditations", nargs="+", help="Meditation timeline JSON files.")
+    parser.add_argument("--base-dir", default=None, help="Directory timeline file paths are relative to.")
+    parser.add_argument("--output", default=None, help="Output path (only valid with a single meditation).")
+    parser.add_argument("--add-timeline-entry", action="store_true", help="Add the merged file to the timeline.")
+    args = parser.parse_args()
+
+    if args.output and len(args.meditations) > 1:
+        parser.error("--output can only be used with a single meditation.")
+
+    for meditation_json in args.meditations:
+        result = merge_meditation_ahaps(
+            meditation_json,
+            output_ahap=args.output,
+            base_dir=args.base_dir,
+            add_timeline_entry=args.add_timeline_entry,
+        )
+        print(
+            f"{Path(meditation_json).name}: merged {len(result.sources)} files into {result.output_ahap} "
+            f"({result.events} events, {result.clipped_events} clipped)"
+        )
+
+
+if __name__ == "__main__":
+    main()
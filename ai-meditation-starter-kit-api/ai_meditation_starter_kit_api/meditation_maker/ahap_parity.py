@@ -0,0 +1,172 @@
+"""Compare AHAP output produced under two analysis configurations.
+
+By default the reference engine is compared with the fast engine; the dtype
+options compare analysis precisions instead.
+
+Example::
+
+    python -m ai_meditation_starter_kit_api.meditation_maker.ahap_parity audio/*.wav --tolerance 1e-3
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import tempfile
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from .ahap import AHAP_ENGINES, convert_wav_to_ahap
+
+
+class AhapParityReport(NamedTuple):
+    reference_events: int
+    candidate_events: int
+    unmatched_events: int
+    max_time_error: float
+    max_parameter_error: float
+
+    def within(self, tolerance: float) -> bool:
+        return (
+            self.unmatched_events == 0
+            and self.max_time_error <= tolerance
+            and self.max_parameter_error <= tolerance
+        )
+
+
+def _events_by_type(pattern: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    events: dict[str, list[dict[str, Any]]] = {}
+    for entry in pattern:
+        if "Event" in entry:
+            events.setdefault(entry["Event"]["EventType"], []).append(entry["Event"])
+    for typed_events in events.values():
+        typed_events.sort(key=lambda event: event["Time"])
+    return events
+
+
+def _parameters(event: dict[str, Any]) -> dict[str, float]:
+    parameters = {item["ParameterID"]: item["ParameterValue"] for item in event.get("EventParameters", [])}
+    if "EventDuration" in event:
+        parameters["EventDuration"] = event["EventDuration"]
+    return parameters
+
+
+def compare_ahap(
+    reference: dict[str, Any],
+    candidate: dict[str, Any],
+    match_window: float = 0.005,
+) -> AhapParityReport:
+    """Pair each candidate event with the nearest reference event of the same type.
+
+    Events with no partner within `match_window` seconds are counted as
+    unmatched; paired events contribute their time and parameter differences.
+    """
+    reference_events = _events_by_type(reference.get("Pattern", []))
+    candidate_events = _events_by_type(candidate.get("Pattern", []))
+
+    unmatched = 0
+    max_time_error = 0.0
+    max_parameter_error = 0.0
+    for event_type in reference_events.keys() | candidate_events.keys():
+        references = reference_events.get(event_type, [])
+        candidates = candidate_events.get(event_type, [])
+        reference_times = [event["Time"] for event in references]
+        used: set[int] = set()
+
+        for event in candidates:
+            position = bisect.bisect_left(reference_times, event["Time"])
+            neighbours = [index for index in (position - 1, position) if 0 <= index < len(references)]
+            free = [index for index in neighbours if index not in used]
+            match = min(free, key=lambda index: abs(reference_times[index] - event["Time"]), default=None)
+            if match is None or abs(reference_times[match] - event["Time"]) > match_window:
+                unmatched += 1
+                continue
+
+            used.add(match)
+            max_time_error = max(max_time_error, abs(reference_times[match] - event["Time"]))
+            reference_parameters = _parameters(references[match])
+            for parameter_id, value in _parameters(event).items():
+                if parameter_id in reference_parameters:
+                    max_parameter_error = max(max_parameter_error, abs(reference_parameters[parameter_id] - value))
+
+        unmatched += len(references) - len(used)
+
+    return AhapParityReport(
+        reference_events=sum(len(events) for events in reference_events.values()),
+        candidate_events=sum(len(events) for events in candidate_events.values()),
+        unmatched_events=unmatched,
+        max_time_error=max_time_error,
+        max_parameter_error=max_parameter_error,
+    )
+
+
+def check_conversion_parity(
+    input_wav: str,
+    reference_options: dict[str, Any],
+    candidate_options: dict[str, Any],
+    mode: str = "sfx",
+    split: str = "none",
+) -> dict[str, AhapParityReport]:
+    """Convert `input_wav` with both option sets and compare every split output."""
+    with tempfile.TemporaryDirectory(prefix="ahap-parity-") as work_dir:
+        outputs = {}
+        for name, options in (("reference", reference_options), ("candidate", candidate_options)):
+            output_dir = Path(work_dir) / name
+            paths = convert_wav_to_ahap(input_wav, str(output_dir), mode=mode, split=split, **options)
+            outputs[name] = {Path(path).name: json.loads(Path(path).read_text()) for path in paths}
+
+        return {
+            name: compare_ahap(outputs["reference"][name], outputs["candidate"][name])
+            for name in outputs["reference"]
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check AHAP parity between two analysis configurations.")
+    parser.add_argument("inputs", nargs="+", help="Audio files to convert.")
+    parser.add_argument("--mode", default="sfx", help="Haptic mode, e.g. 'sfx' or 'music'.")
+    parser.add_argument("--split", default="none", help="Split: none, all, bass, vocals, drums or other.")
+    parser.add_argument(
+        "--reference-engine",
+        default="reference",
+        choices=AHAP_ENGINES,
+        help="Engine of the reference run.",
+    )
+    parser.add_argument(
+        "--candidate-engine",
+        default="fast",
+        choices=AHAP_ENGINES,
+        help="Engine of the candidate run.",
+    )
+    parser.add_argument("--reference-dtype", default="float32", help="Analysis dtype of the reference run.")
+    parser.add_argument("--candidate-dtype", default="float32", help="Analysis dtype of the candidate run.")
+    parser.add_argument("--tolerance", type=float, default=1e-3, help="Allowed time and parameter difference.")
+    args = parser.parse_args()
+
+    failures = 0
+    for input_wav in args.inputs:
+        reports = check_conversion_parity(
+            input_wav,
+            {"engine": args.reference_engine, "dtype": np.dtype(args.reference_dtype)},
+            {"engine": args.candidate_engine, "dtype": np.dtype(args.candidate_dtype)},
+            mode=args.mode,
+            split=args.split,
+        )
+        for name, report in reports.items():
+            status = "ok" if report.within(args.tolerance) else "MISMATCH"
+            failures += status != "ok"
+            print(
+                f"{name}: {status} events {report.reference_events}/{report.candidate_events}, "
+                f"unmatched {report.unmatched_events}, max time error {report.max_time_error:.2e}, "
+                f"max parameter error {report.max_parameter_error:.2e}"
+            )
+
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
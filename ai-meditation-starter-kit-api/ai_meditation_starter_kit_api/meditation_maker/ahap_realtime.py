@@ -0,0 +1,563 @@
+"""Incremental AHAP generation for audio that arrives while it plays.
+
+`IncrementalAhapGenerator` takes PCM frames as they are received (streamed TTS,
+a live session) and returns AHAP events as soon as they are final, at most
+`lookahead_seconds` after the event time (about 195 ms at 44.1 kHz):
+
+- Onsets use the same log-mel spectral flux and peak picking as
+  `librosa.onset.onset_detect`, decided once the 100 ms averaging window after
+  a frame has arrived. The flux floor, onset normalization and intensity peak
+  are running values, so until the loudest part of the track has been heard
+  the detector is more sensitive and intensities are higher than offline.
+- Background continuous events come from a low-latency HPSS: the harmonic
+  median looks 4 frames ahead instead of 15, so sustained sounds take a moment
+  to count as harmonic. The harmonic track is resynthesized frame by frame and each
+  100 ms step is emitted once its samples are final. The bass track is taken to
+  equal the harmonic one, and both are normalized by the running harmonic peak.
+
+Every running value is taken at a fixed point after the frame or step it
+applies to (the decision lookahead), never at the end of the latest chunk, so
+the events do not depend on how the audio is split into chunks. Batched STFT
+and matrix products can still differ in the last float32 bit between chunkings.
+
+Replay a WAV in chunks to check latency and compare against the offline engine::
+
+    python -m ai_meditation_starter_kit_api.meditation_maker.ahap_realtime audio/intro.wav --chunk-ms 20 --compare
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import tempfile
+from pathlib import Path
+from typing import NamedTuple
+
+import librosa
+import numpy as np
+import soundfile as sf
+from scipy.ndimage import median_filter
+
+from .ahap import (
+    _HPSS_KERNEL_SIZE,
+    _STFT_HOP_LENGTH,
+    _STFT_N_FFT,
+    PRETTY_AHAP_FORMAT,
+    AhapOutputFormat,
+    AhapStreamWriter,
+    OnsetFeatures,
+    _block_rms,
+    _canonical_split,
+    _centroid_window_indices,
+    _continuous_event_dicts,
+    _onset_event_dicts,
+    _scale_continuous_rms,
+    apply_split_profile,
+    classify_haptic_modes,
+    convert_wav_to_ahap,
+    scale_onset_parameters,
+)
+from .ahap_parity import AhapParityReport, compare_ahap
+from .ahap_stream import iter_mono_chunks
+
+_N_MELS = 128
+_TOP_DB = 80.0
+_CONTINUOUS_TIME_STEP = 0.1
+# Future frames in the harmonic median; the offline filter is centered with 15 on each side.
+_HARMONIC_LOOKAHEAD_FRAMES = 4
+# `onset_strength` pads its lagged spectral flux by lag + n_fft // (2 * hop).
+_ONSET_SHIFT_FRAMES = 1 + _STFT_N_FFT // (2 * _STFT_HOP_LENGTH)
+
+
+class ReplayReport(NamedTuple):
+    output_ahap: str
+    events: int
+    max_latency: float
+    mean_latency: float
+
+
+def _to_float32(samples: np.ndarray) -> np.ndarray:
+    """Scale integer PCM to [-1, 1] by its type's range; unsigned PCM is centered first."""
+    if samples.dtype.kind not in "iu":
+        return samples.astype(np.float32, copy=False)
+    info = np.iinfo(samples.dtype)
+    # 0 for signed types, 2 ** (bits - 1) for unsigned ones.
+    midpoint = (int(info.max) + int(info.min) + 1) // 2
+    return ((samples.astype(np.float64) - midpoint) / (int(info.max) - midpoint + 1)).astype(np.float32)
+
+
+class IncrementalAhapGenerator:
+    """Stateful AHAP generator fed with PCM frames as they arrive.
+
+    `push` accepts mono or (frames, channels) float samples in [-1, 1] or
+    integer PCM of any width (unsigned as offset binary, like 8-bit WAV) at
+    `sample_rate` and returns the events that became final; `flush`
+    ends the stream and returns the rest. Events are the pattern entries
+    `generate_ahap` produces for `mode` and a single `split` profile, without
+    continuous-event coalescing or density budgets.
+    """
+
+    def __init__(
+        self,
+        mode: str = "sfx",
+        split: str = "none",
+        sample_rate: int = 44100,
+        sharpness_factor: float = 3.0,
+        intensity_factor: float = 2.5,
+        max_latency: float = 0.2,
+    ) -> None:
+        self.split = _canonical_split(split)
+        if self.split == "all":
+            msg = "IncrementalAhapGenerator produces a single split; pass one of none, bass, vocals, drums or other."
+            raise ValueError(msg)
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.sharpness_factor = sharpness_factor
+        self.intensity_factor = intensity_factor
+
+        hop = _STFT_HOP_LENGTH
+        self._pre_max = math.ceil(0.03 * sample_rate // hop)
+        self._post_max = math.ceil(0.00 * sample_rate // hop + 1)
+        self._pre_avg = math.ceil(0.10 * sample_rate // hop)
+        self._post_avg = math.ceil(0.10 * sample_rate // hop + 1)
+        self._wait = math.ceil(0.03 * sample_rate // hop)
+        self._energy_window = int(sample_rate * 0.02)
+        self._step_samples = int(round(_CONTINUOUS_TIME_STEP * sample_rate))
+
+        # Samples needed past an onset frame before it can be decided: the peak-pick
+        # windows (onset frame n holds the flux into STFT frame n - shift + 1), the
+        # centroid frames and the 20 ms energy window, with one frame of rounding slack.
+        onset_frames = max(self._post_avg, self._post_max) - 1 - _ONSET_SHIFT_FRAMES + 1
+        centroid_frames = 1 + int(sample_rate * 0.05) // hop - int(sample_rate * 0.025) // hop
+        self._onset_lookahead = max(
+            onset_frames * hop + _STFT_N_FFT // 2,
+            centroid_frames * hop + _STFT_N_FFT // 2,
+            int(sample_rate * 0.01) + 1,
+        )
+        # A harmonic sample is final once every frame overlapping it has been masked and resynthesized.
+        harmonic_lookahead = self._step_samples + _STFT_N_FFT + _HARMONIC_LOOKAHEAD_FRAMES * hop
+        self.lookahead_seconds = max(self._onset_lookahead, harmonic_lookahead) / sample_rate
+        if self.lookahead_seconds > max_latency:
+            msg = f"Lookahead of {self.lookahead_seconds:.3f}s at {sample_rate} Hz exceeds max_latency={max_latency}s."
+            raise ValueError(msg)
+
+        self._mel_basis = librosa.filters.mel(sr=sample_rate, n_fft=_STFT_N_FFT, n_mels=_N_MELS).astype(np.float32)
+        self._window = librosa.filters.get_window("hann", _STFT_N_FFT, fftbins=True).astype(np.float32)
+
+        # Audio, zero-padded by n_fft // 2 in front as centered STFT framing does.
+        self._buffer = np.zeros(_STFT_N_FFT // 2, dtype=np.float32)
+        self._buffer_start = 0
+        self._received = 0
+        self._finished = False
+        # Running peak of the audio at the end of each hop-sized block, from block `_peak_start`.
+        self._block_peaks = np.zeros(0, dtype=np.float32)
+        self._peak_start = 0
+        self._peak_tail = np.zeros(0, dtype=np.float32)
+
+        # Per-frame state; each list starts at the frame index in the matching `_start`.
+        self._frames = 0
+        self._centroid = np.zeros(0, dtype=np.float32)
+        self._centroid_start = 0
+        # Magnitudes from the oldest frame a pending harmonic median needs; spectra not yet masked.
+        self._magnitude_history = np.zeros((_STFT_N_FFT // 2 + 1, 0), dtype=np.float32)
+        self._pending_spectrum = np.zeros((_STFT_N_FFT // 2 + 1, 0), dtype=np.complex64)
+        self._masked_frames = 0
+        # Overlap-add of the harmonic frames and their squared windows, in padded coordinates.
+        self._overlap = np.zeros(0, dtype=np.float32)
+        self._overlap_norm = np.zeros(0, dtype=np.float32)
+        self._overlap_start = 0
+        # Finished harmonic samples from the start of the next background step.
+        self._harmonic = np.zeros(0, dtype=np.float32)
+        self._harmonic_peak = np.float32(0.0)
+        self._previous_mel_db: np.ndarray | None = None
+        self._mel_db_max = np.float32(-np.inf)
+
+        self._onset = np.zeros(_ONSET_SHIFT_FRAMES, dtype=np.float32)
+        # Running maximum of the onset strength up to each frame of `_onset`.
+        self._onset_peak = np.zeros(_ONSET_SHIFT_FRAMES, dtype=np.float32)
+        self._onset_start = 0
+        # Spectral flux is never negative, so the onset minimum stays at the leading zeros.
+        self._onset_min = np.float32(0.0)
+        self._next_onset = 0
+        self._next_step = 0
+
+    def push(self, samples: np.ndarray) -> list[dict[str, object]]:
+        """Add PCM frames and return the events that are now final, in time order."""
+        if self._finished:
+            msg = "push() called after flush()."
+            raise ValueError(msg)
+
+        samples = _to_float32(np.asarray(samples))
+        if samples.ndim == 2:
+            samples = samples.mean(axis=1, dtype=np.float32)
+        if not samples.size:
+            return []
+
+        self._received += len(samples)
+        self._track_peak(samples)
+        self._buffer = np.concatenate((self._buffer, samples))
+
+        available = self._buffer_start + len(self._buffer)
+        self._analyze_frames(max(0, (available - _STFT_N_FFT) // _STFT_HOP_LENGTH + 1))
+
+        decided_onsets = max(0, (self._received - self._onset_lookahead) // _STFT_HOP_LENGTH + 1)
+        finished_steps = (self._next_step * self._step_samples + len(self._harmonic)) // self._step_samples
+        events = self._onset_events(decided_onsets, final=False) + self._background_events(finished_steps)
+        self._trim()
+        return sorted(events, key=lambda event: event["Event"]["Time"])
+
+    def flush(self) -> list[dict[str, object]]:
+        """End the stream and return the remaining events, padding the tail as offline framing does."""
+        if self._finished:
+            return []
+        self._finished = True
+        if self._peak_tail.size:
+            self._append_block_peaks(np.array([np.max(np.abs(self._peak_tail))], dtype=np.float32))
+
+        n_frames = 1 + self._received // _STFT_HOP_LENGTH
+        required = (n_frames - 1) * _STFT_HOP_LENGTH + _STFT_N_FFT - self._buffer_start
+        if len(self._buffer) < required:
+            self._buffer = np.pad(self._buffer, (0, required - len(self._buffer)))
+        self._analyze_frames(n_frames)
+
+        events = self._onset_events(n_frames, final=True)
+        events += self._background_events(math.ceil(self._received / self._step_samples))
+        return sorted(events, key=lambda event: event["Event"]["Time"])
+
+    def _analyze_frames(self, end_frame: int) -> None:
+        """Compute centroid, onset strength and the harmonic track for STFT frames up to `end_frame`."""
+        first_frame = self._frames
+        if end_frame <= first_frame:
+            return
+
+        hop = _STFT_HOP_LENGTH
+        start = first_frame * hop - self._buffer_start
+        end = (end_frame - 1) * hop + _STFT_N_FFT - self._buffer_start
+        spectrum = librosa.stft(self._buffer[start:end], n_fft=_STFT_N_FFT, hop_length=hop, center=False)
+        magnitude = np.abs(spectrum)
+
+        centroid = librosa.feature.spectral_centroid(
+            S=magnitude,
+            sr=self.sample_rate,
+            n_fft=_STFT_N_FFT,
+            hop_length=hop,
+        )
+        self._centroid = np.concatenate((self._centroid, centroid[0]))
+
+        mel_db = librosa.power_to_db(self._mel_basis @ magnitude**2, top_db=None)
+        # The `top_db` floor of each flux frame follows the loudest frame up to it.
+        frame_max = np.maximum.accumulate(np.concatenate(([self._mel_db_max], mel_db.max(axis=0))))
+        self._mel_db_max = frame_max[-1]
+        floor = frame_max[1:] - np.float32(_TOP_DB)
+        if self._previous_mel_db is None:
+            previous, current, floor = mel_db[:, :-1], mel_db[:, 1:], floor[1:]
+        else:
+            previous, current = np.column_stack([self._previous_mel_db, mel_db[:, :-1]]), mel_db
+        flux = np.mean(np.maximum(0.0, np.maximum(current, floor) - np.maximum(previous, floor)), axis=0)
+        flux = flux.astype(np.float32)
+        self._previous_mel_db = mel_db[:, -1]
+        if self._finished:
+            # Like `onset_strength`, keep one onset frame per STFT frame at the end of the track.
+            flux = flux[: max(0, end_frame - self._onset_start - len(self._onset))]
+        if flux.size:
+            self._onset = np.concatenate((self._onset, flux))
+            self._onset_peak = np.concatenate(
+                (self._onset_peak, np.maximum.accumulate(np.maximum(flux, self._onset_peak[-1])))
+            )
+
+        self._frames = end_frame
+        self._magnitude_history = np.concatenate((self._magnitude_history, magnitude), axis=1)
+        self._pending_spectrum = np.concatenate((self._pending_spectrum, spectrum), axis=1)
+        self._separate_harmonic()
+
+    def _separate_harmonic(self) -> None:
+        """Mask every frame whose harmonic median window has arrived and resynthesize it."""
+        masked_end = self._frames if self._finished else self._frames - _HARMONIC_LOOKAHEAD_FRAMES
+        count = masked_end - self._masked_frames
+        if count <= 0:
+            return
+
+        # The harmonic median covers the frame, the 4 after it and the 26 before it;
+        # the track edges repeat the outermost frame like `median_filter(mode="nearest")`.
+        history = self._magnitude_history
+        past_frames = _HPSS_KERNEL_SIZE - 1 - _HARMONIC_LOOKAHEAD_FRAMES
+        first_column = history.shape[1] - (self._frames - self._masked_frames)
+        pad_before = max(0, past_frames - first_column)
+        pad_after = max(0, first_column + count + _HARMONIC_LOOKAHEAD_FRAMES - history.shape[1])
+        windows = np.lib.stride_tricks.sliding_window_view(
+            np.pad(history, ((0, 0), (pad_before, pad_after)), mode="edge"),
+            _HPSS_KERNEL_SIZE,
+            axis=1,
+        )
+        window_start = first_column + pad_before - past_frames
+        harmonic_filtered = np.median(windows[:, window_start : window_start + count], axis=-1)
+        spectrum = self._pending_spectrum[:, :count]
+        percussive_filtered = median_filter(np.abs(spectrum), size=(_HPSS_KERNEL_SIZE, 1), mode="reflect")
+        harmonic_mask = librosa.util.softmask(harmonic_filtered, percussive_filtered, power=2.0, split_zeros=True)
+        self._overlap_add(np.fft.irfft(spectrum * harmonic_mask, n=_STFT_N_FFT, axis=0), self._masked_frames)
+
+        self._masked_frames = masked_end
+        self._pending_spectrum = self._pending_spectrum[:, count:]
+        self._magnitude_history = history[:, max(0, first_column + count - past_frames) :]
+
+    def _overlap_add(self, frames: np.ndarray, first_frame: int) -> None:
+        """Resynthesize harmonic frames as `librosa.istft` does and move finished samples to `_harmonic`."""
+        hop = _STFT_HOP_LENGTH
+        end = (first_frame + frames.shape[1] - 1) * hop + _STFT_N_FFT - self._overlap_start
+        if len(self._overlap) < end:
+            self._overlap = np.pad(self._overlap, (0, end - len(self._overlap)))
+            self._overlap_norm = np.pad(self._overlap_norm, (0, end - len(self._overlap_norm)))
+        frames = frames * self._window[:, None]
+        for index in range(frames.shape[1]):
+            position = (first_frame + index) * hop - self._overlap_start
+            self._overlap[position : position + _STFT_N_FFT] += frames[:, index]
+            self._overlap_norm[position : position + _STFT_N_FFT] += self._window**2
+
+        # Later frames start at or after the end of this batch; samples before the audio start are padding.
+        finished = (first_frame + frames.shape[1]) * hop - self._overlap_start
+        if self._finished:
+            finished = min(len(self._overlap), _STFT_N_FFT // 2 + self._received - self._overlap_start)
+        samples = self._overlap[:finished]
+        norm = self._overlap_norm[:finished]
+        tiny = np.finfo(np.float32).tiny
+        samples = np.where(norm > tiny, samples / np.maximum(norm, tiny), samples)
+        samples = samples[max(0, _STFT_N_FFT // 2 - self._overlap_start) :]
+        if samples.size:
+            self._harmonic = np.concatenate((self._harmonic, samples))
+        self._overlap = self._overlap[finished:]
+        self._overlap_norm = self._overlap_norm[finished:]
+        self._overlap_start += finished
+
+    def _pick_onsets(self, end_frame: int, final: bool) -> list[int]:
+        """Run `librosa.util.peak_pick`'s scan over onset frames before `end_frame`.
+
+        Frame `n` is normalized by the onset range up to the end of its
+        averaging window, the last frame its decision waits for.
+        """
+        onset = self._onset
+        offset = self._onset_start
+        known = offset + len(onset)
+        tiny = np.finfo(np.float32).tiny
+
+        peaks: list[int] = []
+        n = self._next_onset
+        while n < end_frame and (final or n + self._post_avg <= known):
+            horizon = min(n + self._post_avg, known) - 1
+            scale = self._onset_peak[horizon - offset] - self._onset_min + tiny
+            normalized = (onset[max(0, n - self._pre_avg) - offset : horizon + 1 - offset] - self._onset_min) / scale
+            # `normalized` starts at frame `base`.
+            base = max(0, n - self._pre_avg)
+            window = normalized[max(0, n - self._pre_max) - base : min(n + self._post_max, known) - base]
+            value = normalized[n - base]
+            if value == window.max():
+                if value >= normalized.mean() + np.float32(0.07):
+                    peaks.append(n)
+                    n += self._wait + 1
+                    continue
+            n += 1
+
+        self._next_onset = n
+        return peaks
+
+    def _onset_events(self, end_frame: int, final: bool) -> list[dict[str, object]]:
+        frames = np.asarray(self._pick_onsets(end_frame, final), dtype=np.int64)
+        if not frames.size:
+            return []
+
+        event_times = librosa.frames_to_time(frames, sr=self.sample_rate)
+        starts = np.maximum(0, ((event_times - 0.01) * self.sample_rate).astype(np.int64))
+        ends = np.minimum(starts + self._energy_window, self._received)
+        energy = np.asarray(
+            [
+                np.sqrt(np.sum(np.square(self._samples(start, end), dtype=np.float64)) / max(end - start, 1))
+                for start, end in zip(starts.tolist(), ends.tolist())
+            ]
+        )
+        frame_indices = _centroid_window_indices(event_times, self.sample_rate, _STFT_HOP_LENGTH, self._frames)
+        onsets = OnsetFeatures(energy=energy, centroid_windows=self._centroid[frame_indices - self._centroid_start])
+
+        is_transient, is_continuous = classify_haptic_modes(onsets, self.mode)
+        # Like the onset scale, the peak is taken where each decision's lookahead ends.
+        peak_blocks = np.minimum(
+            (frames * _STFT_HOP_LENGTH + self._onset_lookahead) // _STFT_HOP_LENGTH,
+            self._peak_blocks_end,
+        )
+        peaks = self._block_peaks[peak_blocks - 1 - self._peak_start].astype(np.float64)
+        intensity, sharpness = scale_onset_parameters(
+            onsets,
+            np.where(peaks > 0, peaks, 1.0),
+            sharpness_factor=self.sharpness_factor,
+            intensity_factor=self.intensity_factor,
+        )
+        intensity, sharpness = apply_split_profile(intensity, sharpness, self.split)
+        return _onset_event_dicts(event_times, is_transient, is_continuous, intensity, sharpness)
+
+    def _background_events(self, end_step: int) -> list[dict[str, object]]:
+        steps = np.arange(self._next_step, end_step)
+        if not steps.size:
+            return []
+
+        consumed = min(len(steps) * self._step_samples, len(self._harmonic))
+        harmonic = self._harmonic[:consumed]
+        harmonic_rms = _block_rms(harmonic, self._step_samples)
+        # Each step is normalized by the harmonic peak up to its own end.
+        step_peaks = np.maximum.reduceat(np.abs(harmonic), np.arange(0, consumed, self._step_samples))
+        peaks = np.maximum.accumulate(np.maximum(step_peaks, self._harmonic_peak))
+        self._harmonic_peak = peaks[-1]
+        self._harmonic = self._harmonic[consumed:]
+        self._next_step = end_step
+
+        # The bass track only differs from the harmonic one in bins where both filters are zero.
+        harmonic_rms = harmonic_rms / np.where(peaks > 0, peaks, 1.0)
+        events = _scale_continuous_rms(
+            steps * _CONTINUOUS_TIME_STEP,
+            harmonic_rms,
+            harmonic_rms,
+            1.0,
+            1.0,
+            _CONTINUOUS_TIME_STEP,
+            intensity_factor=self.intensity_factor,
+            sharpness_factor=self.sharpness_factor,
+        )
+        return _continuous_event_dicts(events)
+
+    @property
+    def _peak_blocks_end(self) -> int:
+        return self._peak_start + len(self._block_peaks)
+
+    def _append_block_peaks(self, block_peaks: np.ndarray) -> None:
+        previous = self._block_peaks[-1] if self._block_peaks.size else np.float32(0.0)
+        running = np.maximum.accumulate(np.maximum(block_peaks, previous))
+        self._block_peaks = np.concatenate((self._block_peaks, running))
+
+    def _track_peak(self, samples: np.ndarray) -> None:
+        """Extend the running peak by every hop-sized block `samples` completes."""
+        hop = _STFT_HOP_LENGTH
+        samples = np.concatenate((self._peak_tail, samples))
+        complete = len(samples) // hop * hop
+        if complete:
+            self._append_block_peaks(np.abs(samples[:complete]).reshape(-1, hop).max(axis=1))
+        self._peak_tail = samples[complete:]
+
+    def _samples(self, start: int, end: int) -> np.ndarray:
+        """Audio samples [start, end) in stream coordinates."""
+        offset = _STFT_N_FFT // 2 - self._buffer_start
+        return self._buffer[start + offset : end + offset]
+
+    def _trim(self) -> None:
+        """Drop audio and per-frame state no pending decision can reach any more."""
+        hop = _STFT_HOP_LENGTH
+        keep_sample = min(
+            self._frames * hop,
+            max(0, self._next_onset * hop - int(self.sample_rate * 0.01) - 1) + _STFT_N_FFT // 2,
+        )
+        if keep_sample > self._buffer_start:
+            self._buffer = self._buffer[keep_sample - self._buffer_start :]
+            self._buffer_start = keep_sample
+
+        keep_onset = max(0, self._next_onset - self._pre_avg)
+        self._onset = self._onset[keep_onset - self._onset_start :]
+        self._onset_peak = self._onset_peak[keep_onset - self._onset_start :]
+        self._onset_start = keep_onset
+
+        keep_peak = (self._next_onset * hop + self._onset_lookahead) // hop - 1
+        keep_peak = min(keep_peak, self._peak_blocks_end - 1)
+        if keep_peak > self._peak_start:
+            self._block_peaks = self._block_peaks[keep_peak - self._peak_start :]
+            self._peak_start = keep_peak
+
+        keep_centroid = max(0, self._next_onset - int(self.sample_rate * 0.025) // hop - 1)
+        keep_centroid = min(keep_centroid, self._frames)
+        self._centroid = self._centroid[keep_centroid - self._centroid_start :]
+        self._centroid_start = keep_centroid
+
+
+def replay_wav(
+    input_wav: str,
+    output_ahap: str,
+    mode: str = "sfx",
+    split: str = "none",
+    sample_rate: int = 44100,
+    chunk_seconds: float = 0.02,
+    output_format: AhapOutputFormat = PRETTY_AHAP_FORMAT,
+) -> ReplayReport:
+    """Feed `input_wav` to an `IncrementalAhapGenerator` in chunks and write the events to `output_ahap`.
+
+    Latency is how much audio past an event's time had been pushed when the
+    event was returned; events only returned by `flush` are not counted.
+    """
+    generator = IncrementalAhapGenerator(mode=mode, split=split, sample_rate=sample_rate)
+    chunk_samples = max(1, int(chunk_seconds * sf.info(input_wav).samplerate))
+    latencies: list[float] = []
+    received = 0
+
+    with AhapStreamWriter(output_ahap, output_format) as writer:
+        for chunk in iter_mono_chunks(input_wav, sample_rate, chunk_samples):
+            received += len(chunk)
+            events = generator.push(chunk)
+            latencies.extend(received / sample_rate - event["Event"]["Time"] for event in events)
+            writer.write_events(events)
+        final_events = generator.flush()
+        writer.write_events(final_events)
+
+    return ReplayReport(
+        output_ahap=output_ahap,
+        events=len(latencies) + len(final_events),
+        max_latency=max(latencies, default=0.0),
+        mean_latency=float(np.mean(latencies)) if latencies else 0.0,
+    )
+
+
+def compare_with_offline(
+    input_wav: str,
+    realtime_ahap: str,
+    mode: str = "sfx",
+    split: str = "none",
+    match_window: float = 0.005,
+) -> AhapParityReport:
+    """Compare a replayed AHAP with `convert_wav_to_ahap` output for the same file."""
+    with tempfile.TemporaryDirectory(prefix="ahap-realtime-") as work_dir:
+        (offline_ahap,) = convert_wav_to_ahap(input_wav, work_dir, mode=mode, split=split)
+        offline = json.loads(Path(offline_ahap).read_text())
+    realtime = json.loads(Path(realtime_ahap).read_text())
+    return compare_ahap(offline, realtime, match_window=match_window)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay audio files through the incremental AHAP generator.")
+    parser.add_argument("inputs", nargs="+", help="Audio files to replay.")
+    parser.add_argument("--output-dir", default=None, help="Output directory (default: a temporary directory).")
+    parser.add_argument("--mode", default="sfx", help="Haptic mode, e.g. 'sfx' or 'music'.")
+    parser.add_argument("--split", default="none", help="Split profile: none, bass, vocals, drums or other.")
+    parser.add_argument("--chunk-ms", type=float, default=20.0, help="Size of the pushed chunks in milliseconds.")
+    parser.add_argument("--compare", action="store_true", help="Compare each result with the offline engine.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="ahap-realtime-") as work_dir:
+        output_dir = args.output_dir or work_dir
+        os.makedirs(output_dir, exist_ok=True)
+        for input_wav in args.inputs:
+            output_ahap = os.path.join(output_dir, f"{Path(input_wav).stem}_realtime.ahap")
+            report = replay_wav(
+                input_wav,
+                output_ahap,
+                mode=args.mode,
+                split=args.split,
+                chunk_seconds=args.chunk_ms / 1000,
+            )
+            print(
+                f"{Path(input_wav).name}: {report.events} events, latency max {report.max_latency * 1000:.0f} ms "
+                f"mean {report.mean_latency * 1000:.0f} ms"
+            )
+            if args.compare:
+                parity = compare_with_offline(input_wav, output_ahap, mode=args.mode, split=args.split)
+                print(
+                    f"  vs offline: events {parity.reference_events}/{parity.candidate_events}, "
+                    f"unmatched {parity.unmatched_events}, max parameter error {parity.max_parameter_error:.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
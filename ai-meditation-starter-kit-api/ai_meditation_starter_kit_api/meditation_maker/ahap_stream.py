@@ -0,0 +1,407 @@
+"""Bounded-memory AHAP generation for long-form audio.
+
+`convert_wav_to_ahap_streaming` produces the same events as `convert_wav_to_ahap`
+without holding the decoded track, its HPSS tracks or the pattern in memory:
+
+1. Audio is decoded in blocks and analyzed with a few STFT frames of context on
+   either side. Each block yields per-frame log-mel spectra, spectral centroid
+   and 20 ms RMS, plus the 100 ms bass/harmonic RMS used by continuous events.
+   These are spilled to temporary files while running peaks and the log-mel
+   maximum are carried over between blocks.
+2. Once the whole track has been seen, the onset strength is computed from the
+   spilled log-mel spectra with the track-wide 80 dB floor, onsets are
+   peak-picked chunk by chunk, and events are normalized and written straight
+   to the output files.
+
+Results match the in-memory path up to float rounding. Temporary files take
+roughly 160 MB per hour of audio, dominated by the log-mel spectra.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import ExitStack
+from pathlib import Path
+from typing import NamedTuple
+
+import librosa
+import numpy as np
+import soundfile as sf
+import soxr
+from scipy.ndimage import median_filter
+
+from .ahap import (
+    _BASS_HPSS_MARGIN,
+    _HPSS_KERNEL_SIZE,
+    _STFT_HOP_LENGTH,
+    _STFT_N_FFT,
+    PRETTY_AHAP_FORMAT,
+    AhapOutputFormat,
+    AhapStreamWriter,
+    OnsetFeatures,
+    _block_rms,
+    _canonical_split,
+    _centroid_window_indices,
+    _continuous_pattern,
+    _onset_event_dicts,
+    _scale_continuous_rms,
+    ahap_output_paths,
+    apply_split_profile,
+    classify_haptic_modes,
+    scale_onset_parameters,
+)
+from .ahap_instrumentation import AhapInstrumentation, instrumented_stage
+
+# Context frames on each side of a block: the HPSS median filter half-width plus
+# the frames that overlap a block edge when the tracks are resynthesized.
+_CONTEXT_FRAMES = _HPSS_KERNEL_SIZE // 2 + _STFT_N_FFT // _STFT_HOP_LENGTH
+# `onset_strength` pads its lagged spectral flux by lag + n_fft // (2 * hop).
+_ONSET_SHIFT_FRAMES = 1 + _STFT_N_FFT // (2 * _STFT_HOP_LENGTH)
+_N_MELS = 128
+_TOP_DB = 80.0
+_CONTINUOUS_TIME_STEP = 0.1
+_PEAK_PICK_CHUNK_FRAMES = 65536
+
+
+class _StreamTotals(NamedTuple):
+    n_samples: int
+    n_frames: int
+    audio_peak: float
+    bass_peak: float
+    harmonic_peak: float
+    mel_db_max: float
+
+
+def iter_mono_chunks(input_wav: str, sample_rate: int, chunk_samples: int) -> Iterator[np.ndarray]:
+    """Decode `input_wav` as mono float32 at `sample_rate`, one chunk at a time."""
+    with sf.SoundFile(input_wav) as audio_file:
+        resampler = None
+        if audio_file.samplerate != sample_rate:
+            resampler = soxr.ResampleStream(audio_file.samplerate, sample_rate, 1, dtype="float32")
+
+        while True:
+            data = audio_file.read(chunk_samples, dtype="float32", always_2d=True)
+            is_last = len(data) < chunk_samples
+            mono = data.mean(axis=1, dtype=np.float32)
+            if resampler is not None:
+                mono = resampler.resample_chunk(mono, last=is_last)
+            if mono.size:
+                yield mono
+            if is_last:
+                return
+
+
+def _analyze_blocks(
+    input_wav: str,
+    sample_rate: int,
+    block_frames: int,
+    spill_dir: str,
+) -> _StreamTotals:
+    """First pass: analyze the track block by block and spill per-frame features to `spill_dir`."""
+    hop = _STFT_HOP_LENGTH
+    n_fft = _STFT_N_FFT
+    context = _CONTEXT_FRAMES
+    # Audio sample 0 sits this far into the (virtually) zero-padded signal the blocks are cut from.
+    lead = n_fft // 2 + context * hop
+    step_samples = int(round(_CONTINUOUS_TIME_STEP * sample_rate))
+    energy_window = int(sample_rate * 0.02)
+    mel_basis = librosa.filters.mel(sr=sample_rate, n_fft=n_fft, n_mels=_N_MELS)
+    bass_harm_margin, bass_perc_margin = _BASS_HPSS_MARGIN
+
+    chunks = iter_mono_chunks(input_wav, sample_rate, block_frames * hop)
+    buffer = np.zeros(lead, dtype=np.float32)
+    buffer_start_frame = 0
+    n_samples = 0
+    eof = False
+
+    audio_peak = bass_peak = harmonic_peak = 0.0
+    mel_db_max = -np.inf
+
+    with ExitStack() as stack:
+        spills = {
+            name: stack.enter_context(open(os.path.join(spill_dir, f"{name}.bin"), "wb"))
+            for name in ("mel_db", "centroid", "energy", "bass_rms", "harmonic_rms")
+        }
+
+        while True:
+            pending: list[np.ndarray] = [buffer]
+            pending_length = len(buffer)
+            required = (block_frames + 2 * context - 1) * hop + n_fft
+            while pending_length < required and not eof:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    eof = True
+                    break
+                pending.append(chunk)
+                pending_length += len(chunk)
+                n_samples += len(chunk)
+            buffer = np.concatenate(pending)
+
+            first_frame = buffer_start_frame
+            if eof:
+                n_frames = 1 + n_samples // hop
+                frames = min(block_frames, n_frames - first_frame)
+                if frames <= 0:
+                    break
+                required = (frames + 2 * context - 1) * hop + n_fft
+                if len(buffer) < required:
+                    buffer = np.pad(buffer, (0, required - len(buffer)))
+            else:
+                frames = block_frames
+
+            segment = buffer[: (frames + 2 * context - 1) * hop + n_fft]
+            interior = min(frames * hop, n_samples - first_frame * hop) if eof else frames * hop
+
+            magnitude, phase = librosa.magphase(
+                librosa.stft(segment, n_fft=n_fft, hop_length=hop, center=False)
+            )
+
+            centroid = librosa.feature.spectral_centroid(S=magnitude, sr=sample_rate, n_fft=n_fft, hop_length=hop)[0]
+            np.asarray(centroid[context : context + frames], dtype=np.float64).tofile(spills["centroid"])
+
+            # The 80 dB floor of `power_to_db` depends on the track-wide maximum, so the
+            # unclamped spectra are spilled and the onset strength is computed later.
+            mel_db = librosa.power_to_db(mel_basis @ magnitude[:, context : context + frames] ** 2, top_db=None)
+            mel_db_max = max(mel_db_max, float(mel_db.max()))
+            np.ascontiguousarray(mel_db.T, dtype=np.float32).tofile(spills["mel_db"])
+
+            # At the track edges, drop the padding frames so the median filter reflects
+            # and the ISTFT normalizes exactly as they do over the whole spectrogram.
+            first_column = context if first_frame == 0 else 0
+            last_column = frames + 2 * context
+            if eof:
+                last_column = min(last_column, 1 + n_samples // hop - first_frame + context)
+            magnitude = magnitude[:, first_column:last_column]
+            phase = phase[:, first_column:last_column]
+            track_offset = lead - first_column * hop
+
+            harmonic_filtered = median_filter(magnitude, size=(1, _HPSS_KERNEL_SIZE), mode="reflect")
+            percussive_filtered = median_filter(magnitude, size=(_HPSS_KERNEL_SIZE, 1), mode="reflect")
+            harmonic_mask = librosa.util.softmask(harmonic_filtered, percussive_filtered, power=2.0, split_zeros=True)
+            bass_mask = librosa.util.softmask(
+                harmonic_filtered,
+                percussive_filtered * bass_harm_margin,
+                power=2.0,
+                split_zeros=bass_harm_margin == 1 and bass_perc_margin == 1,
+            )
+            harmonic = librosa.istft(magnitude * harmonic_mask * phase, hop_length=hop, n_fft=n_fft, center=False)
+            bass = librosa.istft(magnitude * bass_mask * phase, hop_length=hop, n_fft=n_fft, center=False)
+            harmonic = harmonic[track_offset : track_offset + interior]
+            bass = bass[track_offset : track_offset + interior]
+            audio = segment[lead : lead + interior]
+
+            audio_peak = max(audio_peak, float(np.max(np.abs(audio))) if audio.size else 0.0)
+            bass_peak = max(bass_peak, float(np.max(np.abs(bass))) if bass.size else 0.0)
+            harmonic_peak = max(harmonic_peak, float(np.max(np.abs(harmonic))) if harmonic.size else 0.0)
+            _block_rms(bass, step_samples).astype(np.float64).tofile(spills["bass_rms"])
+            _block_rms(harmonic, step_samples).astype(np.float64).tofile(spills["harmonic_rms"])
+
+            # 20 ms RMS starting 10 ms before every frame, the window `extract_onset_features` uses.
+            frame_times = librosa.frames_to_time(np.arange(first_frame, first_frame + frames), sr=sample_rate)
+            starts = np.maximum(0, ((frame_times - 0.01) * sample_rate).astype(np.int64))
+            ends = np.minimum(starts + energy_window, n_samples) if eof else starts + energy_window
+            offset = lead - first_frame * hop
+            squared_sums = np.concatenate(([0.0], np.cumsum(segment.astype(np.float64) ** 2)))
+            counts = np.maximum(ends - starts, 1)
+            energy = np.sqrt((squared_sums[ends + offset] - squared_sums[starts + offset]) / counts)
+            energy.tofile(spills["energy"])
+
+            buffer = buffer[frames * hop :]
+            buffer_start_frame += frames
+            if eof and buffer_start_frame >= 1 + n_samples // hop:
+                break
+
+    return _StreamTotals(
+        n_samples=n_samples,
+        n_frames=buffer_start_frame,
+        audio_peak=audio_peak if audio_peak > 0 else 1.0,
+        bass_peak=bass_peak if bass_peak > 0 else 1.0,
+        harmonic_peak=harmonic_peak if harmonic_peak > 0 else 1.0,
+        mel_db_max=mel_db_max,
+    )
+
+
+def _spill_onset_strength(mel_db: np.ndarray, totals: _StreamTotals, onset_path: str) -> tuple[float, float]:
+    """Write `librosa.onset.onset_strength` for the whole track to `onset_path`; return its (min, max)."""
+    floor = np.float32(totals.mel_db_max - _TOP_DB)
+    onset_min, onset_max = np.inf, -np.inf
+
+    with open(onset_path, "wb") as onset_file:
+        for chunk_start in range(0, totals.n_frames, _PEAK_PICK_CHUNK_FRAMES):
+            chunk_end = min(chunk_start + _PEAK_PICK_CHUNK_FRAMES, totals.n_frames)
+            # Frame j holds the lag-1 spectral flux into frame j - shift + 1; earlier frames are zero padding.
+            rows_start = max(chunk_start - _ONSET_SHIFT_FRAMES, 0)
+            rows = np.maximum(np.asarray(mel_db[rows_start : max(chunk_end - _ONSET_SHIFT_FRAMES + 1, rows_start)]), floor)
+            flux = np.mean(np.maximum(0.0, np.diff(rows, axis=0)), axis=1)
+
+            onset = np.zeros(chunk_end - chunk_start, dtype=np.float32)
+            frames = np.arange(max(chunk_start, _ONSET_SHIFT_FRAMES), chunk_end)
+            onset[frames - chunk_start] = flux[frames - _ONSET_SHIFT_FRAMES - rows_start]
+
+            onset_min = min(onset_min, float(onset.min()))
+            onset_max = max(onset_max, float(onset.max()))
+            onset.tofile(onset_file)
+
+    return onset_min, onset_max
+
+
+def _iter_onset_frames(
+    onset: np.ndarray,
+    onset_min: float,
+    onset_max: float,
+    sample_rate: int,
+) -> Iterator[np.ndarray]:
+    """Peak-pick the normalized onset strength in chunks, as `librosa.onset.onset_detect` does."""
+    spread = onset_max - onset_min
+    if not spread > 0:
+        return
+
+    hop = _STFT_HOP_LENGTH
+    pre_max = 0.03 * sample_rate // hop
+    post_max = 0.00 * sample_rate // hop + 1
+    pre_avg = 0.10 * sample_rate // hop
+    post_avg = 0.10 * sample_rate // hop + 1
+    wait = 0.03 * sample_rate // hop
+    margin_before = int(max(pre_max, pre_avg))
+    margin_after = int(max(post_max, post_avg))
+    scale = np.float32(spread) + np.finfo(np.float32).tiny
+
+    # Peaks are picked with wait=0 so chunk margins cannot suppress peaks;
+    # `wait` is then applied greedily across chunks, matching librosa's scan.
+    last_onset = -np.inf
+    n_frames = len(onset)
+    for chunk_start in range(0, n_frames, _PEAK_PICK_CHUNK_FRAMES):
+        chunk_end = min(chunk_start + _PEAK_PICK_CHUNK_FRAMES, n_frames)
+        lo = max(0, chunk_start - margin_before)
+        hi = min(n_frames, chunk_end + margin_after)
+        normalized = (np.asarray(onset[lo:hi]) - np.float32(onset_min)) / scale
+
+        candidates = lo + librosa.util.peak_pick(
+            normalized,
+            pre_max=pre_max,
+            post_max=post_max,
+            pre_avg=pre_avg,
+            post_avg=post_avg,
+            delta=0.07,
+            wait=0,
+        )
+        kept: list[int] = []
+        for frame in candidates[(candidates >= chunk_start) & (candidates < chunk_end)].tolist():
+            if frame > last_onset + wait:
+                kept.append(frame)
+                last_onset = frame
+        if kept:
+            yield np.asarray(kept, dtype=np.int64)
+
+
+def convert_wav_to_ahap_streaming(
+    input_wav: str,
+    output_dir: str | None,
+    mode: str,
+    split: str,
+    sample_rate: int = 44100,
+    sharpness_factor: float = 3.0,
+    intensity_factor: float = 2.5,
+    block_seconds: float = 30.0,
+    output_format: AhapOutputFormat = PRETTY_AHAP_FORMAT,
+    continuous_tolerance: float | None = None,
+    instrumentation: AhapInstrumentation | None = None,
+) -> list[str]:
+    """Convert an audio file into `.ahap` files with memory independent of track length.
+
+    Takes the same arguments and writes the same files as `convert_wav_to_ahap`.
+    `block_seconds` sets the analysis block size and therefore peak memory.
+    `instrumentation` sees the stages analyze_blocks, onset, transient_events
+    and continuous_events; the last two include writing their events.
+    """
+    split = _canonical_split(split)
+
+    if not output_dir:
+        output_dir = str(Path(input_wav).resolve().parent)
+
+    os.makedirs(output_dir, exist_ok=True)
+    output_paths = ahap_output_paths(input_wav, output_dir, split)
+
+    # Blocks hold a whole number of STFT hops and continuous-event steps so both stay aligned.
+    step_samples = int(round(_CONTINUOUS_TIME_STEP * sample_rate))
+    alignment = math.lcm(_STFT_HOP_LENGTH, step_samples)
+    block_samples = max(1, round(block_seconds * sample_rate / alignment)) * alignment
+    block_frames = block_samples // _STFT_HOP_LENGTH
+
+    with tempfile.TemporaryDirectory(prefix="ahap-stream-") as spill_dir, ExitStack() as stack:
+        with instrumented_stage(instrumentation, "analyze_blocks") as stage:
+            totals = _analyze_blocks(input_wav, sample_rate, block_frames, spill_dir)
+            stage.items = totals.n_samples
+
+        def _spilled(name: str, dtype: type, shape: tuple[int, ...] = ()) -> np.ndarray:
+            path = os.path.join(spill_dir, f"{name}.bin")
+            if not os.path.getsize(path):
+                return np.zeros((0, *shape), dtype=dtype)
+            return np.memmap(path, dtype=dtype, mode="r").reshape(-1, *shape)
+
+        mel_db = _spilled("mel_db", np.float32, (_N_MELS,))
+        with instrumented_stage(instrumentation, "onset") as stage:
+            onset_min, onset_max = _spill_onset_strength(mel_db, totals, os.path.join(spill_dir, "onset.bin"))
+            stage.items = totals.n_frames
+        onset = _spilled("onset", np.float32)
+        centroid = _spilled("centroid", np.float64)
+        energy = _spilled("energy", np.float64)
+        bass_rms = _spilled("bass_rms", np.float64)
+        harmonic_rms = _spilled("harmonic_rms", np.float64)
+
+        writers = {
+            split_type: stack.enter_context(AhapStreamWriter(output_ahap, output_format))
+            for split_type, output_ahap in output_paths.items()
+        }
+
+        with instrumented_stage(instrumentation, "transient_events") as stage:
+            for onset_frames in _iter_onset_frames(onset, onset_min, onset_max, sample_rate):
+                event_times = librosa.frames_to_time(onset_frames, sr=sample_rate)
+                window_indices = _centroid_window_indices(event_times, sample_rate, _STFT_HOP_LENGTH, totals.n_frames)
+                onsets = OnsetFeatures(energy=energy[onset_frames], centroid_windows=centroid[window_indices])
+                is_transient, is_continuous = classify_haptic_modes(onsets, mode)
+                stage.items += int(np.count_nonzero(is_transient) + np.count_nonzero(is_continuous))
+                intensity, sharpness = scale_onset_parameters(
+                    onsets,
+                    totals.audio_peak,
+                    sharpness_factor=sharpness_factor,
+                    intensity_factor=intensity_factor,
+                )
+                for split_type, writer in writers.items():
+                    split_intensity, split_sharpness = apply_split_profile(intensity, sharpness, split_type)
+                    writer.write_events(
+                        _onset_event_dicts(event_times, is_transient, is_continuous, split_intensity, split_sharpness)
+                    )
+
+        duration = totals.n_samples / sample_rate
+        n_steps = min(
+            math.ceil(duration / _CONTINUOUS_TIME_STEP) if duration > 0 else 0,
+            len(bass_rms),
+            len(harmonic_rms),
+        )
+        # Coalescing needs the whole run of steps; they are 10 per second, so this stays small.
+        chunk_steps = _PEAK_PICK_CHUNK_FRAMES if continuous_tolerance is None else max(n_steps, 1)
+        with instrumented_stage(instrumentation, "continuous_events") as stage:
+            for step_start in range(0, n_steps, chunk_steps):
+                step_end = min(step_start + chunk_steps, n_steps)
+                continuous_events = _scale_continuous_rms(
+                    np.arange(step_start, step_end) * _CONTINUOUS_TIME_STEP,
+                    np.asarray(bass_rms[step_start:step_end]),
+                    np.asarray(harmonic_rms[step_start:step_end]),
+                    totals.bass_peak,
+                    totals.harmonic_peak,
+                    _CONTINUOUS_TIME_STEP,
+                    intensity_factor=intensity_factor,
+                    sharpness_factor=sharpness_factor,
+                )
+                events = _continuous_pattern(continuous_events, continuous_tolerance)
+                stage.items += len(continuous_events.times)
+                for writer in writers.values():
+                    writer.write_events(events)
+
+        del mel_db, onset, centroid, energy, bass_rms, harmonic_rms
+
+    return list(output_paths.values())
@@ -0,0 +1,328 @@
+"""Async counterparts of the provider functions, built on `httpx.AsyncClient`.
+
+The async clients mirror `ElevenLabsClient` and `IEmbraceClient`: configuration
+is resolved once, connections are pooled, and 429/5xx responses are retried
+with the same `RetryPolicy`. Each client also caps how many of its requests are
+in flight, so callers can `asyncio.gather` a whole script's segments. Without
+an explicit client, each event loop gets one shared client per provider;
+await `aclose_default_clients()` before the loop ends to close them, or pass
+clients managed with `async with`.
+
+Example::
+
+    results = await asyncio.gather(*(agenerate_tts_audio_elevenlabs({"text": text}) for text in segments))
+    await aclose_default_clients()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import TYPE_CHECKING, Any, Self
+
+import httpx
+
+from .audio_cache import sfx_cache_key
+from .clients import _DEFAULT_POOL_SIZE, _ELEVENLABS_BASE_URL, DEFAULT_RETRY_POLICY, RetryPolicy
+from .config import (
+    get_api_base_url,
+    get_elevenlabs_api_key,
+    get_elevenlabs_voice_id,
+    get_user_email,
+    load_project_env,
+)
+from .elevenlabs_sfx import _elevenlabs_sfx_result
+from .elevenlabs_sfx import _output_format_to_elevenlabs as _sfx_output_format
+from .elevenlabs_sfx import _to_output_format as _sfx_to_output_format
+from .elevenlabs_tts import (
+    _ELEVENLABS_MODEL_ID,
+    _convert_iembrace_pause_tokens,
+    _elevenlabs_tts_cache_key,
+    _elevenlabs_tts_result,
+    _join_speech_parts,
+    _output_format_to_elevenlabs,
+    _split_long_pauses,
+    _to_output_format,
+)
+from .iembrace import _iembrace_tts_result, _personalized_script
+from .types import coerce_sfx_request, coerce_tts_request
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .audio_cache import AudioCache
+    from .types import SFXRequest, SFXResult, TTSRequest, TTSResult
+
+_DEFAULT_MAX_CONCURRENCY = 4
+# Longest backoff between retries, as in urllib3.
+_MAX_BACKOFF_SECONDS = 120.0
+
+_default_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, Any]] = weakref.WeakKeyDictionary()
+
+
+def _retry_delay(response: httpx.Response, retry: RetryPolicy, attempt: int) -> float:
+    retry_after = response.headers.get("Retry-After", "")
+    try:
+        delay = float(retry_after)
+    except ValueError:
+        delay = retry.backoff_factor * 2**attempt
+    return min(max(delay, 0.0), _MAX_BACKOFF_SECONDS)
+
+
+class _AsyncProviderClient:
+    def __init__(
+        self,
+        http: httpx.AsyncClient | None,
+        retry: RetryPolicy,
+        pool_size: int,
+        max_concurrency: int,
+    ) -> None:
+        self.retry = retry
+        self.http = http or httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+                retries=retry.total,
+            )
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _post(self, url: str, *, timeout: float, **kwargs: Any) -> httpx.Response:
+        async with self._semaphore:
+            for attempt in range(self.retry.total + 1):
+                response = await self.http.post(url, timeout=timeout, **kwargs)
+                if response.status_code not in self.retry.status_forcelist or attempt == self.retry.total:
+                    break
+                await asyncio.sleep(_retry_delay(response, self.retry, attempt))
+        response.raise_for_status()
+        return response
+
+    async def aclose(self) -> None:
+        await self.http.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+
+class AsyncElevenLabsClient(_AsyncProviderClient):
+    """Async `ElevenLabsClient` allowing at most `max_concurrency` requests in flight."""
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        voice_id: str | None = None,
+        *,
+        base_url: str = _ELEVENLABS_BASE_URL,
+        http: httpx.AsyncClient | None = None,
+        retry: RetryPolicy = DEFAULT_RETRY_POLICY,
+        pool_size: int = _DEFAULT_POOL_SIZE,
+        max_concurrency: int = _DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        if api_key is None or voice_id is None:
+            load_project_env()
+        self.api_key = api_key or get_elevenlabs_api_key()
+        self.voice_id = voice_id or get_elevenlabs_voice_id()
+        self.base_url = base_url.rstrip("/")
+        super().__init__(http, retry, pool_size, max_concurrency)
+
+    async def _post_audio(self, path: str, output_format: str, body: dict[str, Any], timeout: float) -> bytes:
+        response = await self._post(
+            f"{self.base_url}/{path}",
+            headers={
+                "Content-Type": "application/json",
+                "xi-api-key": self.api_key,
+            },
+            params={"output_format": output_format},
+            json=body,
+            timeout=timeout,
+        )
+        return response.content
+
+    async def text_to_speech(
+        self,
+        text: str,
+        *,
+        model_id: str,
+        output_format: str,
+        voice_id: str | None = None,
+        timeout: float = 60,
+    ) -> bytes:
+        """Return the encoded audio ElevenLabs synthesizes for `text`."""
+        return await self._post_audio(
+            f"text-to-speech/{voice_id or self.voice_id}",
+            output_format,
+            {"text": text, "model_id": model_id},
+            timeout,
+        )
+
+    async def sound_generation(self, payload: dict[str, Any], *, output_format: str, timeout: float = 60) -> bytes:
+        """Return the encoded audio of a generated sound effect."""
+        return await self._post_audio("sound-generation", output_format, payload, timeout)
+
+
+class AsyncIEmbraceClient(_AsyncProviderClient):
+    """Async `IEmbraceClient` allowing at most `max_concurrency` requests in flight."""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        user_email: str | None = None,
+        *,
+        http: httpx.AsyncClient | None = None,
+        retry: RetryPolicy = DEFAULT_RETRY_POLICY,
+        pool_size: int = _DEFAULT_POOL_SIZE,
+        max_concurrency: int = _DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        if base_url is None or user_email is None:
+            load_project_env()
+        self.base_url = (base_url or get_api_base_url()).rstrip("/")
+        self.user_email = user_email or get_user_email()
+        super().__init__(http, retry, pool_size, max_concurrency)
+
+    async def post_json(self, path: str, body: dict[str, Any], *, timeout: float = 30) -> Any:
+        """POST `body` to `path` and return the decoded JSON response."""
+        response = await self._post(
+            f"{self.base_url}/{path}",
+            headers={
+                "Content-Type": "application/json",
+                "X-User-Email": self.user_email,
+            },
+            json=body,
+            timeout=timeout,
+        )
+        return response.json()
+
+
+def default_async_elevenlabs_client() -> AsyncElevenLabsClient:
+    """Shared client of the running event loop, created on first use."""
+    clients = _default_clients.setdefault(asyncio.get_running_loop(), {})
+    if "elevenlabs" not in clients:
+        clients["elevenlabs"] = AsyncElevenLabsClient()
+    return clients["elevenlabs"]
+
+
+def default_async_iembrace_client() -> AsyncIEmbraceClient:
+    """Shared client of the running event loop, created on first use."""
+    clients = _default_clients.setdefault(asyncio.get_running_loop(), {})
+    if "iembrace" not in clients:
+        clients["iembrace"] = AsyncIEmbraceClient()
+    return clients["iembrace"]
+
+
+async def aclose_default_clients() -> None:
+    """Close the running event loop's shared clients; later calls create new ones."""
+    clients = _default_clients.pop(asyncio.get_running_loop(), {})
+    await asyncio.gather(*(client.aclose() for client in clients.values()))
+
+
+async def _asynthesize_span(
+    span: str,
+    client: AsyncElevenLabsClient,
+    request: TTSRequest,
+    voice_id: str,
+    timeout: int,
+    cache: AudioCache | None,
+) -> bytes:
+    text = _convert_iembrace_pause_tokens(span)
+    cache_key = _elevenlabs_tts_cache_key(request, text, voice_id)
+
+    audio_bytes = await asyncio.to_thread(cache.get, cache_key) if cache is not None else None
+    if audio_bytes is None:
+        audio_bytes = await client.text_to_speech(
+            text,
+            model_id=_ELEVENLABS_MODEL_ID,
+            output_format=_output_format_to_elevenlabs(request.outputFormat),
+            voice_id=voice_id,
+            timeout=timeout,
+        )
+        # MP3-to-WAV decoding is CPU-bound (or waits on ffmpeg), so keep it off the event loop.
+        audio_bytes = await asyncio.to_thread(_to_output_format, audio_bytes, request.outputFormat)
+        if cache is not None:
+            await asyncio.to_thread(cache.put, cache_key, audio_bytes)
+    return audio_bytes
+
+
+async def agenerate_tts_audio_elevenlabs(
+    request: TTSRequest | Mapping[str, Any],
+    *,
+    timeout: int = 60,
+    voice_id: str | None = None,
+    client: AsyncElevenLabsClient | None = None,
+    cache: AudioCache | None = None,
+) -> TTSResult:
+    """Async `generate_tts_audio_elevenlabs`; `cache` lookups run in a worker thread."""
+    normalized_request = coerce_tts_request(request)
+    client = client or default_async_elevenlabs_client()
+    chosen_voice_id = voice_id or client.voice_id
+    parts = _split_long_pauses(normalized_request)
+
+    clips = await asyncio.gather(
+        *(
+            _asynthesize_span(part, client, normalized_request, chosen_voice_id, timeout, cache)
+            for part in parts
+            if isinstance(part, str)
+        )
+    )
+    return _elevenlabs_tts_result(normalized_request, _join_speech_parts(parts, list(clips)), chosen_voice_id)
+
+
+async def agenerate_sfx_audio_elevenlabs(
+    request: SFXRequest | Mapping[str, Any],
+    *,
+    timeout: int = 60,
+    client: AsyncElevenLabsClient | None = None,
+    cache: AudioCache | None = None,
+) -> SFXResult:
+    """Async `generate_sfx_audio_elevenlabs`; `cache` lookups run in a worker thread."""
+    normalized_request = coerce_sfx_request(request)
+    client = client or default_async_elevenlabs_client()
+    cache_key = sfx_cache_key("elevenlabs", normalized_request)
+
+    audio_bytes = await asyncio.to_thread(cache.get, cache_key) if cache is not None else None
+    if audio_bytes is None:
+        audio_bytes = await client.sound_generation(
+            normalized_request.as_payload(),
+            output_format=_sfx_output_format(normalized_request.outputFormat),
+            timeout=timeout,
+        )
+        audio_bytes = await asyncio.to_thread(_sfx_to_output_format, audio_bytes, normalized_request.outputFormat)
+        if cache is not None:
+            await asyncio.to_thread(cache.put, cache_key, audio_bytes)
+    return _elevenlabs_sfx_result(normalized_request, audio_bytes)
+
+
+async def agenerate_personalized_meditation(
+    mood: str,
+    goal: str,
+    message_to_loved_one: str,
+    *,
+    timeout: int = 30,
+    client: AsyncIEmbraceClient | None = None,
+) -> str:
+    """Async `generate_personalized_meditation`."""
+    client = client or default_async_iembrace_client()
+    body = {
+        "mood": mood,
+        "goal": goal,
+        "message_to_loved_one": message_to_loved_one,
+    }
+
+    return _personalized_script(await client.post_json("personalization", body, timeout=timeout))
+
+
+async def agenerate_tts_audio_iembrace(
+    request: TTSRequest | Mapping[str, Any],
+    *,
+    timeout: int = 60,
+    client: AsyncIEmbraceClient | None = None,
+) -> TTSResult:
+    """Async `generate_tts_audio_iembrace`."""
+    normalized_request = coerce_tts_request(request)
+    client = client or default_async_iembrace_client()
+
+    return _iembrace_tts_result(
+        normalized_request,
+        await client.post_json("personalization/tts_service", normalized_request.as_payload(), timeout=timeout),
+    )
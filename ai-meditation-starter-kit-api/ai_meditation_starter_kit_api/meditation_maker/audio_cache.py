@@ -0,0 +1,238 @@
+"""Content-addressed cache for synthesized TTS and SFX audio.
+
+Keys hash everything that changes the audio: provider, voice, model, the text
+as sent to the provider, language and output format. Entries hold the final
+audio bytes, so a hit also skips the MP3-to-WAV conversion. Two backends are
+provided, both evicting least recently used entries past `max_bytes`:
+
+- `DiskAudioCache` for scripts and local runs.
+- `RedisAudioCache` for the web app, shared between workers; build it from the
+  Django cache with `RedisAudioCache.from_django()`.
+
+Example::
+
+    cache = DiskAudioCache(".cache/audio")
+    generate_tts_audio_elevenlabs({"text": "Namaste."}, cache=cache)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from .types import SFXRequest
+
+# Bump when synthesis or conversion changes output so stale entries stop matching.
+_AUDIO_CACHE_VERSION = 2
+_DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+_DEFAULT_REDIS_PREFIX = "meditation-audio:"
+
+
+class AudioCacheStats(NamedTuple):
+    hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _hash_key(params: dict[str, Any]) -> str:
+    params = {"version": _AUDIO_CACHE_VERSION, **params}
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+def tts_cache_key(
+    provider: str,
+    voice_id: str,
+    model_id: str,
+    text: str,
+    language_code: str,
+    output_format: str,
+) -> str:
+    """Key for speech synthesized from `text`, with whitespace runs collapsed."""
+    return _hash_key(
+        {
+            "kind": "tts",
+            "provider": provider,
+            "voice_id": voice_id,
+            "model_id": model_id,
+            "text": " ".join(text.split()),
+            "language_code": language_code,
+            "output_format": output_format,
+        }
+    )
+
+
+def sfx_cache_key(provider: str, request: SFXRequest) -> str:
+    """Key for a sound effect generated from `request`."""
+    return _hash_key(
+        {
+            "kind": "sfx",
+            "provider": provider,
+            "text": " ".join(request.text.split()),
+            "duration_seconds": request.durationSeconds,
+            "prompt_influence": request.promptInfluence,
+            "output_format": request.outputFormat,
+        }
+    )
+
+
+class AudioCache(ABC):
+    """Base class counting hits and misses; backends implement `_load` and `_store`."""
+
+    def __init__(self, max_bytes: int = _DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Segments are synthesized from several threads at once.
+        self._stats_lock = threading.Lock()
+
+    @property
+    def stats(self) -> AudioCacheStats:
+        with self._stats_lock:
+            return AudioCacheStats(hits=self.hits, misses=self.misses)
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached audio for `key`, marking it as recently used."""
+        audio_bytes = self._load(key)
+        with self._stats_lock:
+            if audio_bytes is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return audio_bytes
+
+    def put(self, key: str, audio_bytes: bytes) -> None:
+        """Store `audio_bytes` and evict least recently used entries past `max_bytes`."""
+        self._store(key, audio_bytes)
+
+    @abstractmethod
+    def _load(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    def _store(self, key: str, audio_bytes: bytes) -> None: ...
+
+
+class DiskAudioCache(AudioCache):
+    """One file per entry; file mtimes record last use, as in `AhapCache`."""
+
+    def __init__(self, directory: str | os.PathLike[str], max_bytes: int = _DEFAULT_MAX_BYTES) -> None:
+        super().__init__(max_bytes)
+        self.directory = Path(directory)
+
+    def _load(self, key: str) -> bytes | None:
+        path = self.directory / key
+        try:
+            audio_bytes = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except FileNotFoundError:
+            # Evicted by another process after the read; the bytes are still valid.
+            pass
+        return audio_bytes
+
+    def _store(self, key: str, audio_bytes: bytes) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temp file and rename it so concurrent readers never see partial entries.
+        fd, staging = tempfile.mkstemp(prefix=".staging-", dir=self.directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(audio_bytes)
+        os.replace(staging, self.directory / key)
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in `max_bytes`."""
+        if not self.directory.is_dir():
+            return
+
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.directory.iterdir():
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # Removed by another process or thread while listing.
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+class RedisAudioCache(AudioCache):
+    """Entries in Redis, shared by every process using the same `prefix`.
+
+    A sorted set orders keys by last use and a hash records entry sizes, so
+    eviction pops the oldest keys until the running total fits in `max_bytes`.
+    `client` is a `redis.Redis` that returns bytes (the default).
+    """
+
+    def __init__(self, client: Any, max_bytes: int = _DEFAULT_MAX_BYTES, prefix: str = _DEFAULT_REDIS_PREFIX) -> None:
+        super().__init__(max_bytes)
+        self.client = client
+        self.prefix = prefix
+        self._recency_key = f"{prefix}recency"
+        self._sizes_key = f"{prefix}sizes"
+        self._total_key = f"{prefix}total-bytes"
+
+    @classmethod
+    def from_django(cls, alias: str = "default", **kwargs: Any) -> RedisAudioCache:
+        """Use the Redis connection behind the `django-redis` cache `alias`."""
+        from django_redis import get_redis_connection
+
+        return cls(get_redis_connection(alias), **kwargs)
+
+    def _load(self, key: str) -> bytes | None:
+        audio_bytes = self.client.get(f"{self.prefix}{key}")
+        if audio_bytes is not None:
+            self.client.zadd(self._recency_key, {key: time.time()}, xx=True)
+        return audio_bytes
+
+    def _store(self, key: str, audio_bytes: bytes) -> None:
+        pipe = self.client.pipeline()
+        pipe.set(f"{self.prefix}{key}", audio_bytes)
+        pipe.zadd(self._recency_key, {key: time.time()})
+        pipe.hget(self._sizes_key, key)
+        pipe.hset(self._sizes_key, key, len(audio_bytes))
+        pipe.incrby(self._total_key, len(audio_bytes))
+        previous_size = pipe.execute()[2]
+        if previous_size is not None:
+            # The same key was stored before, so only count its bytes once.
+            self.client.decrby(self._total_key, int(previous_size))
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in `max_bytes`."""
+        while int(self.client.get(self._total_key) or 0) > self.max_bytes:
+            popped = self.client.zpopmin(self._recency_key)
+            if not popped:
+                break
+            key = popped[0][0].decode()
+            size = int(self.client.hget(self._sizes_key, key) or 0)
+            pipe = self.client.pipeline()
+            pipe.delete(f"{self.prefix}{key}")
+            pipe.hdel(self._sizes_key, key)
+            pipe.decrby(self._total_key, size)
+            pipe.execute()
@@ -0,0 +1,238 @@
+"""Provider clients that reuse HTTP connections across calls.
+
+Each client resolves its configuration once, holds a `requests.Session` with a
+keep-alive connection pool, and retries rate-limited (429) and server-error
+(5xx) responses with exponential backoff, honouring `Retry-After`. The
+module-level functions such as `generate_tts_audio_elevenlabs` share one
+default client per provider.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Iterator
+from typing import Any, NamedTuple, Self
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import (
+    get_api_base_url,
+    get_elevenlabs_api_key,
+    get_elevenlabs_voice_id,
+    get_user_email,
+    load_project_env,
+)
+
+_ELEVENLABS_BASE_URL = "https://api.elevenlabs.io/v1"
+_DEFAULT_POOL_SIZE = 10
+# About half a second of 128 kbps MP3, so streamed audio is handed on promptly.
+_STREAM_CHUNK_BYTES = 8 * 1024
+
+
+class RetryPolicy(NamedTuple):
+    total: int = 3
+    backoff_factor: float = 0.5
+    status_forcelist: tuple[int, ...] = (429, 500, 502, 503, 504)
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def create_session(
+    retry: RetryPolicy = DEFAULT_RETRY_POLICY,
+    pool_size: int = _DEFAULT_POOL_SIZE,
+) -> requests.Session:
+    """Create a session with a keep-alive pool of `pool_size` connections per host and retries.
+
+    When retries run out, the last response is returned so `raise_for_status`
+    reports the provider's status as before. Only failed connections and the
+    statuses in `status_forcelist` are retried: a POST that times out or breaks
+    after reaching the provider may already have been billed, so it is not sent
+    again.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=retry.total,
+            connect=retry.total,
+            read=False,
+            other=False,
+            backoff_factor=retry.backoff_factor,
+            status_forcelist=retry.status_forcelist,
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        ),
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class _ProviderClient:
+    def __init__(
+        self,
+        session: requests.Session | None,
+        retry: RetryPolicy,
+        pool_size: int,
+    ) -> None:
+        self.session = session or create_session(retry, pool_size)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class ElevenLabsClient(_ProviderClient):
+    """ElevenLabs text-to-speech and sound-generation endpoints.
+
+    `api_key` and `voice_id` default to `ELEVENLABS_API_KEY` and
+    `ELEVENLABS_VOICE_ID`, read once when the client is created.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        voice_id: str | None = None,
+        *,
+        base_url: str = _ELEVENLABS_BASE_URL,
+        session: requests.Session | None = None,
+        retry: RetryPolicy = DEFAULT_RETRY_POLICY,
+        pool_size: int = _DEFAULT_POOL_SIZE,
+    ) -> None:
+        if api_key is None or voice_id is None:
+            load_project_env()
+        self.api_key = api_key or get_elevenlabs_api_key()
+        self.voice_id = voice_id or get_elevenlabs_voice_id()
+        self.base_url = base_url.rstrip("/")
+        super().__init__(session, retry, pool_size)
+
+    def _post_audio(self, path: str, output_format: str, body: dict[str, Any], timeout: float) -> bytes:
+        response = self.session.post(
+            f"{self.base_url}/{path}",
+            headers={
+                "Content-Type": "application/json",
+                "xi-api-key": self.api_key,
+            },
+            params={"output_format": output_format},
+            json=body,
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return response.content
+
+    def _stream_audio(self, path: str, output_format: str, body: dict[str, Any], timeout: float) -> Iterator[bytes]:
+        with self.session.post(
+            f"{self.base_url}/{path}",
+            headers={
+                "Content-Type": "application/json",
+                "xi-api-key": self.api_key,
+            },
+            params={"output_format": output_format},
+            json=body,
+            timeout=timeout,
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            yield from response.iter_content(_STREAM_CHUNK_BYTES)
+
+    def text_to_speech(
+        self,
+        text: str,
+        *,
+        model_id: str,
+        output_format: str,
+        voice_id: str | None = None,
+        timeout: float = 60,
+    ) -> bytes:
+        """Return the encoded audio ElevenLabs synthesizes for `text`."""
+        return self._post_audio(
+            f"text-to-speech/{voice_id or self.voice_id}",
+            output_format,
+            {"text": text, "model_id": model_id},
+            timeout,
+        )
+
+    def text_to_speech_stream(
+        self,
+        text: str,
+        *,
+        model_id: str,
+        output_format: str,
+        voice_id: str | None = None,
+        timeout: float = 60,
+    ) -> Iterator[bytes]:
+        """Yield encoded audio chunks from the streaming endpoint as ElevenLabs synthesizes `text`."""
+        return self._stream_audio(
+            f"text-to-speech/{voice_id or self.voice_id}/stream",
+            output_format,
+            {"text": text, "model_id": model_id},
+            timeout,
+        )
+
+    def sound_generation(self, payload: dict[str, Any], *, output_format: str, timeout: float = 60) -> bytes:
+        """Return the encoded audio of a generated sound effect."""
+        return self._post_audio("sound-generation", output_format, payload, timeout)
+
+    def sound_generation_stream(
+        self,
+        payload: dict[str, Any],
+        *,
+        output_format: str,
+        timeout: float = 60,
+    ) -> Iterator[bytes]:
+        """Yield encoded audio chunks of a generated sound effect as they are downloaded."""
+        return self._stream_audio("sound-generation", output_format, payload, timeout)
+
+
+class IEmbraceClient(_ProviderClient):
+    """iEmbrace API client; `base_url` and `user_email` default to `API_BASE_URL` and `X_USER_EMAIL`."""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        user_email: str | None = None,
+        *,
+        session: requests.Session | None = None,
+        retry: RetryPolicy = DEFAULT_RETRY_POLICY,
+        pool_size: int = _DEFAULT_POOL_SIZE,
+    ) -> None:
+        if base_url is None or user_email is None:
+            load_project_env()
+        self.base_url = (base_url or get_api_base_url()).rstrip("/")
+        self.user_email = user_email or get_user_email()
+        super().__init__(session, retry, pool_size)
+
+    def post_json(self, path: str, body: dict[str, Any], *, timeout: float = 30) -> Any:
+        """POST `body` to `path` and return the decoded JSON response."""
+        response = self.session.post(
+            f"{self.base_url}/{path}",
+            headers={
+                "Content-Type": "application/json",
+                "X-User-Email": self.user_email,
+            },
+            json=body,
+            timeout=timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+@functools.cache
+def default_elevenlabs_client() -> ElevenLabsClient:
+    """Shared client for the module-level ElevenLabs functions, created on first use."""
+    return ElevenLabsClient()
+
+
+@functools.cache
+def default_iembrace_client() -> IEmbraceClient:
+    """Shared client for the module-level iEmbrace functions, created on first use."""
+    return IEmbraceClient()
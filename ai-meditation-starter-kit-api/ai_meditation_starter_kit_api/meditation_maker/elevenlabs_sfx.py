@@ -1,20 +1,20 @@
 from __future__ import annotations
 
-import subprocess
+import dataclasses
 from typing import TYPE_CHECKING, Any
 
-import requests
-
-from .config import get_elevenlabs_api_key, load_project_env
+from .audio_cache import sfx_cache_key
+from .clients import default_elevenlabs_client
+from .transcode import mp3_to_wav, pcm_to_wav, stream_mp3_to_pcm, wav_pcm
 from .types import SFXResult, coerce_sfx_request
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Iterator, Mapping
 
+    from .audio_cache import AudioCache
+    from .clients import ElevenLabsClient
     from .types import SFXRequest
 
-_ELEVENLABS_BASE_URL = "https://api.elevenlabs.io/v1"
-
 
 def _output_format_to_elevenlabs(value: str) -> str:
     mapping = {
@@ -35,70 +35,86 @@ def _output_format_to_mime_type(value: str) -> str:
     return mapping[value]
 
 
-def _mp3_to_wav(mp3_bytes: bytes) -> bytes:
-    """Convert MP3 bytes to WAV using ffmpeg."""
-    result = subprocess.run(
-        [
-            "ffmpeg",
-            "-y",
-            "-i",
-            "pipe:0",
-            "-ar",
-            "44100",
-            "-ac",
-            "1",
-            "-sample_fmt",
-            "s16",
-            "-f",
-            "wav",
-            "pipe:1",
-        ],
-        input=mp3_bytes,
-        capture_output=True,
-        check=False,
+def _to_output_format(audio_bytes: bytes, output_format: str) -> bytes:
+    if output_format == "wav":
+        return mp3_to_wav(audio_bytes)
+    return audio_bytes
+
+
+def _elevenlabs_sfx_result(request: SFXRequest, audio_bytes: bytes) -> SFXResult:
+    return SFXResult(
+        success=True,
+        provider="elevenlabs",
+        audioBytes=audio_bytes,
+        mimeType=_output_format_to_mime_type(request.outputFormat),
+        raw=None,
     )
-    if result.returncode != 0:
-        msg = f"ffmpeg MP3-to-WAV conversion failed: {result.stderr.decode()}"
-        raise RuntimeError(msg)
-    return result.stdout
 
 
 def generate_sfx_audio_elevenlabs(
     request: SFXRequest | Mapping[str, Any],
     *,
     timeout: int = 60,
+    client: ElevenLabsClient | None = None,
+    cache: AudioCache | None = None,
 ) -> SFXResult:
-    """Generate a meditation sound effect clip with ElevenLabs."""
-    load_project_env()
+    """Generate a meditation sound effect clip with ElevenLabs.
 
+    Requests go through `client`, or a shared pooled client configured from the environment.
+    With `cache`, a previously generated prompt is returned without calling the API.
+    """
     normalized_request = coerce_sfx_request(request)
-    api_key = get_elevenlabs_api_key()
-    output_format = _output_format_to_elevenlabs(normalized_request.outputFormat)
-
-    url = f"{_ELEVENLABS_BASE_URL}/sound-generation"
-    headers = {
-        "Content-Type": "application/json",
-        "xi-api-key": api_key,
-    }
-    params = {"output_format": output_format}
-
-    response = requests.post(
-        url,
-        headers=headers,
-        params=params,
-        json=normalized_request.as_payload(),
-        timeout=timeout,
-    )
-    response.raise_for_status()
-
-    audio_bytes = response.content
-    if normalized_request.outputFormat == "wav":
-        audio_bytes = _mp3_to_wav(audio_bytes)
-
-    return SFXResult(
-        success=True,
-        provider="elevenlabs",
-        audioBytes=audio_bytes,
-        mimeType=_output_format_to_mime_type(normalized_request.outputFormat),
-        raw=None,
+    client = client or default_elevenlabs_client()
+    cache_key = sfx_cache_key("elevenlabs", normalized_request)
+
+    audio_bytes = cache.get(cache_key) if cache is not None else None
+    if audio_bytes is None:
+        audio_bytes = client.sound_generation(
+            normalized_request.as_payload(),
+            output_format=_output_format_to_elevenlabs(normalized_request.outputFormat),
+            timeout=timeout,
+        )
+        audio_bytes = _to_output_format(audio_bytes, normalized_request.outputFormat)
+        if cache is not None:
+            cache.put(cache_key, audio_bytes)
+    return _elevenlabs_sfx_result(normalized_request, audio_bytes)
+
+
+def stream_sfx_audio_elevenlabs(
+    request: SFXRequest | Mapping[str, Any],
+    *,
+    timeout: int = 60,
+    client: ElevenLabsClient | None = None,
+    cache: AudioCache | None = None,
+) -> Iterator[bytes]:
+    """Yield 44.1 kHz mono 16-bit PCM of a sound effect while it downloads.
+
+    Cache entries are shared with `generate_sfx_audio_elevenlabs` for WAV
+    output; `request.outputFormat` is ignored.
+    """
+    normalized_request = dataclasses.replace(coerce_sfx_request(request), outputFormat="wav")
+    client = client or default_elevenlabs_client()
+    cache_key = sfx_cache_key("elevenlabs", normalized_request)
+
+    cached = cache.get(cache_key) if cache is not None else None
+    if cached is not None:
+        yield wav_pcm(cached)
+        return
+
+    pcm_chunks = stream_mp3_to_pcm(
+        client.sound_generation_stream(
+            normalized_request.as_payload(),
+            output_format=_output_format_to_elevenlabs(normalized_request.outputFormat),
+            timeout=timeout,
+        )
     )
+    if cache is None:
+        yield from pcm_chunks
+        return
+
+    # Only a cached clip is held in memory, to be stored once it is complete.
+    clip_pcm = bytearray()
+    for chunk in pcm_chunks:
+        clip_pcm += chunk
+        yield chunk
+    cache.put(cache_key, pcm_to_wav(bytes(clip_pcm)))
@@ -1,26 +1,36 @@
 from __future__ import annotations
 
+import dataclasses
+import functools
 import re
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
 
-import requests
-
-from .config import (
-    get_elevenlabs_api_key,
-    get_elevenlabs_voice_id,
-    load_project_env,
+from .audio_cache import tts_cache_key
+from .clients import default_elevenlabs_client
+from .transcode import (
+    SAMPLE_RATE,
+    SAMPLE_WIDTH,
+    mp3_to_wav,
+    pcm_to_wav,
+    silence_pcm,
+    stream_mp3_to_pcm,
+    wav_pcm,
 )
 from .types import TTSResult, coerce_tts_request
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Iterator, Mapping
 
+    from .audio_cache import AudioCache
+    from .clients import ElevenLabsClient
     from .types import TTSRequest
 
-_ELEVENLABS_BASE_URL = "https://api.elevenlabs.io/v1"
 _ELEVENLABS_MODEL_ID = "eleven_multilingual_v2"
 _PAUSE_PATTERN = re.compile(r"\[\s*(\d+(?:\.\d+)?)\s*s\s*\]")
+# ElevenLabs break tags support up to 3 seconds per tag; longer pauses are rendered as local silence.
+_MAX_BREAK_TAG_SECONDS = 3.0
+_MAX_PARALLEL_SPANS = 4
 
 
 def _output_format_to_elevenlabs(value: str) -> str:
@@ -42,42 +52,12 @@ def _output_format_to_mime_type(value: str) -> str:
     return mapping[value]
 
 
-def _mp3_to_wav(mp3_bytes: bytes) -> bytes:
-    """Convert MP3 bytes to WAV using ffmpeg."""
-    result = subprocess.run(
-        [
-            "ffmpeg",
-            "-y",
-            "-i",
-            "pipe:0",
-            "-ar",
-            "44100",
-            "-ac",
-            "1",
-            "-sample_fmt",
-            "s16",
-            "-f",
-            "wav",
-            "pipe:1",
-        ],
-        check=False,
-        input=mp3_bytes,
-        capture_output=True,
-    )
-    if result.returncode != 0:
-        msg = f"ffmpeg MP3-to-WAV conversion failed: {result.stderr.decode()}"
-        raise RuntimeError(msg)
-    return result.stdout
-
-
 def _pause_seconds_to_break_tags(seconds: float) -> str:
-    # ElevenLabs break tags support up to 3 seconds per tag.
-    max_chunk_seconds = 3.0
     remaining = max(seconds, 0.0)
     chunks: list[str] = []
 
     while remaining > 0:
-        chunk = min(remaining, max_chunk_seconds)
+        chunk = min(remaining, _MAX_BREAK_TAG_SECONDS)
         chunks.append(f'<break time="{chunk:g}s" />')
         remaining -= chunk
 
@@ -92,54 +72,187 @@ def _convert_iembrace_pause_tokens(text: str) -> str:
     return _PAUSE_PATTERN.sub(_replace, text)
 
 
+def _split_long_pauses(request: TTSRequest) -> list[str | float]:
+    """Split `request.text` into speech spans and the seconds of silence between them.
+
+    Pauses longer than one break tag are cut out so the provider never renders
+    them. Only WAV output can be stitched locally, so other formats keep every
+    pause as break tags.
+    """
+    if request.outputFormat != "wav":
+        return [request.text]
+
+    parts: list[str | float] = []
+    position = 0
+    for match in _PAUSE_PATTERN.finditer(request.text):
+        seconds = float(match.group(1))
+        if seconds <= _MAX_BREAK_TAG_SECONDS:
+            continue
+        parts.extend((request.text[position : match.start()], seconds))
+        position = match.end()
+    parts.append(request.text[position:])
+    return [part for part in parts if not isinstance(part, str) or part.strip()]
+
+
+def _join_speech_parts(parts: list[str | float], clips: list[bytes]) -> bytes:
+    """Interleave synthesized WAV `clips` with silence for the pauses in `parts`."""
+    if len(parts) == 1 and clips:
+        return clips[0]
+
+    remaining_clips = iter(clips)
+    pcm = bytearray()
+    for part in parts:
+        if isinstance(part, str):
+            pcm += wav_pcm(next(remaining_clips))
+        else:
+            pcm += bytes(SAMPLE_WIDTH * round(part * SAMPLE_RATE))
+    return pcm_to_wav(bytes(pcm))
+
+
+def _to_output_format(audio_bytes: bytes, output_format: str) -> bytes:
+    if output_format == "wav":
+        return mp3_to_wav(audio_bytes)
+    return audio_bytes
+
+
+def _elevenlabs_tts_cache_key(request: TTSRequest, text: str, voice_id: str) -> str:
+    return tts_cache_key("elevenlabs", voice_id, _ELEVENLABS_MODEL_ID, text, request.languageCode, request.outputFormat)
+
+
+def _synthesize_span(
+    span: str,
+    client: ElevenLabsClient,
+    request: TTSRequest,
+    voice_id: str,
+    timeout: int,
+    cache: AudioCache | None,
+) -> bytes:
+    text = _convert_iembrace_pause_tokens(span)
+    cache_key = _elevenlabs_tts_cache_key(request, text, voice_id)
+
+    audio_bytes = cache.get(cache_key) if cache is not None else None
+    if audio_bytes is None:
+        audio_bytes = client.text_to_speech(
+            text,
+            model_id=_ELEVENLABS_MODEL_ID,
+            output_format=_output_format_to_elevenlabs(request.outputFormat),
+            voice_id=voice_id,
+            timeout=timeout,
+        )
+        audio_bytes = _to_output_format(audio_bytes, request.outputFormat)
+        if cache is not None:
+            cache.put(cache_key, audio_bytes)
+    return audio_bytes
+
+
+def _elevenlabs_tts_result(request: TTSRequest, audio_bytes: bytes, voice_id: str) -> TTSResult:
+    return TTSResult(
+        success=True,
+        provider="elevenlabs",
+        audioUrl=None,
+        audioBytes=audio_bytes,
+        mimeType=_output_format_to_mime_type(request.outputFormat),
+        voiceId=voice_id,
+        raw=None,
+    )
+
+
 def generate_tts_audio_elevenlabs(
     request: TTSRequest | Mapping[str, Any],
     *,
     timeout: int = 60,
     voice_id: str | None = None,
+    client: ElevenLabsClient | None = None,
+    cache: AudioCache | None = None,
 ) -> TTSResult:
     """Generate meditation TTS with ElevenLabs from the same request shape as iEmbrace.
 
     Pause tokens like ``[2s]`` and ``[30s]`` in `request.text` are converted to
-    ElevenLabs-compatible break tags before synthesis.
+    ElevenLabs-compatible break tags before synthesis. For WAV output, pauses
+    longer than one break tag are instead rendered as local silence, and the
+    speech between them is synthesized in parallel. Requests go through
+    `client`, or a shared pooled client configured from the environment. With
+    `cache`, previously synthesized speech is returned without calling the API.
     """
-    load_project_env()
-
     normalized_request = coerce_tts_request(request)
-    chosen_voice_id = voice_id or get_elevenlabs_voice_id()
-    api_key = get_elevenlabs_api_key()
-    output_format = _output_format_to_elevenlabs(normalized_request.outputFormat)
-
-    url = f"{_ELEVENLABS_BASE_URL}/text-to-speech/{chosen_voice_id}"
-    headers = {
-        "Content-Type": "application/json",
-        "xi-api-key": api_key,
-    }
-    params = {"output_format": output_format}
-    body = {
-        "text": _convert_iembrace_pause_tokens(normalized_request.text),
-        "model_id": _ELEVENLABS_MODEL_ID,
-    }
+    client = client or default_elevenlabs_client()
+    chosen_voice_id = voice_id or client.voice_id
+    parts = _split_long_pauses(normalized_request)
+    spans = [part for part in parts if isinstance(part, str)]
 
-    response = requests.post(
-        url,
-        headers=headers,
-        params=params,
-        json=body,
-        timeout=timeout,
-    )
-    response.raise_for_status()
+    with ThreadPoolExecutor(max_workers=min(len(spans), _MAX_PARALLEL_SPANS) or 1) as executor:
+        synthesize = functools.partial(
+            _synthesize_span,
+            client=client,
+            request=normalized_request,
+            voice_id=chosen_voice_id,
+            timeout=timeout,
+            cache=cache,
+        )
+        clips = list(executor.map(synthesize, spans))
+    return _elevenlabs_tts_result(normalized_request, _join_speech_parts(parts, clips), chosen_voice_id)
 
-    audio_bytes = response.content
-    if normalized_request.outputFormat == "wav":
-        audio_bytes = _mp3_to_wav(audio_bytes)
 
-    return TTSResult(
-        success=True,
-        provider="elevenlabs",
-        audioUrl=None,
-        audioBytes=audio_bytes,
-        mimeType=_output_format_to_mime_type(normalized_request.outputFormat),
-        voiceId=chosen_voice_id,
-        raw=None,
+def _stream_span(
+    span: str,
+    client: ElevenLabsClient,
+    request: TTSRequest,
+    voice_id: str,
+    timeout: int,
+    cache: AudioCache | None,
+) -> Iterator[bytes]:
+    text = _convert_iembrace_pause_tokens(span)
+    cache_key = _elevenlabs_tts_cache_key(request, text, voice_id)
+
+    cached = cache.get(cache_key) if cache is not None else None
+    if cached is not None:
+        yield wav_pcm(cached)
+        return
+
+    pcm_chunks = stream_mp3_to_pcm(
+        client.text_to_speech_stream(
+            text,
+            model_id=_ELEVENLABS_MODEL_ID,
+            output_format=_output_format_to_elevenlabs(request.outputFormat),
+            voice_id=voice_id,
+            timeout=timeout,
+        )
     )
+    if cache is None:
+        yield from pcm_chunks
+        return
+
+    # Only a cached span is held in memory, to be stored once it is complete.
+    span_pcm = bytearray()
+    for chunk in pcm_chunks:
+        span_pcm += chunk
+        yield chunk
+    cache.put(cache_key, pcm_to_wav(bytes(span_pcm)))
+
+
+def stream_tts_audio_elevenlabs(
+    request: TTSRequest | Mapping[str, Any],
+    *,
+    timeout: int = 60,
+    voice_id: str | None = None,
+    client: ElevenLabsClient | None = None,
+    cache: AudioCache | None = None,
+) -> Iterator[bytes]:
+    """Yield 44.1 kHz mono 16-bit PCM while ElevenLabs is still synthesizing `request`.
+
+    Speech comes from the streaming endpoint and is decoded as it downloads,
+    so memory stays flat however long the script is. Long pauses become local
+    silence as in `generate_tts_audio_elevenlabs` with WAV output, whose cache
+    entries are shared; `request.outputFormat` is ignored. Write the chunks
+    with `write_wav_stream`, or pass them to `IncrementalAhapGenerator.push`
+    (as ``np.frombuffer(chunk, "<i2")``) to build haptics during synthesis.
+    """
+    normalized_request = dataclasses.replace(coerce_tts_request(request), outputFormat="wav")
+    client = client or default_elevenlabs_client()
+    chosen_voice_id = voice_id or client.voice_id
+
+    for part in _split_long_pauses(normalized_request):
+        if isinstance(part, str):
+            yield from _stream_span(part, client, normalized_request, chosen_voice_id, timeout, cache)
+        else:
+            yield from silence_pcm(part)
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Mapping
+from typing import TYPE_CHECKING, Any, Mapping
 
-import requests
-
-from .config import get_api_base_url, get_user_email, load_project_env
+from .clients import default_iembrace_client
 from .types import TTSRequest, TTSResult, coerce_tts_request
 
+if TYPE_CHECKING:
+    from .clients import IEmbraceClient
+
 
 def _unwrap_lambda_payload(payload: Any) -> Any:
     if (
@@ -29,34 +30,8 @@ def _unwrap_lambda_payload(payload: Any) -> Any:
     return payload
 
 
-def generate_personalized_meditation(
-    mood: str,
-    goal: str,
-    message_to_loved_one: str,
-    *,
-    timeout: int = 30,
-) -> str:
-    """Generate a personalized meditation script from the iEmbrace API."""
-    load_project_env()
-
-    base_url = get_api_base_url()
-    user_email = get_user_email()
-
-    url = f"{base_url}/personalization"
-    headers = {
-        "Content-Type": "application/json",
-        "X-User-Email": user_email,
-    }
-    body = {
-        "mood": mood,
-        "goal": goal,
-        "message_to_loved_one": message_to_loved_one,
-    }
-
-    response = requests.post(url, headers=headers, json=body, timeout=timeout)
-    response.raise_for_status()
-
-    payload = _unwrap_lambda_payload(response.json())
+def _personalized_script(response_payload: Any) -> str:
+    payload = _unwrap_lambda_payload(response_payload)
     if not isinstance(payload, dict):
         raise RuntimeError(f"Unexpected response payload type: {type(payload)}")
 
@@ -67,33 +42,8 @@ def generate_personalized_meditation(
     return str(script)
 
 
-def generate_tts_audio_iembrace(
-    request: TTSRequest | Mapping[str, Any],
-    *,
-    timeout: int = 60,
-) -> TTSResult:
-    """Generate meditation TTS through iEmbrace using the shared `TTSRequest` shape."""
-    load_project_env()
-
-    normalized_request = coerce_tts_request(request)
-    base_url = get_api_base_url()
-    user_email = get_user_email()
-
-    url = f"{base_url}/personalization/tts_service"
-    headers = {
-        "Content-Type": "application/json",
-        "X-User-Email": user_email,
-    }
-
-    response = requests.post(
-        url,
-        headers=headers,
-        json=normalized_request.as_payload(),
-        timeout=timeout,
-    )
-    response.raise_for_status()
-
-    payload = _unwrap_lambda_payload(response.json())
+def _iembrace_tts_result(request: TTSRequest, response_payload: Any) -> TTSResult:
+    payload = _unwrap_lambda_payload(response_payload)
     if not isinstance(payload, dict):
         raise RuntimeError(f"Unexpected response payload type: {type(payload)}")
 
@@ -112,7 +62,7 @@ def generate_tts_audio_iembrace(
         "wav": "audio/wav",
         "mp3": "audio/mpeg",
         "ogg": "audio/ogg",
-    }[normalized_request.outputFormat]
+    }[request.outputFormat]
 
     return TTSResult(
         success=True,
@@ -123,3 +73,38 @@ def generate_tts_audio_iembrace(
         voiceId=None,
         raw=payload,
     )
+
+
+def generate_personalized_meditation(
+    mood: str,
+    goal: str,
+    message_to_loved_one: str,
+    *,
+    timeout: int = 30,
+    client: IEmbraceClient | None = None,
+) -> str:
+    """Generate a personalized meditation script from the iEmbrace API."""
+    client = client or default_iembrace_client()
+    body = {
+        "mood": mood,
+        "goal": goal,
+        "message_to_loved_one": message_to_loved_one,
+    }
+
+    return _personalized_script(client.post_json("personalization", body, timeout=timeout))
+
+
+def generate_tts_audio_iembrace(
+    request: TTSRequest | Mapping[str, Any],
+    *,
+    timeout: int = 60,
+    client: IEmbraceClient | None = None,
+) -> TTSResult:
+    """Generate meditation TTS through iEmbrace using the shared `TTSRequest` shape."""
+    normalized_request = coerce_tts_request(request)
+    client = client or default_iembrace_client()
+
+    return _iembrace_tts_result(
+        normalized_request,
+        client.post_json("personalization/tts_service", normalized_request.as_payload(), timeout=timeout),
+    )
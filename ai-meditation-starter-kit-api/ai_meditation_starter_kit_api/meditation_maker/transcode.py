@@ -0,0 +1,291 @@
+"""MP3 to 44.1 kHz mono 16-bit PCM/WAV, shared by the ElevenLabs providers.
+
+Whole clips are decoded in-process with libsndfile (through `soundfile`) when
+it was built with MP3 support, which avoids starting a process per clip.
+Otherwise, and for streamed input, clips go through `FfmpegPool`, which keeps
+ffmpeg processes started ahead of time so a clip never waits for one to start.
+
+libsndfile seeks around the whole file while decoding MP3, so in-process
+streaming spools the input (in memory, then on disk) and decodes it once the
+input ends, yielding PCM in blocks. ffmpeg decodes as the input arrives.
+
+Example::
+
+    wav_bytes = mp3_to_wav(mp3_bytes)
+    for pcm in stream_mp3_to_pcm(response.iter_bytes()):
+        ...
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import io
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import wave
+from collections.abc import Iterable, Iterator
+from typing import IO, TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SAMPLE_RATE = 44100
+SAMPLE_WIDTH = 2
+_PCM_BLOCK_BYTES = 64 * 1024
+# Decode in large blocks to keep per-block overhead low: about 6 s of audio, 1 MB as float32.
+_DECODE_BLOCK_FRAMES = 1 << 18
+# Streamed input stays in memory up to this size before spooling to disk.
+_MAX_SPOOL_MEMORY_BYTES = 8 * 1024 * 1024
+_DEFAULT_POOL_SIZE = 2
+_FFMPEG_MP3_TO_PCM = [
+    "ffmpeg",
+    "-loglevel",
+    "error",
+    "-f",
+    "mp3",
+    "-i",
+    "pipe:0",
+    "-ar",
+    str(SAMPLE_RATE),
+    "-ac",
+    "1",
+    "-f",
+    "s16le",
+    "pipe:1",
+]
+
+
+def pcm_to_wav(pcm: bytes) -> bytes:
+    """Wrap 44.1 kHz mono 16-bit PCM in a WAV header."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(SAMPLE_WIDTH)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def write_wav_stream(pcm_chunks: Iterable[bytes], path: str | os.PathLike[str]) -> int:
+    """Append 44.1 kHz mono 16-bit PCM chunks to a WAV file as they arrive; return the frame count.
+
+    The header is completed when the stream ends, so readers that trust it
+    should wait for the call to return.
+    """
+    with wave.open(os.fspath(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(SAMPLE_WIDTH)
+        wf.setframerate(SAMPLE_RATE)
+        for chunk in pcm_chunks:
+            wf.writeframesraw(chunk)
+        return wf.tell()
+
+
+def silence_pcm(seconds: float) -> Iterator[bytes]:
+    """Yield `seconds` of 44.1 kHz mono 16-bit silence in blocks."""
+    remaining = SAMPLE_WIDTH * round(seconds * SAMPLE_RATE)
+    while remaining > 0:
+        block = min(remaining, _PCM_BLOCK_BYTES)
+        yield bytes(block)
+        remaining -= block
+
+
+def wav_pcm(wav_bytes: bytes) -> bytes:
+    """Return the sample data of a WAV file."""
+    # WAVs written to a pipe carry placeholder chunk sizes, so the data chunk runs to the end.
+    position = 12
+    while position + 8 <= len(wav_bytes):
+        chunk_id = wav_bytes[position : position + 4]
+        if chunk_id == b"data":
+            return wav_bytes[position + 8 :]
+        size = int.from_bytes(wav_bytes[position + 4 : position + 8], "little")
+        position += 8 + size + (size & 1)
+    msg = "WAV audio has no data chunk."
+    raise RuntimeError(msg)
+
+
+@functools.cache
+def soundfile_decodes_mp3() -> bool:
+    """Whether the installed libsndfile can decode MP3 (1.1 and later)."""
+    try:
+        import soundfile
+    except (ImportError, OSError):
+        return False
+    return "MP3" in soundfile.available_formats()
+
+
+def _to_pcm16(samples: np.ndarray) -> bytes:
+    import numpy as np
+
+    # Same scaling and clipping as ffmpeg's float to s16 conversion.
+    return np.clip(np.rint(samples * 32768.0), -32768, 32767).astype("<i2").tobytes()
+
+
+def _decode_blocks(source: IO[bytes]) -> Iterator[bytes]:
+    import numpy as np
+    import soundfile
+
+    try:
+        with soundfile.SoundFile(source) as sf:
+            resampler = None
+            if sf.samplerate != SAMPLE_RATE:
+                import soxr
+
+                resampler = soxr.ResampleStream(sf.samplerate, SAMPLE_RATE, 1, dtype="float32")
+            for block in sf.blocks(blocksize=_DECODE_BLOCK_FRAMES, dtype="float32", always_2d=True):
+                samples = block.mean(axis=1)
+                if resampler is not None:
+                    samples = resampler.resample_chunk(samples)
+                yield _to_pcm16(samples)
+            if resampler is not None:
+                yield _to_pcm16(resampler.resample_chunk(np.zeros(0, np.float32), last=True))
+    except soundfile.LibsndfileError as exc:
+        msg = f"MP3 decoding failed: {exc}"
+        raise RuntimeError(msg) from exc
+
+
+class FfmpegPool:
+    """ffmpeg MP3-to-PCM processes started ahead of time, `size` at a time.
+
+    An ffmpeg process decodes a single input, so each clip takes a waiting
+    process and starts its replacement; ffmpeg's own start-up then overlaps the
+    clip instead of delaying it. At most `size` processes wait for input, however
+    many threads take from the pool at once.
+    """
+
+    def __init__(self, size: int = _DEFAULT_POOL_SIZE, command: list[str] | None = None) -> None:
+        self.command = command or _FFMPEG_MP3_TO_PCM
+        self.size = size
+        self._ready: queue.Queue[subprocess.Popen[bytes]] = queue.Queue()
+        # Serializes taking and refilling, so concurrent callers cannot each top the pool up.
+        self._lock = threading.Lock()
+
+    def _spawn(self) -> subprocess.Popen[bytes]:
+        return subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def _take(self) -> subprocess.Popen[bytes]:
+        with self._lock:
+            try:
+                process = self._ready.get_nowait()
+            except queue.Empty:
+                process = self._spawn()
+            while self._ready.qsize() < self.size:
+                self._ready.put(self._spawn())
+        return process
+
+    @staticmethod
+    def _check(process: subprocess.Popen[bytes], stderr: bytes) -> None:
+        if process.returncode != 0:
+            msg = f"ffmpeg MP3-to-WAV conversion failed: {stderr.decode(errors='replace')}"
+            raise RuntimeError(msg)
+
+    def transcode(self, mp3_bytes: bytes) -> bytes:
+        """Return the PCM of a whole MP3 clip."""
+        process = self._take()
+        pcm, stderr = process.communicate(mp3_bytes)
+        self._check(process, stderr)
+        return pcm
+
+    def stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Yield PCM while `chunks` are still being fed to ffmpeg from a helper thread."""
+        process = self._take()
+        stdin, stdout, stderr = process.stdin, process.stdout, process.stderr
+        assert stdin is not None and stdout is not None and stderr is not None
+        feed_errors: list[BaseException] = []
+
+        def _feed() -> None:
+            try:
+                for chunk in chunks:
+                    stdin.write(chunk)
+            except BrokenPipeError:
+                pass
+            except BaseException as exc:  # noqa: BLE001 - re-raised in the consuming thread.
+                feed_errors.append(exc)
+            finally:
+                try:
+                    stdin.close()
+                except BrokenPipeError:
+                    pass
+
+        feeder = threading.Thread(target=_feed, daemon=True)
+        feeder.start()
+        try:
+            carry = b""
+            while block := stdout.read1(_PCM_BLOCK_BYTES):
+                block = carry + block
+                # Only hand out whole samples.
+                aligned = len(block) - len(block) % SAMPLE_WIDTH
+                carry = block[aligned:]
+                if aligned:
+                    yield block[:aligned]
+            feeder.join()
+            process.wait()
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        if feed_errors:
+            raise feed_errors[0]
+        self._check(process, stderr.read())
+
+    def close(self) -> None:
+        """Stop the processes still waiting for input."""
+        with self._lock:
+            while True:
+                try:
+                    process = self._ready.get_nowait()
+                except queue.Empty:
+                    return
+                process.kill()
+                process.wait()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+@functools.cache
+def default_ffmpeg_pool() -> FfmpegPool:
+    """Shared pool, created on first use when in-process decoding is unavailable; closed at exit."""
+    if shutil.which("ffmpeg") is None:
+        msg = "MP3 decoding requires libsndfile 1.1+ (soundfile) or ffmpeg on PATH."
+        raise RuntimeError(msg)
+    pool = FfmpegPool()
+    atexit.register(pool.close)
+    return pool
+
+
+def mp3_to_pcm(mp3_bytes: bytes) -> bytes:
+    """Decode a whole MP3 clip to 44.1 kHz mono 16-bit PCM."""
+    if soundfile_decodes_mp3():
+        return b"".join(_decode_blocks(io.BytesIO(mp3_bytes)))
+    return default_ffmpeg_pool().transcode(mp3_bytes)
+
+
+def mp3_to_wav(mp3_bytes: bytes) -> bytes:
+    """Convert MP3 bytes to a 44.1 kHz mono 16-bit WAV."""
+    return pcm_to_wav(mp3_to_pcm(mp3_bytes))
+
+
+def stream_mp3_to_pcm(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Yield 44.1 kHz mono 16-bit PCM blocks for MP3 arriving in `chunks`.
+
+    ffmpeg is preferred when it is on PATH because it emits PCM before the
+    input ends; in-process decoding starts once the whole input is spooled.
+    """
+    if shutil.which("ffmpeg") is not None or not soundfile_decodes_mp3():
+        yield from default_ffmpeg_pool().stream(chunks)
+        return
+
+    with tempfile.SpooledTemporaryFile(max_size=_MAX_SPOOL_MEMORY_BYTES) as spool:
+        for chunk in chunks:
+            spool.write(chunk)
+        spool.seek(0)
+        yield from _decode_blocks(spool)
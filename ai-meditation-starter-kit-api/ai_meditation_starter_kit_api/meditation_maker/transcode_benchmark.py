@@ -0,0 +1,160 @@
+"""Benchmark MP3-to-WAV transcoding throughput in clips per second.
+
+Compares the original approach of one fresh ffmpeg subprocess per clip with
+the warm `FfmpegPool` and with in-process libsndfile decoding, on synthetic
+speech-like MP3 clips. Clips are transcoded from `--threads` threads at once,
+as the span synthesis in `generate_tts_audio_elevenlabs` does. ffmpeg cases
+are skipped when ffmpeg is not on PATH.
+
+Example::
+
+    python -m ai_meditation_starter_kit_api.meditation_maker.transcode_benchmark --durations 2 10 --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+import soundfile as sf
+
+from .transcode import SAMPLE_RATE, FfmpegPool, _decode_blocks, soundfile_decodes_mp3
+
+_DEFAULT_DURATIONS = [2.0, 10.0, 60.0]
+_DEFAULT_CLIPS = 20
+# The per-clip ffmpeg invocation `_mp3_to_wav` used before the shared transcoder.
+_SUBPROCESS_COMMAND = [
+    "ffmpeg",
+    "-y",
+    "-i",
+    "pipe:0",
+    "-ar",
+    "44100",
+    "-ac",
+    "1",
+    "-sample_fmt",
+    "s16",
+    "-f",
+    "wav",
+    "pipe:1",
+]
+
+
+def synthetic_mp3(duration: float, seed: int = 0) -> bytes:
+    """Encode a speech-like signal (a pitch-varying buzz with syllable gating) as MP3."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    voice = np.sin(2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE) + 0.3 * rng.normal(size=t.size)
+    syllables = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t) > 0.3
+    buffer = io.BytesIO()
+    sf.write(buffer, (0.2 * voice * syllables).astype(np.float32), SAMPLE_RATE, format="MP3")
+    return buffer.getvalue()
+
+
+def _subprocess_transcode(mp3_bytes: bytes) -> bytes:
+    result = subprocess.run(_SUBPROCESS_COMMAND, input=mp3_bytes, capture_output=True, check=True)
+    return result.stdout
+
+
+def _in_process_transcode(mp3_bytes: bytes) -> bytes:
+    return b"".join(_decode_blocks(io.BytesIO(mp3_bytes)))
+
+
+def _time_case(transcode: Callable[[bytes], bytes], clip: bytes, clips: int, threads: int) -> float:
+    # One untimed clip so lazy imports and the pool's first processes do not count.
+    transcode(clip)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(transcode, [clip] * clips))
+    return time.perf_counter() - started
+
+
+def run_benchmark(durations: list[float], clips: int, threads: int, pool_size: int) -> dict[str, Any]:
+    methods: dict[str, Callable[[bytes], bytes]] = {}
+    has_ffmpeg = shutil.which("ffmpeg") is not None
+    if has_ffmpeg:
+        methods["subprocess"] = _subprocess_transcode
+    else:
+        print("ffmpeg not on PATH — skipping the subprocess and ffmpeg-pool cases.")
+
+    cases: list[dict[str, Any]] = []
+    with FfmpegPool(size=pool_size) as pool:
+        if has_ffmpeg:
+            methods["ffmpeg-pool"] = pool.transcode
+        methods["in-process"] = _in_process_transcode
+
+        for duration in durations:
+            clip = synthetic_mp3(duration)
+            for method, transcode in methods.items():
+                wall_seconds = _time_case(transcode, clip, clips, threads)
+                cases.append(
+                    {
+                        "method": method,
+                        "clip_seconds": duration,
+                        "clips": clips,
+                        "wall_seconds": wall_seconds,
+                        "clips_per_second": clips / wall_seconds,
+                        "audio_seconds_per_second": clips * duration / wall_seconds,
+                    }
+                )
+                _print_case(cases[-1])
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "libsndfile": sf.__libsndfile_version__,
+            "ffmpeg": shutil.which("ffmpeg"),
+        },
+        "settings": {"clips": clips, "threads": threads, "pool_size": pool_size},
+        "cases": cases,
+    }
+
+
+def _print_case(case: dict[str, Any]) -> None:
+    print(
+        f"{case['method']:<12} {case['clip_seconds']:>6.1f}s clips {case['clips_per_second']:>8.1f} clips/s "
+        f"{case['audio_seconds_per_second']:>8.0f}x real time"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MP3-to-WAV transcoding.")
+    parser.add_argument(
+        "--durations",
+        type=float,
+        nargs="*",
+        default=_DEFAULT_DURATIONS,
+        help="Clip durations in seconds.",
+    )
+    parser.add_argument("--clips", type=int, default=_DEFAULT_CLIPS, help="Clips transcoded per case.")
+    parser.add_argument("--threads", type=int, default=4, help="Clips transcoded concurrently.")
+    parser.add_argument("--pool-size", type=int, default=4, help="Warm ffmpeg processes kept by the pool.")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this path.")
+    args = parser.parse_args()
+
+    if not soundfile_decodes_mp3():
+        parser.error("Encoding the benchmark clips requires libsndfile 1.1+ with MP3 support.")
+
+    results = run_benchmark(args.durations, args.clips, args.threads, args.pool_size)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
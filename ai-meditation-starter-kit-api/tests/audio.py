@@ -0,0 +1,33 @@
+"""Synthetic audio shared by the tests."""
+
+from __future__ import annotations
+
+import wave
+from pathlib import Path
+
+import numpy as np
+
+SAMPLE_RATE = 44100
+
+
+def write_wav(path: Path, samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> Path:
+    """Write float samples in [-1, 1] as a mono 16-bit WAV."""
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(np.clip(np.rint(samples * 32767), -32768, 32767).astype("<i2").tobytes())
+    return path
+
+
+def meditation_like_signal(seconds: float, seed: int = 0) -> np.ndarray:
+    """A swelling low hum with bell-like strikes, which yields both onset and background events."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    hum = 0.3 * np.sin(2 * np.pi * 80 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 0.2 * t))
+    strikes = np.zeros_like(t)
+    for start in np.arange(0.25, seconds - 0.5, 0.7):
+        offset = t[t >= start][:SAMPLE_RATE // 2] - start
+        index = int(start * SAMPLE_RATE)
+        strikes[index : index + offset.size] += 0.6 * np.sin(2 * np.pi * 880 * offset) * np.exp(-12 * offset)
+    return hum + strikes + 0.01 * rng.normal(size=t.size)
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from .audio import meditation_like_signal, write_wav
+
+
+@pytest.fixture
+def meditation_wav(tmp_path: Path) -> Path:
+    return write_wav(tmp_path / "meditation.wav", meditation_like_signal(8.0))
+
+
+@pytest.fixture
+def silent_wav(tmp_path: Path) -> Path:
+    return write_wav(tmp_path / "silent.wav", np.zeros(0))
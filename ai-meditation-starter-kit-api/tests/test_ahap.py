@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ai_meditation_starter_kit_api.meditation_maker.ahap import (
+    Decomposition,
+    _decompose_audio_reference,
+    convert_wav_to_ahap,
+    decompose_audio,
+)
+from ai_meditation_starter_kit_api.meditation_maker.ahap_instrumentation import StageTimings
+
+from .audio import SAMPLE_RATE, meditation_like_signal
+
+
+def test_all_splits_share_one_analysis(meditation_wav, tmp_path):
+    timings = StageTimings()
+    outputs = convert_wav_to_ahap(str(meditation_wav), str(tmp_path / "all"), "sfx", "all", instrumentation=timings)
+
+    assert [Path(path).name for path in outputs] == [
+        f"meditation_{split}.ahap" for split in ("bass", "vocals", "drums", "other")
+    ]
+    # HPSS ran over the track once, not once per split.
+    assert timings.items["hpss"] == 8 * SAMPLE_RATE
+    for output in outputs:
+        split = Path(output).stem.rsplit("_", 1)[1]
+        (single,) = convert_wav_to_ahap(str(meditation_wav), str(tmp_path / split), "sfx", split)
+        assert Path(single).read_text() == Path(output).read_text()
+
+
+def test_empty_audio_gives_an_empty_pattern(silent_wav, tmp_path):
+    (output,) = convert_wav_to_ahap(str(silent_wav), str(tmp_path), "sfx", "none", continuous_tolerance=0.05)
+
+    assert json.loads(Path(output).read_text())["Pattern"] == []
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_decompose_audio_matches_two_librosa_hpss_passes(dtype):
+    audio = meditation_like_signal(3.0).astype(dtype)
+
+    fast = decompose_audio(audio)
+    reference = _decompose_audio_reference(audio)
+
+    for name in Decomposition._fields:
+        track, expected = getattr(fast, name), getattr(reference, name)
+        assert track.dtype == expected.dtype == dtype
+        assert track.shape == audio.shape
+        np.testing.assert_array_equal(track, expected)
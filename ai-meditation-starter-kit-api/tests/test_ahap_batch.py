@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from ai_meditation_starter_kit_api.meditation_maker.ahap_batch import BatchProgress, convert_batch_to_ahap
+from ai_meditation_starter_kit_api.meditation_maker.ahap_cache import AhapCache
+
+from .audio import meditation_like_signal, write_wav
+
+
+def test_batch_reports_progress_and_isolates_failures(tmp_path, capsys):
+    sources = tmp_path / "audio"
+    sources.mkdir()
+    for index in range(2):
+        write_wav(sources / f"clip-{index}.wav", meditation_like_signal(2.0, seed=index))
+    (sources / "broken.wav").write_bytes(b"not audio")
+    reports: list[BatchProgress] = []
+
+    result = convert_batch_to_ahap([str(sources)], str(tmp_path / "haptics"), workers=1, progress=reports.append)
+
+    assert sorted(result.converted) == [str(sources / "clip-0.wav"), str(sources / "clip-1.wav")]
+    # Throughput counts only the audio that converted.
+    assert result.audio_seconds == 4.0
+    assert list(result.failed) == [str(sources / "broken.wav")]
+    assert sorted(report.done for report in reports) == [1, 2, 3]
+    assert {report.path: report.error for report in reports}[str(sources / "broken.wav")]
+    assert sorted(path.name for path in (tmp_path / "haptics").iterdir()) == ["clip-0.ahap", "clip-1.ahap"]
+    # The library leaves printing to the CLI.
+    assert capsys.readouterr().out == ""
+
+
+def test_batch_skips_up_to_date_outputs(tmp_path):
+    wav = write_wav(tmp_path / "clip.wav", meditation_like_signal(2.0))
+    convert_batch_to_ahap([str(wav)], None, workers=1)
+
+    result = convert_batch_to_ahap([str(wav)], None, workers=1)
+
+    assert result.skipped == [str(wav)]
+    assert result.converted == []
+
+
+def test_batch_counts_audio_of_cached_conversions(tmp_path):
+    wav = write_wav(tmp_path / "clip.wav", meditation_like_signal(1.5))
+    cache = AhapCache(tmp_path / "cache")
+    convert_batch_to_ahap([str(wav)], str(tmp_path / "first"), workers=1, cache=cache)
+
+    result = convert_batch_to_ahap([str(wav)], str(tmp_path / "second"), workers=1, cache=cache)
+
+    assert result.converted == [str(wav)]
+    assert result.audio_seconds == 1.5
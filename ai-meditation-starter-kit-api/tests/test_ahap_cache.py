@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ai_meditation_starter_kit_api.meditation_maker import ahap_cache
+from ai_meditation_starter_kit_api.meditation_maker.ahap import PRETTY_AHAP_FORMAT, convert_wav_to_ahap
+from ai_meditation_starter_kit_api.meditation_maker.ahap_cache import AhapCache
+from ai_meditation_starter_kit_api.meditation_maker.ahap_instrumentation import StageTimings
+
+
+def _key(audio: np.ndarray, **overrides) -> str:
+    params = {
+        "mode": "sfx",
+        "split": "none",
+        "sample_rate": 44100,
+        "sharpness_factor": 3.0,
+        "intensity_factor": 2.5,
+        "output_format": PRETTY_AHAP_FORMAT,
+        **overrides,
+    }
+    return AhapCache.make_key(audio, **params)
+
+
+def test_keys_cover_audio_parameters_and_version(monkeypatch):
+    audio = np.linspace(-1, 1, 1000, dtype=np.float32)
+    key = _key(audio)
+
+    assert _key(audio.copy()) == key
+    assert _key(audio[::-1].copy()) != key
+    assert _key(audio.astype(np.float64)) != key
+    assert _key(audio, continuous_tolerance=0.02) != key
+    assert _key(audio, events_per_second=6.0) != key
+
+    monkeypatch.setattr(ahap_cache, "_AHAP_CACHE_VERSION", ahap_cache._AHAP_CACHE_VERSION + 1)
+    assert _key(audio) != key
+
+
+def test_cached_conversion_skips_analysis_and_matches(meditation_wav, tmp_path):
+    cache = AhapCache(tmp_path / "cache")
+    (first,) = convert_wav_to_ahap(str(meditation_wav), str(tmp_path / "first"), "sfx", "none", cache=cache)
+    timings = StageTimings()
+
+    (second,) = convert_wav_to_ahap(
+        str(meditation_wav),
+        str(tmp_path / "second"),
+        "sfx",
+        "none",
+        cache=cache,
+        instrumentation=timings,
+    )
+
+    assert timings.items["cache"] == 1
+    assert "hpss" not in timings.items
+    with open(first) as f, open(second) as g:
+        assert f.read() == g.read()
+
+
+def test_eviction_keeps_the_cache_under_its_size(tmp_path):
+    cache = AhapCache(tmp_path / "cache", max_bytes=150)
+    output = tmp_path / "out.ahap"
+    output.write_text("x" * 100)
+
+    cache.put("old", {"none": str(output)})
+    past = time.time() - 60
+    os.utime(tmp_path / "cache" / "old", (past, past))
+    cache.put("new", {"none": str(output)})
+
+    assert cache.get("old", ["none"]) is None
+    assert cache.get("new", ["none"]) is not None
+
+
+def test_concurrent_workers_survive_each_others_eviction(tmp_path):
+    # Room for about two entries, so every put evicts entries other workers are reading.
+    cache = AhapCache(tmp_path / "cache", max_bytes=2500)
+    source = tmp_path / "source.ahap"
+    source.write_text("x" * 1000)
+
+    def _worker(worker: int) -> int:
+        output = tmp_path / f"out-{worker}.ahap"
+        restored = 0
+        for step in range(100):
+            key = f"entry-{(worker + step) % 6}"
+            if cache.restore(key, {"none": str(output)}):
+                assert output.read_text() == source.read_text()
+                restored += 1
+            else:
+                cache.put(key, {"none": str(source)})
+            cache.evict()
+        return restored
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        restored = list(executor.map(_worker, range(6)))
+
+    assert sum(restored) > 0
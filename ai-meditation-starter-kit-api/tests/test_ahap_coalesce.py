@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+
+from ai_meditation_starter_kit_api.meditation_maker.ahap import (
+    ContinuousEvents,
+    coalesce_continuous_events,
+    convert_wav_to_ahap,
+)
+
+TOLERANCE = 0.02
+
+
+def _pattern(path: str) -> list[dict]:
+    with open(path) as f:
+        return json.load(f)["Pattern"]
+
+
+def _convert(wav, tmp_path, tolerance):
+    output_dir = tmp_path / str(tolerance)
+    return _pattern(convert_wav_to_ahap(str(wav), str(output_dir), "sfx", "none", continuous_tolerance=tolerance)[0])
+
+
+def _parameter(event: dict, parameter_id: str) -> float:
+    return next(p["ParameterValue"] for p in event["EventParameters"] if p["ParameterID"] == parameter_id)
+
+
+def test_empty_events_coalesce_to_nothing():
+    events = ContinuousEvents(times=np.zeros(0), intensity=np.zeros(0), sharpness=np.zeros(0), duration=0.1)
+
+    assert coalesce_continuous_events(events, TOLERANCE) == []
+
+
+def test_silent_audio_converts_with_tolerance(silent_wav, tmp_path):
+    assert _convert(silent_wav, tmp_path, 0.05) == []
+
+
+def test_merged_events_match_every_replaced_event_within_tolerance():
+    rng = np.random.default_rng(0)
+    times = np.arange(200) * 0.1
+    # Slow drifts with a few jumps, as background energy behaves.
+    intensity = np.clip(np.cumsum(rng.normal(0, 0.01, times.size)) + 0.5 + 0.3 * (times > 10), 0, 1)
+    sharpness = np.clip(np.cumsum(rng.normal(0, 0.01, times.size)) + 0.4, 0, 1)
+    events = ContinuousEvents(times=times, intensity=intensity, sharpness=sharpness, duration=0.1)
+
+    merged = [entry["Event"] for entry in coalesce_continuous_events(events, TOLERANCE)]
+
+    assert 0 < len(merged) < len(times)
+    assert merged[0]["Time"] == 0.0
+    np.testing.assert_allclose(merged[-1]["Time"] + merged[-1]["EventDuration"], times[-1] + 0.1)
+    for event in merged:
+        start, end = event["Time"], event["Time"] + event["EventDuration"]
+        covered = (times >= start - 1e-9) & (times < end - 1e-9)
+        assert np.all(np.abs(intensity[covered] - _parameter(event, "HapticIntensity")) <= TOLERANCE + 1e-12)
+        assert np.all(np.abs(sharpness[covered] - _parameter(event, "HapticSharpness")) <= TOLERANCE + 1e-12)
+
+
+def test_coalescing_leaves_onset_intensity_unchanged(meditation_wav, tmp_path):
+    original = _convert(meditation_wav, tmp_path, None)
+    coalesced = _convert(meditation_wav, tmp_path, TOLERANCE)
+
+    # Parameter curves would scale every event playing while they run.
+    assert not any("ParameterCurve" in entry for entry in coalesced)
+
+    def transients(pattern):
+        return [entry["Event"] for entry in pattern if entry["Event"]["EventType"] == "HapticTransient"]
+
+    assert transients(original)
+    assert transients(coalesced) == transients(original)
+    assert len(coalesced) < len(original)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+
+import pytest
+
+from ai_meditation_starter_kit_api.meditation_maker import ahap_compact
+from ai_meditation_starter_kit_api.meditation_maker.ahap import (
+    COMPACT_AHAP_FORMAT,
+    PRETTY_AHAP_FORMAT,
+    AhapOutputFormat,
+    AhapStreamWriter,
+    compact_ahap_file,
+    convert_wav_to_ahap,
+    write_ahap_file,
+)
+
+
+@pytest.fixture
+def pretty_ahap(meditation_wav, tmp_path):
+    (output,) = convert_wav_to_ahap(str(meditation_wav), str(tmp_path), "sfx", "none")
+    return output
+
+
+def _events(ahap: dict) -> list[dict]:
+    return [entry["Event"] for entry in ahap["Pattern"]]
+
+
+def test_minified_output_round_trips_exactly(pretty_ahap, tmp_path):
+    output = tmp_path / "minified.ahap"
+    old_size, new_size = compact_ahap_file(pretty_ahap, str(output), AhapOutputFormat(compact=True))
+
+    with open(pretty_ahap) as f:
+        assert json.loads(output.read_text()) == json.load(f)
+    assert new_size == output.stat().st_size < old_size
+
+
+def test_quantized_output_keeps_every_event_within_a_step(pretty_ahap, tmp_path):
+    output = tmp_path / "compact.ahap"
+    compact_ahap_file(pretty_ahap, str(output), COMPACT_AHAP_FORMAT)
+
+    with open(pretty_ahap) as f:
+        original = _events(json.load(f))
+    compacted = _events(json.loads(output.read_text()))
+
+    assert len(compacted) == len(original) > 0
+    time_step, parameter_step = 1 / COMPACT_AHAP_FORMAT.time_resolution, 1 / COMPACT_AHAP_FORMAT.parameter_levels
+    for event, expected in zip(compacted, original):
+        assert event["EventType"] == expected["EventType"]
+        assert abs(event["Time"] - expected["Time"]) <= time_step / 2
+        assert abs(event.get("EventDuration", 0) - expected.get("EventDuration", 0)) <= time_step / 2
+        for parameter, expected_parameter in zip(event["EventParameters"], expected["EventParameters"]):
+            assert parameter["ParameterID"] == expected_parameter["ParameterID"]
+            assert abs(parameter["ParameterValue"] - expected_parameter["ParameterValue"]) <= parameter_step / 2
+
+
+@pytest.mark.parametrize("output_format", [PRETTY_AHAP_FORMAT, COMPACT_AHAP_FORMAT])
+def test_stream_writer_matches_write_ahap_file(pretty_ahap, tmp_path, output_format):
+    with open(pretty_ahap) as f:
+        ahap = json.load(f)
+    written, streamed = tmp_path / "written.ahap", tmp_path / "streamed.ahap"
+
+    write_ahap_file(str(written), ahap, output_format)
+    with AhapStreamWriter(str(streamed), output_format) as writer:
+        writer.write_events(ahap["Pattern"])
+
+    assert streamed.read_bytes() == written.read_bytes()
+
+
+def test_cli_reports_the_byte_savings(pretty_ahap, tmp_path, monkeypatch, capsys):
+    copy = tmp_path / "copy.ahap"
+    shutil.copyfile(pretty_ahap, copy)
+    old_size = copy.stat().st_size
+
+    monkeypatch.setattr(sys, "argv", ["ahap_compact", pretty_ahap, str(copy)])
+    ahap_compact.main()
+
+    new_size = copy.stat().st_size
+    lines = capsys.readouterr().out.splitlines()
+    saving = f"-{(1 - new_size / old_size) * 100:.0f}%"
+    assert lines[0] == f"meditation.ahap: {old_size / 1024:.1f} KB -> {new_size / 1024:.1f} KB ({saving})"
+    assert lines[-1] == f"Total: {2 * old_size / 1024:.1f} KB -> {2 * new_size / 1024:.1f} KB ({saving})"
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ai_meditation_starter_kit_api.meditation_maker.ahap import (
+    AhapAnalysis,
+    ContinuousEvents,
+    analyze_audio,
+    decimate_analysis,
+    decompose_audio,
+)
+
+from .audio import SAMPLE_RATE, meditation_like_signal
+
+
+def _analysis(onset_times: np.ndarray, duration: float, seed: int = 0) -> AhapAnalysis:
+    rng = np.random.default_rng(seed)
+    background_times = np.arange(0, duration, 0.1)
+    return AhapAnalysis(
+        event_times=onset_times,
+        is_transient=rng.random(onset_times.size) < 0.7,
+        is_continuous=rng.random(onset_times.size) < 0.5,
+        intensity=rng.random(onset_times.size),
+        sharpness=rng.random(onset_times.size),
+        continuous_events=ContinuousEvents(
+            times=background_times,
+            intensity=rng.random(background_times.size),
+            sharpness=rng.random(background_times.size),
+            duration=0.1,
+        ),
+    )
+
+
+def _event_times(analysis: AhapAnalysis) -> np.ndarray:
+    return np.sort(
+        np.concatenate(
+            [
+                analysis.event_times[analysis.is_transient],
+                analysis.event_times[analysis.is_continuous],
+                analysis.continuous_events.times,
+            ]
+        )
+    )
+
+
+def _peak_density(times: np.ndarray) -> int:
+    """Most events in any window [t, t + 1), over every start time t."""
+    if not times.size:
+        return 0
+    return int((np.searchsorted(times, times + 1.0) - np.arange(times.size)).max())
+
+
+@pytest.mark.parametrize("events_per_second", [1, 6, 15, 30])
+def test_no_sliding_window_exceeds_budget(events_per_second):
+    # Bursts of onsets straddling second boundaries, which fixed one-second buckets let through.
+    rng = np.random.default_rng(1)
+    onset_times = np.sort(np.concatenate([rng.uniform(0, 20, 150), 0.9 + np.arange(10) * 2 + rng.uniform(0, 0.2, 10)]))
+    analysis = _analysis(onset_times, 20.0)
+
+    decimated = decimate_analysis(analysis, events_per_second)
+
+    assert _peak_density(_event_times(decimated)) <= events_per_second
+
+
+@pytest.mark.parametrize("events_per_second", [6, 15])
+def test_budget_holds_on_analyzed_audio(events_per_second):
+    audio = meditation_like_signal(12.0).astype(np.float32)
+    harmonic, _, bass = decompose_audio(audio)
+    analysis = analyze_audio(audio, SAMPLE_RATE, "sfx", harmonic, bass, audio.size / SAMPLE_RATE, 3.0, 2.5)
+
+    decimated = decimate_analysis(analysis, events_per_second)
+
+    assert _peak_density(_event_times(decimated)) <= events_per_second
+    assert decimated.is_transient.any()
+
+
+def test_background_still_covers_the_track():
+    analysis = _analysis(np.zeros(0), 10.0)
+
+    background = decimate_analysis(analysis, 4).continuous_events
+
+    assert background.times[0] == 0.0
+    np.testing.assert_allclose(background.times[1:], background.times[:-1] + background.duration[:-1])
+    np.testing.assert_allclose(background.times[-1] + background.duration[-1], 10.0)
+
+
+def test_strongest_transients_are_kept():
+    onset_times = np.linspace(0.0, 0.5, 20)
+    analysis = _analysis(onset_times, 1.0)._replace(
+        is_transient=np.ones(20, dtype=bool),
+        is_continuous=np.ones(20, dtype=bool),
+        intensity=np.linspace(0.1, 1.0, 20),
+    )
+
+    decimated = decimate_analysis(analysis, 8)
+
+    assert not decimated.is_continuous.any()
+    assert np.flatnonzero(decimated.is_transient).tolist() == list(range(14, 20))
+
+
+def test_empty_analysis():
+    decimated = decimate_analysis(_analysis(np.zeros(0), 0.0), 6)
+
+    assert decimated.event_times.size == 0
+    assert decimated.continuous_events.times.size == 0
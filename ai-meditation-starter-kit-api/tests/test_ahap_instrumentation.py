@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pytest
+
+from ai_meditation_starter_kit_api.meditation_maker.ahap import (
+    decompose_audio,
+    generate_ahap,
+    generate_ahap_from_file,
+    load_audio,
+)
+from ai_meditation_starter_kit_api.meditation_maker.ahap_instrumentation import (
+    AhapInstrumentation,
+    StageTimings,
+    instrumented_stage,
+)
+
+from .audio import SAMPLE_RATE
+
+
+class _Recorder(AhapInstrumentation):
+    def __init__(self) -> None:
+        self.events: list[tuple[str, str, int | None]] = []
+
+    def stage_started(self, stage):
+        self.events.append(("started", stage, None))
+
+    def stage_finished(self, stage, items, elapsed_seconds):
+        assert elapsed_seconds >= 0
+        self.events.append(("finished", stage, items))
+
+
+def test_stage_reports_items_set_in_the_block():
+    recorder = _Recorder()
+    with instrumented_stage(recorder, "load") as stage:
+        stage.items = 42
+
+    assert recorder.events == [("started", "load", None), ("finished", "load", 42)]
+
+
+def test_failed_stage_is_not_reported_as_finished():
+    recorder = _Recorder()
+    with pytest.raises(ValueError), instrumented_stage(recorder, "hpss"):
+        raise ValueError
+
+    assert recorder.events == [("started", "hpss", None)]
+
+
+def test_stage_without_instrumentation_still_runs():
+    with instrumented_stage(None, "write") as stage:
+        stage.items = 1
+
+
+@pytest.mark.parametrize(
+    "options, stages",
+    [
+        ({}, {"onset", "transient_events", "continuous_events"}),
+        ({"events_per_second": 6.0}, {"onset", "transient_events", "continuous_events", "decimate"}),
+        ({"engine": "reference"}, {"reference_events"}),
+    ],
+)
+def test_generate_ahap_reports_its_stages(meditation_wav, options, stages):
+    audio, sample_rate = load_audio(str(meditation_wav), SAMPLE_RATE)
+    harmonic, percussive, bass = decompose_audio(audio)
+    timings = StageTimings()
+
+    ahap = generate_ahap(
+        audio,
+        sample_rate,
+        "sfx",
+        harmonic,
+        percussive,
+        bass,
+        len(audio) / sample_rate,
+        "none",
+        sharpness_factor=3.0,
+        intensity_factor=2.5,
+        instrumentation=timings,
+        **options,
+    )
+
+    assert ahap["Pattern"]
+    assert set(timings.items) == stages
+
+
+def test_generate_ahap_from_file_passes_instrumentation_on(meditation_wav, tmp_path):
+    timings = StageTimings()
+    generate_ahap_from_file(str(meditation_wav), str(tmp_path), instrumentation=timings)
+
+    assert {"load", "hpss", "onset", "write"} <= set(timings.items)
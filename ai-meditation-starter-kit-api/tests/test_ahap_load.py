@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import struct
+
+import librosa
+import numpy as np
+import pytest
+import soundfile as sf
+
+from ai_meditation_starter_kit_api.meditation_maker.ahap import _pcm16_mono_data_span, load_audio
+
+from .audio import SAMPLE_RATE, meditation_like_signal, write_wav
+
+
+def _pcm16(seconds: float) -> bytes:
+    samples = meditation_like_signal(seconds)
+    return np.clip(np.rint(samples * 32767), -32768, 32767).astype("<i2").tobytes()
+
+
+def _riff(*chunks: tuple[bytes, bytes], data_size: int | None = None) -> bytes:
+    body = b""
+    for chunk_id, payload in chunks:
+        size = data_size if chunk_id == b"data" and data_size is not None else len(payload)
+        body += struct.pack("<4sI", chunk_id, size) + payload + b"\0" * (len(payload) % 2)
+    return b"RIFF" + struct.pack("<I", 4 + len(body)) + b"WAVE" + body
+
+
+def _fmt(sample_rate: int = SAMPLE_RATE) -> bytes:
+    return struct.pack("<HHIIHH", 1, 1, sample_rate, 2 * sample_rate, 2, 16)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_pcm16_mono_is_mapped_and_matches_librosa(tmp_path, dtype):
+    path = write_wav(tmp_path / "speech.wav", meditation_like_signal(2.0))
+
+    assert _pcm16_mono_data_span(str(path), SAMPLE_RATE) is not None
+    audio, sample_rate = load_audio(str(path), SAMPLE_RATE, dtype)
+    expected, _ = librosa.load(str(path), sr=SAMPLE_RATE, mono=True, dtype=dtype)
+
+    assert sample_rate == SAMPLE_RATE
+    assert audio.dtype == dtype
+    np.testing.assert_array_equal(audio, expected)
+
+
+def test_other_sample_rates_fall_back_to_librosa(tmp_path):
+    path = write_wav(tmp_path / "fallback.wav", meditation_like_signal(2.0)[::3], sample_rate=16000)
+
+    assert _pcm16_mono_data_span(str(path), SAMPLE_RATE) is None
+    audio, _ = load_audio(str(path), SAMPLE_RATE)
+    expected, _ = librosa.load(str(path), sr=SAMPLE_RATE, mono=True)
+    np.testing.assert_array_equal(audio, expected)
+
+
+def test_chunks_around_the_data_are_skipped(tmp_path):
+    pcm = _pcm16(1.0)
+    path = tmp_path / "tagged.wav"
+    # An odd-sized chunk ahead of the format and a LIST chunk between format and data.
+    path.write_bytes(_riff((b"junk", b"abc"), (b"fmt ", _fmt()), (b"LIST", b"INFOISFT\4\0\0\0test"), (b"data", pcm)))
+
+    audio, _ = load_audio(str(path), SAMPLE_RATE)
+
+    np.testing.assert_array_equal(audio, np.frombuffer(pcm, "<i2") / np.float32(32768))
+    np.testing.assert_array_equal(audio, sf.read(str(path), dtype="float32")[0])
+
+
+def test_placeholder_data_size_reads_to_the_end_of_the_file(tmp_path):
+    pcm = _pcm16(1.0)
+    path = tmp_path / "streamed.wav"
+    path.write_bytes(_riff((b"fmt ", _fmt()), (b"data", pcm), data_size=0xFFFFFFFF))
+
+    offset, n_samples = _pcm16_mono_data_span(str(path), SAMPLE_RATE)
+
+    assert n_samples == len(pcm) // 2
+    assert offset == path.stat().st_size - len(pcm)
+
+
+@pytest.mark.parametrize("subtype, channels", [("FLOAT", 1), ("PCM_24", 1), ("PCM_16", 2)])
+def test_other_formats_fall_back_to_librosa(tmp_path, subtype, channels):
+    samples = np.tile(meditation_like_signal(1.0)[:, None], (1, channels)) * 0.5
+    path = tmp_path / f"{subtype}-{channels}.wav"
+    sf.write(str(path), samples, SAMPLE_RATE, subtype=subtype)
+
+    assert _pcm16_mono_data_span(str(path), SAMPLE_RATE) is None
+    audio, _ = load_audio(str(path), SAMPLE_RATE)
+    expected, _ = librosa.load(str(path), sr=SAMPLE_RATE, mono=True)
+    np.testing.assert_array_equal(audio, expected)
+
+
+def test_empty_data_chunk_loads_as_no_samples(silent_wav):
+    audio, sample_rate = load_audio(str(silent_wav), SAMPLE_RATE)
+
+    assert audio.shape == (0,)
+    assert sample_rate == SAMPLE_RATE
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from ai_meditation_starter_kit_api.meditation_maker.ahap_merge import merge_meditation_ahaps
+
+
+def _transient(time: float) -> dict:
+    return {"Event": {"Time": time, "EventType": "HapticTransient", "EventParameters": []}}
+
+
+def _continuous(time: float, duration: float) -> dict:
+    return {"Event": {"Time": time, "EventType": "HapticContinuous", "EventDuration": duration, "EventParameters": []}}
+
+
+def _write_meditation(root, segments: dict[str, tuple[int, list[dict]]], duration_ms: int) -> str:
+    (root / "haptics").mkdir()
+    (root / "meditations").mkdir()
+    timeline = []
+    for name, (at_ms, pattern) in segments.items():
+        (root / "haptics" / f"{name}.ahap").write_text(json.dumps({"Version": 1.0, "Pattern": pattern}))
+        timeline.append({"atMs": at_ms, "kind": "ahap", "file": f"haptics/{name}.ahap", "platform": "ios"})
+    meditation = root / "meditations" / "session.json"
+    meditation.write_text(json.dumps({"id": "session", "durationMs": duration_ms, "timeline": timeline}))
+    return str(meditation)
+
+
+def test_overlapping_segment_keeps_transients_and_clips_continuous_events(tmp_path):
+    # The intro's haptics run 1.5 s past the point where the bell starts.
+    intro = [_transient(0.5), _continuous(1.0, 2.0), _transient(2.5), _continuous(2.2, 0.2), _continuous(0.0, 0.5)]
+    bell = [_transient(0.0), _continuous(0.0, 1.0)]
+    meditation = _write_meditation(tmp_path, {"intro": (0, intro), "bell": (2000, bell)}, duration_ms=4000)
+
+    result = merge_meditation_ahaps(meditation)
+
+    with open(result.output_ahap) as f:
+        events = [entry["Event"] for entry in json.load(f)["Pattern"]]
+    assert [(event["Time"], event["EventType"], event.get("EventDuration")) for event in events] == [
+        (0.0, "HapticContinuous", 0.5),
+        (0.5, "HapticTransient", None),
+        (1.0, "HapticContinuous", 1.0),
+        (2.0, "HapticTransient", None),
+        (2.0, "HapticContinuous", 1.0),
+        (2.5, "HapticTransient", None),
+    ]
+    # Shortened at the bell, and dropped for starting after it.
+    assert result.clipped_events == 2
+
+
+def test_last_segment_is_clipped_at_the_meditation_end(tmp_path):
+    meditation = _write_meditation(tmp_path, {"close": (1000, [_continuous(0.5, 2.0)])}, duration_ms=2000)
+
+    result = merge_meditation_ahaps(meditation)
+
+    with open(result.output_ahap) as f:
+        (entry,) = json.load(f)["Pattern"]
+    assert entry["Event"]["Time"] == 1.5
+    assert entry["Event"]["EventDuration"] == pytest.approx(0.5)
+    assert result.clipped_events == 1
+
+
+def _curve(parameter_id: str, time: float, *points: tuple[float, float]) -> dict:
+    control_points = [{"Time": point_time, "ParameterValue": value} for point_time, value in points]
+    curve = {"ParameterID": parameter_id, "Time": time, "ParameterCurveControlPoints": control_points}
+    return {"ParameterCurve": curve}
+
+
+def _values(curve: dict) -> list[float]:
+    return [point["ParameterValue"] for point in curve["ParameterCurveControlPoints"]]
+
+
+def test_curves_are_clipped_and_reset_before_the_next_segment(tmp_path):
+    # A hand-authored intro fades intensity and sharpness across the point where the bell starts.
+    intro = [
+        _continuous(0.0, 3.0),
+        _curve("HapticIntensityControl", 0.5, (0.0, 1.0), (1.0, 0.6), (2.0, 0.2)),
+        _curve("HapticSharpnessControl", 1.0, (0.0, 0.1), (0.5, 0.4)),
+        _curve("HapticIntensityControl", 2.5, (0.0, 0.3)),
+    ]
+    bell = [_transient(0.0)]
+    meditation = _write_meditation(tmp_path, {"intro": (0, intro), "bell": (2000, bell)}, duration_ms=4000)
+
+    result = merge_meditation_ahaps(meditation)
+
+    with open(result.output_ahap) as f:
+        curves = [entry["ParameterCurve"] for entry in json.load(f)["Pattern"] if "ParameterCurve" in entry]
+    summary = [
+        (curve["Time"], curve["ParameterID"], _values(curve))
+        for curve in curves
+    ]
+    # Points at or after the cut are dropped (as is the curve starting after it), then both parameters reset.
+    assert summary == [
+        (0.5, "HapticIntensityControl", [1.0, 0.6]),
+        (1.0, "HapticSharpnessControl", [0.1, 0.4]),
+        (2.0, "HapticIntensityControl", [1.0]),
+        (2.0, "HapticSharpnessControl", [0.0]),
+    ]
+    assert result.clipped_events == 1
+
+
+def test_last_segment_curves_reset_at_the_meditation_end(tmp_path):
+    curve = _curve("HapticIntensityControl", 0.0, (0.0, 0.5), (0.5, 1.0))
+    meditation = _write_meditation(tmp_path, {"close": (1000, [_continuous(0.0, 0.5), curve])}, duration_ms=5000)
+
+    result = merge_meditation_ahaps(meditation)
+
+    with open(result.output_ahap) as f:
+        curves = [entry["ParameterCurve"] for entry in json.load(f)["Pattern"] if "ParameterCurve" in entry]
+    assert [(curve["Time"], curve["ParameterID"]) for curve in curves] == [
+        (1.0, "HapticIntensityControl"),
+        (5.0, "HapticIntensityControl"),
+    ]
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from ai_meditation_starter_kit_api.meditation_maker.ahap_parity import check_conversion_parity, compare_ahap
+
+
+def _event(event_type: str, time: float, intensity: float) -> dict:
+    return {
+        "Event": {
+            "EventType": event_type,
+            "Time": time,
+            "EventParameters": [{"ParameterID": "HapticIntensity", "ParameterValue": intensity}],
+        }
+    }
+
+
+def test_compare_pairs_events_of_the_same_type():
+    reference = {"Pattern": [_event("HapticTransient", 1.0, 0.5), _event("HapticContinuous", 2.0, 0.2)]}
+    candidate = {"Pattern": [_event("HapticContinuous", 2.001, 0.25), _event("HapticTransient", 1.0, 0.5)]}
+
+    report = compare_ahap(reference, candidate)
+
+    assert report.unmatched_events == 0
+    assert abs(report.max_time_error - 0.001) < 1e-9
+    assert abs(report.max_parameter_error - 0.05) < 1e-9
+    assert report.within(0.05 + 1e-9)
+    assert not report.within(0.01)
+
+
+def test_compare_counts_events_outside_the_match_window():
+    reference = {"Pattern": [_event("HapticTransient", 1.0, 0.5), _event("HapticTransient", 3.0, 0.5)]}
+    candidate = {"Pattern": [_event("HapticTransient", 1.0, 0.5), _event("HapticContinuous", 3.0, 0.5)]}
+
+    report = compare_ahap(reference, candidate)
+
+    assert (report.reference_events, report.candidate_events) == (2, 2)
+    assert report.unmatched_events == 2
+
+
+def test_fast_engine_matches_reference_engine(meditation_wav):
+    reports = check_conversion_parity(str(meditation_wav), {"engine": "reference"}, {"engine": "fast"}, split="all")
+
+    assert len(reports) == 4
+    for report in reports.values():
+        assert report.reference_events > 0
+        assert report.within(1e-3), report
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ai_meditation_starter_kit_api.meditation_maker.ahap_realtime import IncrementalAhapGenerator, replay_wav
+
+from .audio import SAMPLE_RATE
+
+
+def _rising_bursts(seconds: float = 2.0, seed: int = 3) -> np.ndarray:
+    """Syllable-like noise bursts that get louder quickly, so every running peak keeps moving."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    bursts = rng.normal(size=t.size) * (np.sin(2 * np.pi * 5 * t) > 0.3) * np.minimum(1.0, 0.02 * np.exp(8 * t))
+    return (0.5 * bursts / np.abs(bursts).max()).astype(np.float32)
+
+
+def _generate(samples: np.ndarray, chunk: int) -> list[dict]:
+    generator = IncrementalAhapGenerator()
+    events = []
+    for start in range(0, len(samples), chunk):
+        events += generator.push(samples[start : start + chunk])
+    events += generator.flush()
+    # Events come back as they become final, so only the order across pushes depends on the chunking.
+    return sorted(events, key=lambda entry: (entry["Event"]["Time"], entry["Event"]["EventType"]))
+
+
+@pytest.mark.parametrize("chunk", [4410, 1237, 64, 2 * SAMPLE_RATE])
+def test_events_do_not_depend_on_chunk_size(chunk):
+    samples = _rising_bursts()
+
+    assert _generate(samples, chunk) == _generate(samples, 882)
+
+
+def test_integer_pcm_is_scaled_by_its_range():
+    pcm16 = np.round(_rising_bursts() * 32767).astype(np.int16)
+    pcm8 = (pcm16 // 256 + 128).astype(np.uint8)
+
+    assert _generate(pcm16.astype(np.int32) << 16, 882) == _generate(pcm16, 882)
+    assert _generate(pcm8, 882) == _generate((pcm8.astype(np.float32) - 128) / 128, 882)
+    assert _generate(pcm16, 882) == _generate(pcm16.astype(np.float32) / 32768, 882)
+
+
+def test_replay_latency_stays_within_lookahead(meditation_wav, tmp_path):
+    chunk_seconds = 0.02
+
+    report = replay_wav(str(meditation_wav), str(tmp_path / "realtime.ahap"), chunk_seconds=chunk_seconds)
+
+    assert report.events > 0
+    assert 0 < report.max_latency <= IncrementalAhapGenerator().lookahead_seconds + chunk_seconds
+    assert report.max_latency <= 0.2 + chunk_seconds
+
+
+def test_push_after_flush_is_rejected():
+    generator = IncrementalAhapGenerator()
+    generator.flush()
+
+    with pytest.raises(ValueError):
+        generator.push(np.zeros(512, dtype=np.float32))
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ai_meditation_starter_kit_api.meditation_maker.ahap import convert_wav_to_ahap
+from ai_meditation_starter_kit_api.meditation_maker.ahap_parity import compare_ahap
+from ai_meditation_starter_kit_api.meditation_maker.ahap_stream import convert_wav_to_ahap_streaming
+
+
+def _patterns(paths: list[str]) -> dict[str, dict]:
+    return {Path(path).name: json.loads(Path(path).read_text()) for path in paths}
+
+
+@pytest.mark.parametrize("continuous_tolerance", [None, 0.05])
+def test_streaming_matches_in_memory_conversion(meditation_wav, tmp_path, continuous_tolerance):
+    options = {"continuous_tolerance": continuous_tolerance}
+    in_memory = convert_wav_to_ahap(str(meditation_wav), str(tmp_path / "memory"), "sfx", "all", **options)
+    # One-second blocks put several block boundaries inside the clip.
+    streamed = convert_wav_to_ahap_streaming(
+        str(meditation_wav),
+        str(tmp_path / "stream"),
+        "sfx",
+        "all",
+        block_seconds=1.0,
+        **options,
+    )
+
+    expected, actual = _patterns(in_memory), _patterns(streamed)
+    assert expected.keys() == actual.keys()
+    for name, pattern in expected.items():
+        report = compare_ahap(pattern, actual[name], match_window=1e-6)
+        assert report.reference_events > 0
+        assert report.within(1e-5), (name, report)
+
+
+def test_streaming_handles_empty_audio(silent_wav, tmp_path):
+    (output,) = convert_wav_to_ahap_streaming(str(silent_wav), str(tmp_path), "sfx", "none")
+
+    assert json.loads(Path(output).read_text())["Pattern"] == []
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from ai_meditation_starter_kit_api.meditation_maker import async_providers
+from ai_meditation_starter_kit_api.meditation_maker.async_providers import (
+    aclose_default_clients,
+    default_async_elevenlabs_client,
+    default_async_iembrace_client,
+)
+
+
+@pytest.fixture(autouse=True)
+def _provider_env(monkeypatch):
+    monkeypatch.setenv("ELEVENLABS_API_KEY", "test-key")
+    monkeypatch.setenv("API_BASE_URL", "https://api.example.test")
+    monkeypatch.setenv("X_USER_EMAIL", "user@example.test")
+
+
+def test_default_clients_are_shared_until_closed():
+    async def _run():
+        clients = [default_async_elevenlabs_client(), default_async_iembrace_client()]
+        assert default_async_elevenlabs_client() is clients[0]
+        assert default_async_iembrace_client() is clients[1]
+
+        await aclose_default_clients()
+        assert all(client.http.is_closed for client in clients)
+        assert asyncio.get_running_loop() not in async_providers._default_clients
+
+        # Clients needed after closing are created afresh.
+        replacement = default_async_elevenlabs_client()
+        assert replacement is not clients[0]
+        await aclose_default_clients()
+        return replacement
+
+    assert asyncio.run(_run()).http.is_closed
+
+
+def test_each_loop_gets_its_own_default_clients():
+    async def _run():
+        client = default_async_elevenlabs_client()
+        await aclose_default_clients()
+        return client
+
+    assert asyncio.run(_run()) is not asyncio.run(_run())
+
+
+def test_closing_without_default_clients_is_a_no_op():
+    asyncio.run(aclose_default_clients())
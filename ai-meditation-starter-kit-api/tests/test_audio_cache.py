@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ai_meditation_starter_kit_api.meditation_maker.audio_cache import (
+    AudioCache,
+    DiskAudioCache,
+    sfx_cache_key,
+    tts_cache_key,
+)
+from ai_meditation_starter_kit_api.meditation_maker.types import coerce_sfx_request
+
+
+def _tts_key(text: str, **overrides: str) -> str:
+    params = {
+        "provider": "elevenlabs",
+        "voice_id": "voice",
+        "model_id": "model",
+        "text": text,
+        "language_code": "en",
+        "output_format": "wav",
+        **overrides,
+    }
+    return tts_cache_key(**params)
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        AudioCache()
+
+
+def test_tts_keys_ignore_whitespace_runs_only():
+    assert _tts_key("Breathe  in.\n") == _tts_key("Breathe in.")
+    assert _tts_key("Breathe in.") != _tts_key("Breathe out.")
+    assert _tts_key("Breathe in.") != _tts_key("Breathe in.", output_format="mp3")
+    assert _tts_key("Breathe in.") != _tts_key("Breathe in.", voice_id="other")
+
+
+def test_sfx_keys_follow_the_request():
+    bell = coerce_sfx_request({"text": "Singing bowl", "durationSeconds": 4})
+    same_bell = coerce_sfx_request({"text": " Singing  bowl", "durationSeconds": 4})
+    longer_bell = coerce_sfx_request({"text": "Singing bowl", "durationSeconds": 6})
+
+    assert sfx_cache_key("elevenlabs", bell) == sfx_cache_key("elevenlabs", same_bell)
+    assert sfx_cache_key("elevenlabs", bell) != sfx_cache_key("elevenlabs", longer_bell)
+
+
+def test_disk_cache_round_trip_and_stats(tmp_path):
+    cache = DiskAudioCache(tmp_path)
+    key = _tts_key("Namaste.")
+
+    assert cache.get(key) is None
+    cache.put(key, b"audio")
+
+    assert cache.get(key) == b"audio"
+    assert cache.stats == (1, 1)
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskAudioCache(tmp_path, max_bytes=10)
+    cache.put("old", b"1234")
+    cache.put("used", b"1234")
+    past = time.time() - 60
+    os.utime(tmp_path / "old", (past, past))
+    os.utime(tmp_path / "used", (past - 60, past - 60))
+    # Reading refreshes "used", leaving "old" as the least recently used entry.
+    assert cache.get("used") == b"1234"
+
+    cache.put("new", b"1234")
+
+    assert cache.get("old") is None
+    assert cache.get("used") == b"1234"
+    assert cache.get("new") == b"1234"
+
+
+def test_stats_count_every_concurrent_lookup(tmp_path):
+    cache = DiskAudioCache(tmp_path)
+    cache.put("hit", b"audio")
+    keys = ["hit", "miss"] * 2000
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(cache.get, keys))
+
+    assert cache.stats == (2000, 2000)
+
+
+def test_concurrent_stores_survive_each_others_eviction(tmp_path):
+    # Room for about two entries, so every store evicts entries other threads are listing.
+    cache = DiskAudioCache(tmp_path, max_bytes=2500)
+
+    def _worker(worker: int) -> None:
+        for step in range(200):
+            key = f"entry-{worker}-{step % 4}"
+            if cache.get(key) is None:
+                cache.put(key, b"x" * 1000)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        list(executor.map(_worker, range(6)))
+
+    assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= 2500
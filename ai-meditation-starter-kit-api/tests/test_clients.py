@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from ai_meditation_starter_kit_api.meditation_maker.clients import RetryPolicy, create_session
+
+_NO_BACKOFF = RetryPolicy(total=3, backoff_factor=0.0)
+
+
+class _ScriptedServer(ThreadingHTTPServer):
+    """Answers the n-th POST with the n-th scripted status; `None` stalls past the client timeout."""
+
+    def __init__(self, statuses: list[int | None]) -> None:
+        super().__init__(("127.0.0.1", 0), _ScriptedHandler)
+        self.statuses = statuses
+        self.attempts = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/tts"
+
+
+class _ScriptedHandler(BaseHTTPRequestHandler):
+    server: _ScriptedServer
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming.
+        self.rfile.read(int(self.headers["Content-Length"]))
+        status = self.server.statuses[min(self.server.attempts, len(self.server.statuses) - 1)]
+        self.server.attempts += 1
+        if status is None:
+            time.sleep(0.5)
+            return
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def serve():
+    servers: list[_ScriptedServer] = []
+
+    def _serve(statuses: list[int | None]) -> _ScriptedServer:
+        server = _ScriptedServer(statuses)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield _serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_post_is_retried_on_retryable_status(serve):
+    server = serve([503, 429, 200])
+    with create_session(_NO_BACKOFF) as session:
+        response = session.post(server.url, json={"text": "hello"}, timeout=5)
+
+    assert response.status_code == 200
+    assert server.attempts == 3
+
+
+def test_last_response_is_returned_when_retries_run_out(serve):
+    server = serve([503])
+    with create_session(_NO_BACKOFF) as session:
+        response = session.post(server.url, json={"text": "hello"}, timeout=5)
+
+    assert response.status_code == 503
+    assert server.attempts == _NO_BACKOFF.total + 1
+
+
+def test_post_is_not_retried_on_client_errors(serve):
+    server = serve([400, 200])
+    with create_session(_NO_BACKOFF) as session:
+        response = session.post(server.url, json={"text": "hello"}, timeout=5)
+
+    assert response.status_code == 400
+    assert server.attempts == 1
+
+
+def test_post_is_not_resent_after_a_read_timeout(serve):
+    # The provider accepted the request, so sending it again could bill the synthesis twice.
+    server = serve([None, 200])
+    with create_session(_NO_BACKOFF) as session, pytest.raises(requests.exceptions.ReadTimeout):
+        session.post(server.url, json={"text": "hello"}, timeout=0.1)
+
+    assert server.attempts == 1
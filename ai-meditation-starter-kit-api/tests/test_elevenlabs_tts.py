@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from ai_meditation_starter_kit_api.meditation_maker.audio_cache import DiskAudioCache
+from ai_meditation_starter_kit_api.meditation_maker.elevenlabs_tts import (
+    _ELEVENLABS_MODEL_ID,
+    _elevenlabs_tts_cache_key,
+    _join_speech_parts,
+    _split_long_pauses,
+    generate_tts_audio_elevenlabs,
+    stream_tts_audio_elevenlabs,
+)
+from ai_meditation_starter_kit_api.meditation_maker.transcode import (
+    SAMPLE_RATE,
+    SAMPLE_WIDTH,
+    mp3_to_wav,
+    pcm_to_wav,
+    soundfile_decodes_mp3,
+    wav_pcm,
+    write_wav_stream,
+)
+from ai_meditation_starter_kit_api.meditation_maker.types import TTSRequest
+
+_SCRIPT = "Breathe in. [2s] Hold it. [10s] Breathe out. [30s]"
+
+
+class FakeElevenLabsClient:
+    """Returns a synthetic MP3 per text, with a length that identifies the text."""
+
+    voice_id = "voice"
+
+    def __init__(self, durations: dict[str, float]) -> None:
+        from ai_meditation_starter_kit_api.meditation_maker.transcode_benchmark import synthetic_mp3
+
+        self.clips = {text: synthetic_mp3(seconds) for text, seconds in durations.items()}
+        self.texts: list[str] = []
+
+    def text_to_speech(self, text: str, *, model_id: str, output_format: str, voice_id: str, timeout: float) -> bytes:
+        assert model_id == _ELEVENLABS_MODEL_ID
+        self.texts.append(text)
+        return self.clips[text]
+
+    def text_to_speech_stream(self, text: str, **kwargs: object) -> Iterator[bytes]:
+        clip = self.text_to_speech(text, **kwargs)
+        for start in range(0, len(clip), 1000):
+            yield clip[start : start + 1000]
+
+
+def _samples(seconds: float) -> int:
+    return round(seconds * SAMPLE_RATE)
+
+
+def test_long_pauses_split_the_script_in_order():
+    parts = _split_long_pauses(TTSRequest(text=_SCRIPT))
+
+    # Short pauses stay in the text as break tags; trailing silence after the last span is kept.
+    assert parts == ["Breathe in. [2s] Hold it. ", 10.0, " Breathe out. ", 30.0]
+
+
+def test_only_wav_output_is_split():
+    assert _split_long_pauses(TTSRequest(text=_SCRIPT, outputFormat="mp3")) == [_SCRIPT]
+
+
+def test_join_inserts_silence_of_the_pause_length():
+    first, second = np.full(100, 7, "<i2").tobytes(), np.full(50, -7, "<i2").tobytes()
+    parts = ["one", 1.5, "two", 0.25]
+
+    pcm = np.frombuffer(wav_pcm(_join_speech_parts(parts, [pcm_to_wav(first), pcm_to_wav(second)])), "<i2")
+
+    assert pcm.size == 100 + _samples(1.5) + 50 + _samples(0.25)
+    assert (pcm[:100] == 7).all()
+    assert not pcm[100 : 100 + _samples(1.5)].any()
+    assert (pcm[100 + _samples(1.5) : 150 + _samples(1.5)] == -7).all()
+    assert not pcm[150 + _samples(1.5) :].any()
+
+
+def test_single_span_is_returned_unchanged():
+    clip = pcm_to_wav(b"\1\0" * 10)
+    assert _join_speech_parts(["only"], [clip]) is clip
+
+
+@pytest.mark.skipif(not soundfile_decodes_mp3(), reason="libsndfile has no MP3 support")
+def test_spans_are_stitched_in_order_and_cached_by_converted_text(tmp_path):
+    first = 'Breathe in. <break time="2s" /> Hold it. '
+    second = " Breathe out. "
+    client = FakeElevenLabsClient({first: 1.0, second: 0.5})
+    cache = DiskAudioCache(tmp_path)
+    request = TTSRequest(text=_SCRIPT)
+
+    result = generate_tts_audio_elevenlabs(request, client=client, cache=cache)
+
+    # The provider only sees break tags; the long pauses never reach it.
+    assert sorted(client.texts) == sorted([first, second])
+    first_pcm, second_pcm = (wav_pcm(mp3_to_wav(client.clips[text])) for text in (first, second))
+    expected = first_pcm + bytes(SAMPLE_WIDTH * _samples(10)) + second_pcm + bytes(SAMPLE_WIDTH * _samples(30))
+    assert wav_pcm(result.audioBytes) == expected
+
+    for text in (first, second):
+        assert cache.get(_elevenlabs_tts_cache_key(request, text, "voice")) == mp3_to_wav(client.clips[text])
+
+    # A second run is served from the cache.
+    client.texts.clear()
+    assert generate_tts_audio_elevenlabs(request, client=client, cache=cache).audioBytes == result.audioBytes
+    assert client.texts == []
+
+
+@pytest.mark.skipif(not soundfile_decodes_mp3(), reason="libsndfile has no MP3 support")
+def test_streamed_speech_matches_the_whole_clip_and_shares_its_cache(tmp_path):
+    first = 'Breathe in. <break time="2s" /> Hold it. '
+    second = " Breathe out. "
+    client = FakeElevenLabsClient({first: 1.0, second: 0.5})
+    cache = DiskAudioCache(tmp_path / "cache")
+    request = TTSRequest(text=_SCRIPT, outputFormat="mp3")
+
+    output = tmp_path / "streamed.wav"
+    frames = write_wav_stream(stream_tts_audio_elevenlabs(request, client=client, cache=cache), output)
+
+    assert sorted(client.texts) == sorted([first, second])
+    # Streaming always renders WAV, so it matches a whole WAV synthesis served from the spans it cached.
+    client.texts.clear()
+    whole = generate_tts_audio_elevenlabs(TTSRequest(text=_SCRIPT), client=client, cache=cache)
+    assert client.texts == []
+    info = sf.info(str(output))
+    assert (info.samplerate, info.channels, info.subtype, info.frames) == (SAMPLE_RATE, 1, "PCM_16", frames)
+    samples, _ = sf.read(str(output), dtype="int16")
+    assert samples.tobytes() == wav_pcm(whole.audioBytes)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+import ai_meditation_starter_kit_api.meditation_maker as meditation_maker
+
+_HEAVY_MODULES = ("numpy", "librosa", "scipy", "soundfile", "httpx")
+
+
+def test_import_skips_heavy_dependencies():
+    code = (
+        "import sys\n"
+        "import ai_meditation_starter_kit_api.meditation_maker\n"
+        f"print(','.join(name for name in {_HEAVY_MODULES!r} if name in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_exports_resolve_to_the_real_objects():
+    from ai_meditation_starter_kit_api.meditation_maker.ahap_cache import AhapCache
+
+    assert meditation_maker.AhapCache is AhapCache
+    assert set(meditation_maker._LAZY_EXPORTS) <= set(meditation_maker.__all__)
+
+
+def test_missing_dependency_raises_import_error_on_access(monkeypatch):
+    monkeypatch.delitem(vars(meditation_maker), "AhapCache", raising=False)
+
+    def _import_module(name, package=None):
+        raise ModuleNotFoundError("No module named 'librosa'", name="librosa")
+
+    monkeypatch.setattr(importlib, "import_module", _import_module)
+
+    with pytest.raises(ImportError, match="librosa") as excinfo:
+        meditation_maker.AhapCache  # noqa: B018 - attribute access triggers the lazy import.
+    assert excinfo.value.name == "librosa"
+    # No stand-in is cached, so the export resolves once the dependency imports again.
+    assert "AhapCache" not in vars(meditation_maker)
+
+
+def test_unknown_attributes_raise_attribute_error():
+    with pytest.raises(AttributeError):
+        meditation_maker.not_an_export  # noqa: B018
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from ai_meditation_starter_kit_api.meditation_maker.transcode import (
+    SAMPLE_RATE,
+    SAMPLE_WIDTH,
+    FfmpegPool,
+    mp3_to_pcm,
+    pcm_to_wav,
+    silence_pcm,
+    soundfile_decodes_mp3,
+    wav_pcm,
+    write_wav_stream,
+)
+
+# `cat` echoes its input, which exercises the pool's process handling without ffmpeg.
+_PASSTHROUGH = ["cat"]
+pytestmark = pytest.mark.skipif(shutil.which("cat") is None, reason="cat is not on PATH")
+
+
+class _CountingPool(FfmpegPool):
+    def __init__(self, size: int) -> None:
+        super().__init__(size=size, command=_PASSTHROUGH)
+        self.spawned: list[subprocess.Popen[bytes]] = []
+
+    def _spawn(self) -> subprocess.Popen[bytes]:
+        process = super()._spawn()
+        self.spawned.append(process)
+        return process
+
+
+def test_concurrent_takes_keep_the_pool_at_its_size() -> None:
+    clips = [bytes([index]) * 1000 for index in range(24)]
+    with _CountingPool(size=2) as pool:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            outputs = list(executor.map(pool.transcode, clips))
+        waiting = pool._ready.qsize()
+
+    assert outputs == clips
+    # One process per clip plus the waiting ones; an unguarded refill spawns extras under contention.
+    assert waiting == 2
+    assert len(pool.spawned) == len(clips) + 2
+
+
+def test_close_stops_waiting_processes() -> None:
+    pool = _CountingPool(size=3)
+    pool.transcode(b"clip")
+    pool.close()
+
+    assert pool._ready.empty()
+    assert all(process.poll() is not None for process in pool.spawned)
+
+
+def test_stream_yields_whole_samples() -> None:
+    chunks = [b"\x01", b"\x02\x03", b"\x04\x05\x06"]
+    with FfmpegPool(size=1, command=_PASSTHROUGH) as pool:
+        blocks = list(pool.stream(chunks))
+
+    assert b"".join(blocks) == b"\x01\x02\x03\x04\x05\x06"
+    assert all(len(block) % SAMPLE_WIDTH == 0 for block in blocks)
+
+
+def test_pcm_wav_round_trip() -> None:
+    pcm = bytes(range(256)) * 10
+    assert wav_pcm(pcm_to_wav(pcm)) == pcm
+
+
+@pytest.mark.skipif(not soundfile_decodes_mp3(), reason="libsndfile has no MP3 support")
+def test_mp3_to_pcm_decodes_whole_clip() -> None:
+    from ai_meditation_starter_kit_api.meditation_maker.transcode_benchmark import synthetic_mp3
+
+    pcm = mp3_to_pcm(synthetic_mp3(2.0))
+
+    assert len(pcm) % SAMPLE_WIDTH == 0
+    # MP3 framing pads the clip by a few milliseconds at most.
+    assert abs(len(pcm) / SAMPLE_WIDTH / SAMPLE_RATE - 2.0) < 0.1
+
+
+def test_write_wav_stream_completes_the_header(tmp_path):
+    samples = (np.arange(10001) % 2000 - 1000).astype("<i2")
+    pcm = samples.tobytes()
+    # Uneven chunks, as a download hands them on.
+    chunks = [pcm[start : start + 3000] for start in range(0, len(pcm), 3000)]
+
+    frames = write_wav_stream(iter(chunks), tmp_path / "stream.wav")
+
+    info = sf.info(str(tmp_path / "stream.wav"))
+    assert frames == info.frames == samples.size
+    assert (info.samplerate, info.channels, info.subtype) == (SAMPLE_RATE, 1, "PCM_16")
+    np.testing.assert_array_equal(sf.read(str(tmp_path / "stream.wav"), dtype="int16")[0], samples)
+
+
+def test_silence_pcm_yields_the_requested_length():
+    pcm = b"".join(silence_pcm(2.5))
+
+    assert len(pcm) == SAMPLE_WIDTH * round(2.5 * SAMPLE_RATE)
+    assert not any(pcm)
@@ -1,14 +1,21 @@
 """Generate a basic meditation using ElevenLabs TTS and SFX.
 
-Produces WAV audio files and a meditation JSON definition. AHAP haptic files
-are generated afterward if librosa is available.
+Produces WAV audio files and a meditation JSON definition. Segments are
+synthesized concurrently, and if librosa is available each WAV is converted to
+AHAP in a worker process as soon as it is written, so the build takes about as
+long as the slowest segment.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import importlib.util
 import json
 import sys
+import time
 import wave
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
 
 # Ensure the meditation_maker package is importable.
@@ -16,15 +23,22 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 API_ROOT = REPO_ROOT / "ai-meditation-starter-kit-api"
 sys.path.insert(0, str(API_ROOT))
 
-from ai_meditation_starter_kit_api.meditation_maker.elevenlabs_tts import (
-    generate_tts_audio_elevenlabs,
+from ai_meditation_starter_kit_api.meditation_maker.async_providers import (
+    AsyncElevenLabsClient,
+    agenerate_tts_audio_elevenlabs,
 )
+from ai_meditation_starter_kit_api.meditation_maker.audio_cache import DiskAudioCache
 from ai_meditation_starter_kit_api.meditation_maker.types import TTSRequest
 
 MEDITATION_ID = "basic-elevenlabs-wav-meditation"
 AUDIO_DIR = REPO_ROOT / "audio"
 HAPTICS_DIR = REPO_ROOT / "haptics"
 MEDITATIONS_DIR = REPO_ROOT / "meditations"
+# Re-running the script reuses audio already synthesized for unchanged segments.
+AUDIO_CACHE_DIR = REPO_ROOT / ".cache" / "audio"
+
+# TTS requests in flight at once; ElevenLabs answers requests past the plan's concurrency limit with 429.
+MAX_CONCURRENT_TTS = 4
 
 # Speech segments with the text to synthesize.
 SEGMENTS = [
@@ -52,6 +66,54 @@ def _wav_duration_ms(path: Path) -> int:
         return int(frames / rate * 1000)
 
 
+def _convert_to_ahap(path: Path) -> None:
+    from ai_meditation_starter_kit_api.meditation_maker.ahap import (
+        convert_wav_to_ahap,
+    )
+
+    convert_wav_to_ahap(str(path), str(HAPTICS_DIR), mode="sfx", split="none")
+
+
+async def _generate_ahap(name: str, path: Path, executor: Executor | None) -> None:
+    if executor is None:
+        return
+    await asyncio.get_running_loop().run_in_executor(executor, _convert_to_ahap, path)
+    print(f"  Generated AHAP for '{name}'")
+
+
+async def _generate_segment(
+    name: str,
+    text: str,
+    client: AsyncElevenLabsClient,
+    cache: DiskAudioCache,
+    executor: Executor | None,
+) -> Path | None:
+    out_path = AUDIO_DIR / f"{MEDITATION_ID}-{name}.wav"
+    print(f"Generating TTS for '{name}'...")
+    result = await agenerate_tts_audio_elevenlabs(TTSRequest(text=text), client=client, cache=cache)
+    if not result.success or not result.audioBytes:
+        print(f"  ERROR: TTS failed for '{name}'")
+        return None
+    out_path.write_bytes(result.audioBytes)
+    dur = _wav_duration_ms(out_path)
+    print(f"  Saved {out_path.name} ({dur} ms)")
+
+    # Start this segment's haptics while the other segments are still being synthesized.
+    await _generate_ahap(name, out_path, executor)
+    return out_path
+
+
+async def _generate_audio(bell_path: Path, executor: Executor | None) -> dict[str, Path | None]:
+    cache = DiskAudioCache(AUDIO_CACHE_DIR)
+    async with AsyncElevenLabsClient(max_concurrency=MAX_CONCURRENT_TTS) as client:
+        _, *segments = await asyncio.gather(
+            _generate_ahap("bell", bell_path, executor),
+            *(_generate_segment(name, text, client, cache, executor) for name, text in SEGMENTS),
+        )
+    print(f"TTS cache: {cache.hits} hits, {cache.misses} misses")
+    return dict(zip((name for name, _ in SEGMENTS), segments))
+
+
 def main() -> None:
     AUDIO_DIR.mkdir(exist_ok=True)
     HAPTICS_DIR.mkdir(exist_ok=True)
@@ -67,18 +129,20 @@ def main() -> None:
     audio_files["bell"] = bell_path
     print(f"Using existing bell: {bell_path}")
 
-    # Generate TTS for each speech segment.
-    for name, text in SEGMENTS:
-        out_path = AUDIO_DIR / f"{MEDITATION_ID}-{name}.wav"
-        print(f"Generating TTS for '{name}'...")
-        result = generate_tts_audio_elevenlabs(TTSRequest(text=text))
-        if not result.success or not result.audioBytes:
-            print(f"  ERROR: TTS failed for '{name}'")
+    generate_haptics = importlib.util.find_spec("librosa") is not None
+    if not generate_haptics:
+        print("librosa not available — skipping AHAP generation.")
+        print("Run with a venv that has librosa to generate haptics.")
+
+    # Synthesize every speech segment concurrently; each one's AHAP starts as soon as its WAV lands.
+    started = time.perf_counter()
+    with ProcessPoolExecutor() if generate_haptics else contextlib.nullcontext() as executor:
+        segment_files = asyncio.run(_generate_audio(bell_path, executor))
+    for name, path in segment_files.items():
+        if path is None:
             sys.exit(1)
-        out_path.write_bytes(result.audioBytes)
-        audio_files[name] = out_path
-        dur = _wav_duration_ms(out_path)
-        print(f"  Saved {out_path.name} ({dur} ms)")
+        audio_files[name] = path
+    print(f"Generated audio{' and haptics' if generate_haptics else ''} in {time.perf_counter() - started:.1f}s")
 
     # Build timeline using the same structure as the iEmbrace meditation.
     bell_dur = _wav_duration_ms(audio_files["bell"])
@@ -149,19 +213,8 @@ def main() -> None:
     print(f"\nMeditation JSON written to {out_json}")
     print(f"Total duration: {total_duration} ms ({total_duration / 1000:.1f}s)")
 
-    # Generate AHAP haptic files from audio.
-    try:
-        from ai_meditation_starter_kit_api.meditation_maker.ahap import (
-            convert_wav_to_ahap,
-        )
-
-        print("\nGenerating AHAP haptic files...")
-        for name, path in audio_files.items():
-            print(f"  Processing {name}...")
-            convert_wav_to_ahap(str(path), str(HAPTICS_DIR), mode="sfx", split="none")
-        print("AHAP generation complete.")
-
-        # Add AHAP entries to the timeline.
+    # Add AHAP entries to the timeline.
+    if generate_haptics:
         ahap_entries = []
         for entry in timeline:
             if entry["kind"] == "wav":
@@ -186,10 +239,6 @@ def main() -> None:
         out_json.write_text(json.dumps(meditation, indent=2) + "\n")
         print("Updated meditation JSON with AHAP entries.")
 
-    except ImportError:
-        print("\nlibrosa not available — skipping AHAP generation.")
-        print("Run with a venv that has librosa to generate haptics.")
-
 
 if __name__ == "__main__":
     main()